@@ -0,0 +1,236 @@
+"""
+Benchmarks of the hot paths of `DataTreeWidget`: `set_data`, `filter_tree`, `toggle_sort`, expanding all nodes and
+painting while scrolling, plus the memory needed to build the tree.
+
+Runs headless (the Qt `offscreen` platform is used unless `QT_QPA_PLATFORM` is set) and writes the results as JSON,
+so runs of different releases can be compared:
+
+    python benchmarks/bench_data_tree.py --output before.json
+    python benchmarks/bench_data_tree.py --output after.json --compare before.json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import PySide6
+from PySide6.QtWidgets import QApplication
+
+from pyside_widgets.data_tree_widget import DataTreeWidget
+
+# Results that got slower by more than this factor are flagged by `--compare`
+REGRESSION_FACTOR = 1.25
+SCROLL_FRAMES = 50
+WORDS = ("alpha", "beta", "gamma", "delta", "signal", "peak", "sample", "channel", "Trace", "Run")
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    """
+    One measurement. `seconds` are the individual repeats, `value` is the summary compared between runs (the minimum
+    time, or a byte count).
+    """
+
+    dataset: str
+    metric: str
+    unit: str
+    value: float
+    seconds: list[float] = dataclasses.field(default_factory=list[float])
+
+
+def wide_data(scale: int) -> dict[str, Any]:
+    return {f"item{i}": {"id": i, "name": f"name {i}", "value": i * 0.5} for i in range(2000 * scale)}
+
+
+def deep_data(scale: int) -> dict[str, Any]:
+    data: dict[str, Any] = {"leaf": 0}
+    for level in range(1, 500 * scale):
+        data = {"level": level, "label": f"level {level}", "next": data}
+    return {"root": data}
+
+
+def array_data(scale: int) -> dict[str, Any]:
+    rng = np.random.default_rng(0)
+    return {
+        f"group{i}": {
+            "table": rng.random((10, 10)),
+            "signal": rng.random(100_000),
+            "image": rng.integers(0, 255, (256, 256), dtype=np.uint8),
+        }
+        for i in range(50 * scale)
+    }
+
+
+def string_data(scale: int) -> dict[str, Any]:
+    rng = np.random.default_rng(0)
+
+    def text(n_words: int) -> str:
+        indices = cast(list[int], rng.integers(0, len(WORDS), n_words).tolist())
+        return " ".join(WORDS[i] for i in indices)
+
+    return {
+        f"record{i}": {"title": text(3), "notes": [text(5) for _ in range(5)], "body": text(40)}
+        for i in range(500 * scale)
+    }
+
+
+DATASETS: dict[str, Callable[[int], dict[str, Any]]] = {
+    "wide": wide_data,
+    "deep": deep_data,
+    "arrays": array_data,
+    "strings": string_data,
+}
+# A query per dataset that matches some, but not all, names
+QUERIES = {"wide": "item1", "deep": "label", "arrays": "signal", "strings": "note"}
+
+
+def _app() -> QApplication:
+    return cast(QApplication, QApplication.instance())
+
+
+def _time(func: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> list[float]:
+    app = _app()
+    times: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        app.processEvents()
+        start = time.perf_counter()
+        func()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _timing(dataset: str, metric: str, times: list[float]) -> Result:
+    return Result(dataset, metric, "s", min(times), times)
+
+
+def _scroll_paint(widget: DataTreeWidget) -> None:
+    scroll_bar = widget.verticalScrollBar()
+    step = max(1, (scroll_bar.maximum() - scroll_bar.minimum()) // SCROLL_FRAMES)
+    for frame in range(SCROLL_FRAMES):
+        scroll_bar.setValue(scroll_bar.minimum() + frame * step)
+        widget.viewport().repaint()
+
+
+def run_dataset(name: str, data: dict[str, Any], repeat: int) -> list[Result]:
+    widget = DataTreeWidget()
+    widget.resize(800, 600)
+    widget.show()
+    results: list[Result] = []
+
+    results.append(_timing(name, "set_data", _time(lambda: widget.set_data(data), repeat)))
+    usage = widget.memory_usage()
+    results.append(Result(name, "nodes", "count", usage.nodes))
+    results.append(Result(name, "tree_bytes", "bytes", usage.total_bytes))
+
+    query = QUERIES[name]
+    # The first filter pass builds the search index
+    results.append(_timing(name, "filter_tree_first", _time(lambda: widget.filter_tree(query), 1)))
+    results.append(_timing(name, "filter_tree", _time(lambda: widget.filter_tree(query), repeat)))
+    results.append(_timing(name, "filter_tree_clear", _time(lambda: widget.filter_tree(""), repeat)))
+
+    results.append(_timing(name, "toggle_sort", _time(widget.toggle_sort, repeat, setup=widget.clear_sort)))
+    results.append(_timing(name, "resort", _time(widget.toggle_sort, repeat)))
+
+    results.append(_timing(name, "expand_all", _time(widget.expandAll, repeat, setup=widget.collapseAll)))
+    times = _time(lambda: _scroll_paint(widget), repeat)
+    results.append(_timing(name, "scroll_paint_frame", [t / SCROLL_FRAMES for t in times]))
+
+    widget.clear()
+    tracemalloc.start()
+    widget.set_data(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.append(Result(name, "set_data_peak_python_bytes", "bytes", peak))
+
+    widget.close()
+    widget.deleteLater()
+    _app().processEvents()
+    return results
+
+
+def _max_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]]) -> list[str]:
+    """
+    Return a line per result that is also in `baseline`, with the ratio to the baseline value. Ratios above
+    `REGRESSION_FACTOR` are marked with "!".
+    """
+    previous = {(entry["dataset"], entry["metric"]): entry["value"] for entry in baseline}
+    lines: list[str] = []
+    for entry in results:
+        old = previous.get((entry["dataset"], entry["metric"]))
+        if not old:
+            continue
+        ratio = entry["value"] / old
+        flag = "!" if ratio > REGRESSION_FACTOR else " "
+        name = f"{entry['dataset']:<8} {entry['metric']:<28}"
+        lines.append(f"{flag} {name} {old:>14.6g} -> {entry['value']:<14.6g} x{ratio:.2f}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="JSON file of an earlier run to compare with")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(DATASETS), default=list(DATASETS))
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the size of the generated data")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per measurement, the minimum is kept")
+    args = parser.parse_args(argv)
+
+    app = cast(QApplication | None, QApplication.instance()) or QApplication([])
+    results: list[Result] = []
+    for name in args.datasets:
+        data = DATASETS[name](args.scale)
+        dataset_results = run_dataset(name, data, args.repeat)
+        for result in dataset_results:
+            print(f"{result.dataset:<8} {result.metric:<28} {result.value:>14.6g} {result.unit}")
+        results.extend(dataset_results)
+
+    result_entries = [dataclasses.asdict(result) for result in results]
+    report: dict[str, Any] = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pyside6": PySide6.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "qpa_platform": app.platformName(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "max_rss_bytes": _max_rss_bytes(),
+        },
+        "results": result_entries,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        print("\n".join(compare(result_entries, baseline["results"])))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
+from pyside_widgets.array_table_view import ArrayTableModel, ArrayTableView
 from pyside_widgets.color_picker_button import ColorPickerButton
 from pyside_widgets.command_bar import CommandBar
+from pyside_widgets.data_tree_view import DataTreeModel, DataTreeView
 from pyside_widgets.data_tree_widget import DataTreeWidget, SearchableDataTreeWidget
 from pyside_widgets.decimal_spin_box import DecimalSpinBox
 from pyside_widgets.enum_combo_box import EnumComboBox
@@ -8,22 +10,29 @@ from pyside_widgets.jupyter_console_widget import JupyterConsoleWindow
 from pyside_widgets.labeled_slider import LabeledSlider
 from pyside_widgets.message_box import ResizableMessageBox
 from pyside_widgets.overlay_widget import OverlayWidget
+from pyside_widgets.paged_text_view import PagedTextModel, PagedTextView
 from pyside_widgets.setting_card_widget import SettingCard
 from pyside_widgets.toggle_switch import AnimatedToggleSwitch, ToggleSwitch
 
 __all__ = [
+    "AnimatedToggleSwitch",
+    "ArrayTableModel",
+    "ArrayTableView",
+    "ColorPickerButton",
+    "CommandBar",
+    "DataTreeModel",
+    "DataTreeView",
+    "DataTreeWidget",
+    "DecimalSpinBox",
+    "EnumComboBox",
     "GroupedComboBox",
     "JupyterConsoleWindow",
+    "LabeledSlider",
     "OverlayWidget",
-    "DataTreeWidget",
+    "PagedTextModel",
+    "PagedTextView",
+    "ResizableMessageBox",
     "SearchableDataTreeWidget",
     "SettingCard",
-    "EnumComboBox",
-    "DecimalSpinBox",
-    "LabeledSlider",
-    "ColorPickerButton",
-    "AnimatedToggleSwitch",
     "ToggleSwitch",
-    "CommandBar",
-    "ResizableMessageBox",
 ]
@@ -0,0 +1,145 @@
+import enum
+from dataclasses import dataclass
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+# At most this many values are read to decimate an array, so the cost does not depend on its size
+MAX_SAMPLES: Final = 1 << 18
+# Smaller arrays get no sparkline
+MIN_SIZE: Final = 16
+# 2-D arrays with at most this many columns are channels of a waveform, wider ones are shown as a histogram
+MAX_CHANNELS: Final = 16
+# Number of widths cached per array
+MAX_CACHED_WIDTHS: Final = 4
+
+
+class SparklineKind(enum.Enum):
+    WAVEFORM = enum.auto()
+    HISTOGRAM = enum.auto()
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Sparkline:
+    """
+    Decimated preview of an array, with one bin per pixel column.
+
+    Attributes:
+        kind (SparklineKind): Whether the bins are the min/max of the samples (waveform) or value counts (histogram).
+        lows (NDArray[np.float64]): Bottom of the line or bar drawn for each bin, scaled to [0, 1]. NaN for bins
+            without finite values.
+        highs (NDArray[np.float64]): Top of the line or bar drawn for each bin, scaled to [0, 1].
+        minimum (float): The value shown at the bottom of a waveform, or the start of the first histogram bin.
+        maximum (float): The value shown at the top of a waveform, or the end of the last histogram bin.
+        exact (bool): False if only a sample of the array was read.
+    """
+
+    kind: SparklineKind
+    lows: npt.NDArray[np.float64]
+    highs: npt.NDArray[np.float64]
+    minimum: float
+    maximum: float
+    exact: bool
+
+
+def sparkline_kind(array: npt.NDArray[Any]) -> SparklineKind | None:
+    """
+    Return the kind of sparkline shown for `array`, or None if it gets none (non-real dtype, too small, 3-D or more).
+    """
+    if array.dtype.kind not in "biuf" or array.size < MIN_SIZE:
+        return None
+    if array.ndim == 1 or (array.ndim == 2 and array.shape[1] <= MAX_CHANNELS):
+        return SparklineKind.WAVEFORM
+    if array.ndim == 2:
+        return SparklineKind.HISTOGRAM
+    return None
+
+
+def _sample_bins(
+    array: npt.NDArray[Any], n_bins: int, max_samples: int
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.intp] | None]:
+    """
+    Read the rows of `array` needed to decimate it into `n_bins` bins along its first axis.
+
+    Returns either all rows and the start row of each bin (for `np.ufunc.reduceat`), or, if that would be more than
+    `max_samples` values, a `(n_bins, k)` block holding the first `k` rows of each bin and None. The rows of a bin
+    are contiguous, so only a bounded number of pages of a memmap are touched.
+    """
+    n_rows = array.shape[0]
+    row_size = max(1, array.size // n_rows)
+    starts = (np.arange(n_bins) * n_rows) // n_bins
+    rows_per_bin = max(1, max_samples // (n_bins * row_size))
+    if n_rows <= n_bins * rows_per_bin:
+        return np.asarray(array, dtype=np.float64).reshape(n_rows, -1), starts
+    indices = starts[:, np.newaxis] + np.arange(rows_per_bin)
+    return np.asarray(array[indices], dtype=np.float64).reshape(n_bins, -1), None
+
+
+def _finite_range(values: npt.NDArray[np.float64]) -> tuple[float, float] | None:
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return None
+    return float(finite.min()), float(finite.max())
+
+
+def compute_sparkline(array: npt.NDArray[Any], n_bins: int, max_samples: int = MAX_SAMPLES) -> Sparkline | None:
+    """
+    Decimate a 1-D or 2-D real array into `n_bins` bins (usually one per pixel).
+
+    Waveforms keep the min and max of every bin (over all channels of 2-D arrays), so peaks survive the decimation.
+    Histograms count the values in `n_bins` bins spanning the finite values. Everything is vectorized, and at most
+    about `max_samples` values are read: beyond that, only the first rows of every bin (waveforms) or of evenly spread
+    blocks (histograms) are used.
+
+    Returns:
+        Sparkline | None: The sparkline, or None if the array gets no sparkline or has no finite values.
+    """
+    kind = sparkline_kind(array)
+    if kind is None or n_bins < 1:
+        return None
+
+    if kind is SparklineKind.HISTOGRAM:
+        # Sampled as flat blocks where possible, a single row of a wide array may already exceed the budget
+        flat = array.reshape(-1) if array.flags.c_contiguous else array
+        values, starts = _sample_bins(flat, min(n_bins, flat.shape[0]), max_samples)
+        value_range = _finite_range(values)
+        if value_range is None:
+            return None
+        low, high = value_range
+        if high <= low:
+            low, high = low - 0.5, high + 0.5
+        counts, _ = np.histogram(values[np.isfinite(values)], bins=n_bins, range=(low, high))
+        highs = counts / counts.max()
+        highs[counts == 0] = np.nan
+        return Sparkline(kind, np.where(counts == 0, np.nan, 0.0), highs, low, high, starts is not None)
+
+    values, starts = _sample_bins(array, min(n_bins, array.shape[0]), max_samples)
+    if starts is not None:
+        lows = np.fmin.reduceat(values, starts, axis=0)
+        highs = np.fmax.reduceat(values, starts, axis=0)
+    else:
+        lows = highs = values
+    # Across channels (2-D arrays) or the rows sampled from a bin
+    lows = np.fmin.reduce(lows, axis=1)
+    highs = np.fmax.reduce(highs, axis=1)
+
+    value_range = _finite_range(np.concatenate([lows, highs]))
+    if value_range is None:
+        return None
+    low, high = value_range
+    span = high - low if high > low else 1.0
+    # Every bin reaches to the previous one, so the waveform is drawn without gaps
+    connected_lows, connected_highs = lows.copy(), highs.copy()
+    connected_lows[1:] = np.fmin(lows[1:], highs[:-1])
+    connected_highs[1:] = np.fmax(highs[1:], lows[:-1])
+    empty = np.isnan(lows)
+    connected_lows[empty] = connected_highs[empty] = np.nan
+    return Sparkline(
+        kind,
+        np.clip((connected_lows - low) / span, 0.0, 1.0),
+        np.clip((connected_highs - low) / span, 0.0, 1.0),
+        low,
+        high,
+        starts is not None,
+    )
@@ -0,0 +1,89 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class ArrayStats:
+    min: Any
+    max: Any
+    mean: float
+    count: int
+    nan_count: int
+
+    def __str__(self) -> str:
+        text = f"min={self.min}, max={self.max}, mean={self.mean:.2f}"
+        if self.nan_count:
+            text += f", nan={self.nan_count}"
+        return text
+
+
+def iter_chunks(array: npt.NDArray[Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[npt.NDArray[Any]]:
+    """
+    Iterate over the elements of `array` as flat chunks of at most ~`chunk_size` elements.
+
+    Contiguous arrays (including `np.memmap`) are sliced as flat views, so only the current chunk is ever read into
+    memory. Other arrays are sliced along their first axis.
+    """
+    if array.ndim == 0:
+        yield array.reshape(1)
+    elif array.flags.c_contiguous:
+        flat = array.reshape(-1)
+        for start in range(0, flat.size, chunk_size):
+            yield flat[start : start + chunk_size]
+    else:
+        row_size = max(1, array[0].size) if len(array) else 1
+        rows = max(1, chunk_size // row_size)
+        for start in range(0, len(array), rows):
+            yield array[start : start + rows].ravel()
+
+
+def compute_array_stats(
+    array: npt.NDArray[Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> ArrayStats | None:
+    """
+    Compute NaN-aware min/max/mean of a numeric array in bounded-size chunks.
+
+    Args:
+        array (NDArray): The array to summarize.
+        chunk_size (int, optional): Maximum number of elements processed at once.
+        is_cancelled (Callable[[], bool] | None, optional): Checked between chunks, aborts the computation if it
+            returns True.
+
+    Returns:
+        ArrayStats | None: The statistics, or None if the dtype is not numeric, the array is empty or the computation
+        was cancelled.
+    """
+    if array.dtype.kind not in "biufc" or array.size == 0:
+        return None
+
+    inexact = array.dtype.kind in "fc"
+    minimum = maximum = None
+    total = 0.0
+    count = nan_count = 0
+    for chunk in iter_chunks(array, chunk_size):
+        if is_cancelled is not None and is_cancelled():
+            return None
+        if inexact:
+            nan_mask = np.isnan(chunk)
+            n_nan = int(np.count_nonzero(nan_mask))
+            if n_nan:
+                nan_count += n_nan
+                chunk = chunk[~nan_mask]
+        if chunk.size == 0:
+            continue
+        chunk_min, chunk_max = chunk.min(), chunk.max()
+        minimum = chunk_min if minimum is None else min(minimum, chunk_min)
+        maximum = chunk_max if maximum is None else max(maximum, chunk_max)
+        total += chunk.sum(dtype=np.complex128 if array.dtype.kind == "c" else np.float64)
+        count += chunk.size
+
+    mean = total / count if count else float("nan")
+    return ArrayStats(minimum, maximum, mean.real if isinstance(mean, complex) else mean, count, nan_count)
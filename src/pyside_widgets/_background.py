@@ -0,0 +1,187 @@
+import abc
+import weakref
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import numpy.typing as npt
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+type IsCancelled = Callable[[], bool]
+
+
+class WorkerSignals(QObject):
+    sig_finished = Signal(int, object)
+
+
+if TYPE_CHECKING:
+    _WorkerMeta = abc.ABCMeta
+else:
+    # The metaclass of the Qt wrapper types conflicts with `abc.ABCMeta` unless they are combined
+    class _WorkerMeta(abc.ABCMeta, type(QRunnable)):
+        def __call__(cls, *args, **kwargs):
+            # Shiboken's constructor skips the abstract method check of `object.__new__`
+            if cls.__abstractmethods__:
+                names = ", ".join(sorted(cls.__abstractmethods__))
+                raise TypeError(f"Can't instantiate abstract class {cls.__name__} without {names}")
+            return super().__call__(*args, **kwargs)
+
+
+class Worker[S: WorkerSignals](QRunnable, abc.ABC, metaclass=_WorkerMeta):
+    """
+    Base of the cancellable tasks run in a thread pool. `run` calls `work` and emits `signals.sig_finished` with the
+    worker's token and the result, or `failed_result` if `work` raised.
+
+    Workers are not deleted by the pool, the owner keeps them (also when cancelled) until `sig_finished` arrived.
+    """
+
+    failed_result: ClassVar[Any] = None
+
+    def __init__(self, token: int, signals: S) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = signals
+        self.token = token
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self) -> None:
+        result = self.failed_result
+        try:
+            result = self.work()
+        finally:
+            self.signals.sig_finished.emit(self.token, result)
+
+    @abc.abstractmethod
+    def work(self) -> Any: ...
+
+
+class _ComputeWorker[P: Hashable, R](Worker[WorkerSignals]):
+    def __init__(
+        self,
+        token: int,
+        compute: Callable[[npt.NDArray[Any], P, IsCancelled], R | None],
+        array: npt.NDArray[Any],
+        parameter: P,
+    ) -> None:
+        super().__init__(token, WorkerSignals())
+        self.parameter = parameter
+        self.array_ref = weakref.ref(array)
+        self._array: npt.NDArray[Any] | None = array
+        self._compute = compute
+
+    def work(self) -> R | None:
+        array, self._array = self._array, None
+        return self._compute(array, self.parameter, self.is_cancelled) if array is not None else None
+
+
+class ArrayComputeEngine[P: Hashable, R](QObject):
+    """
+    Computes results for arrays in a thread pool and caches them per array and parameter.
+
+    `compute(array, parameter, is_cancelled)` is run in the pool, it may return None if there is no result (e.g. for an
+    unsupported dtype). Results are cached by array identity for as long as the array is alive, for the last
+    `max_parameters` parameters requested. Call `request` when a result is needed; `sig_ready` is emitted with the
+    array's `id` and the parameter once it is available.
+    """
+
+    sig_ready = Signal(object, object)
+
+    def __init__(
+        self,
+        compute: Callable[[npt.NDArray[Any], P, IsCancelled], R | None],
+        parent: QObject | None = None,
+        max_parameters: int = 1,
+    ) -> None:
+        super().__init__(parent)
+        self._compute = compute
+        self._max_parameters = max_parameters
+        self._cache: dict[int, tuple[weakref.ref[npt.NDArray[Any]], dict[P, R | None]]] = {}
+        self._workers: dict[int, _ComputeWorker[P, R]] = {}
+        # Cancelled workers are kept alive until they have actually stopped
+        self._cancelled: dict[int, _ComputeWorker[P, R]] = {}
+        self._next_token = 0
+
+    def cached(self, array: npt.NDArray[Any], parameter: P) -> tuple[bool, R | None]:
+        """
+        Return whether the result for `array` and `parameter` is cached, and the cached result.
+        """
+        entry = self._cache.get(id(array))
+        if entry is not None and entry[0]() is array and parameter in entry[1]:
+            return True, entry[1][parameter]
+        return False, None
+
+    def is_pending(self, array: npt.NDArray[Any], parameter: P) -> bool:
+        return any(
+            worker.array_ref() is array and worker.parameter == parameter for worker in self._workers.values()
+        )
+
+    def request(self, array: npt.NDArray[Any], parameter: P) -> None:
+        """
+        Request the result for `array` and `parameter`. Emits `sig_ready` right away if it is cached.
+        """
+        found, _ = self.cached(array, parameter)
+        if found:
+            self.sig_ready.emit(id(array), parameter)
+            return
+        if self.is_pending(array, parameter):
+            return
+
+        self._next_token += 1
+        worker = _ComputeWorker(self._next_token, self._compute, array, parameter)
+        worker.signals.sig_finished.connect(self._on_worker_finished)
+        self._workers[worker.token] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel_all(self) -> None:
+        """
+        Cancel all running computations. Already cached results are kept.
+        """
+        for worker in self._workers.values():
+            worker.cancel()
+        self._cancelled.update(self._workers)
+        self._workers.clear()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def forget(self, array: npt.NDArray[Any]) -> None:
+        """
+        Drop the cached results for `array` and cancel its running computations, e.g. when it was modified in place.
+        """
+        entry = self._cache.get(id(array))
+        if entry is not None and entry[0]() is array:
+            del self._cache[id(array)]
+        for token, worker in list(self._workers.items()):
+            if worker.array_ref() is array:
+                worker.cancel()
+                self._cancelled[token] = self._workers.pop(token)
+
+    def _on_worker_finished(self, token: int, result: R | None) -> None:
+        self._cancelled.pop(token, None)
+        worker = self._workers.pop(token, None)
+        if worker is None:
+            return
+        array = worker.array_ref()
+        if array is None:
+            return
+
+        array_id = id(array)
+        entry = self._cache.get(array_id)
+        if entry is None or entry[0]() is not array:
+
+            def _forget(ref: weakref.ref[npt.NDArray[Any]]) -> None:
+                entry = self._cache.get(array_id)
+                if entry is not None and entry[0] is ref:
+                    del self._cache[array_id]
+
+            entry = self._cache[array_id] = (weakref.ref(array, _forget), {})
+        results = entry[1]
+        results[worker.parameter] = result
+        if len(results) > self._max_parameters:
+            del results[next(iter(results))]
+        self.sig_ready.emit(array_id, worker.parameter)
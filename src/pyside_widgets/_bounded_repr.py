@@ -0,0 +1,123 @@
+import itertools
+import math
+import reprlib
+import threading
+import time
+from typing import Any
+
+DEFAULT_MAX_CHARS = 1000
+DEFAULT_TIME_BUDGET_S = 0.01
+
+
+class BoundedRepr(reprlib.Repr):
+    """
+    `reprlib.Repr` whose cost depends on its limits rather than on the size of the object.
+
+    In addition to the per-type limits of `reprlib.Repr`, the result is cut to `max_chars` characters and no further
+    elements are formatted once `time_budget_s` has passed. Sets and dicts are shown in iteration order instead of
+    being sorted, and large ints and bytes are never converted as a whole.
+
+    Objects without a dedicated `repr_<type>` method still go through their own `__str__`/`__repr__`, their result
+    is only truncated.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS, time_budget_s: float = DEFAULT_TIME_BUDGET_S) -> None:
+        super().__init__(maxlevel=3, maxtuple=10, maxlist=10, maxarray=10, maxdict=10, maxset=10, maxfrozenset=10)
+        self.maxstring = max_chars
+        self.maxlong = max_chars
+        self.maxother = max_chars
+        self.max_chars = max_chars
+        self.time_budget_s = time_budget_s
+        self._local = threading.local()
+
+    def describe(self, obj: Any) -> str:
+        """
+        Return the text shown for `obj` in the `Value` column, at most `max_chars` characters long.
+
+        Unlike `repr`, strings are not quoted and other objects without a specific handler use `str`, like `str(obj)`
+        but bounded.
+        """
+        self._local.deadline = time.perf_counter() + self.time_budget_s
+        if isinstance(obj, str):
+            return obj[: self.max_chars]
+        if isinstance(obj, int) and not isinstance(obj, bool):
+            text = self.repr_int(obj, self.maxlevel)
+        elif hasattr(self, f"repr_{type(obj).__name__}"):
+            text = self.repr1(obj, self.maxlevel)
+        else:
+            text = str(obj)
+        return self._cut(text, self.max_chars)
+
+    def repr1(self, x: Any, level: int) -> str:
+        deadline: float | None = getattr(self._local, "deadline", None)
+        if deadline is not None and time.perf_counter() > deadline:
+            return self.fillvalue
+        return super().repr1(x, level)
+
+    def _cut(self, text: str, limit: int) -> str:
+        if len(text) <= limit:
+            return text
+        return text[: max(0, limit - len(self.fillvalue))] + self.fillvalue
+
+    def repr_int(self, x: int, level: int) -> str:
+        # Converting an int to decimal is quadratic in its size (and not allowed above sys.get_int_max_str_digits)
+        digits = int(x.bit_length() * math.log10(2)) + 1
+        if digits > self.maxlong:
+            return f"<int with ~{digits} digits>"
+        return self._cut(repr(x), self.maxlong)
+
+    def _repr_bytes_like(self, x: bytes | bytearray, level: int) -> str:
+        text = repr(x[: self.maxstring])
+        return text + self.fillvalue if len(x) > self.maxstring else text
+
+    repr_bytes = _repr_bytes_like
+    repr_bytearray = _repr_bytes_like
+
+    def repr_memoryview(self, x: memoryview, level: int) -> str:
+        return f"<memoryview format={x.format!r} shape={x.shape}>"
+
+    def _repr_unsorted(self, x: set[Any] | frozenset[Any], level: int, left: str, right: str, maxiter: int) -> str:
+        if not x:
+            return repr(x)
+        if level <= 0:
+            return f"{left}{self.fillvalue}{right}"
+        items = [self.repr1(item, level - 1) for item in itertools.islice(x, maxiter)]
+        if len(x) > maxiter:
+            items.append(self.fillvalue)
+        return f"{left}{', '.join(items)}{right}"
+
+    def repr_set(self, x: set[Any], level: int) -> str:
+        return self._repr_unsorted(x, level, "{", "}", self.maxset)
+
+    def repr_frozenset(self, x: frozenset[Any], level: int) -> str:
+        return self._repr_unsorted(x, level, "frozenset({", "})", self.maxfrozenset)
+
+    def repr_dict(self, x: dict[Any, Any], level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{" + self.fillvalue + "}"
+        items = [
+            f"{self.repr1(key, level - 1)}: {self.repr1(value, level - 1)}"
+            for key, value in itertools.islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            items.append(self.fillvalue)
+        return "{" + ", ".join(items) + "}"
+
+
+_default_repr = BoundedRepr()
+
+
+def bounded_description(data: Any) -> str:
+    """
+    Return the bounded description of `data` used for the `Value` column, see `BoundedRepr.describe`.
+    """
+    return _default_repr.describe(data)
+
+
+def full_text(data: Any) -> str:
+    """
+    Return the complete text of `data`. Only used on demand, e.g. when the user opens or copies a value.
+    """
+    return data if isinstance(data, str) else str(data)
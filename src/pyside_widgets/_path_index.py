@@ -0,0 +1,252 @@
+import sys
+from array import array
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Final, cast
+
+type Key = str | int
+type Path = tuple[Key, ...]
+
+NO_PARENT: Final = -1
+# Children of a node are found by scanning its child list, a key map is only built for nodes with more children
+_MAP_THRESHOLD: Final = 16
+
+
+class PathIndex[T](MutableMapping[Path, T]):
+    """
+    Index of the nodes of a tree by their path, stored as parent pointers.
+
+    Every node gets an integer id. Per node, only its key, its value, the data it shows and four ids (parent, first
+    child, previous and next sibling, in flat arrays) are stored, so the index needs about 56 bytes per node no matter
+    how deep the node is. Path tuples are not kept, they are built on demand (`path_of`). Looking up a path walks down
+    from the root one key at a time, nodes with many children get a key map on their first lookup. The ids of removed
+    nodes are reused.
+
+    The mapping interface (`index[path]`, `path in index`, `items()`, ...) works with path tuples, `add` and the `*_of`
+    methods with ids. Iteration order is unspecified, in particular a parent does not necessarily come before its
+    children.
+    """
+
+    def __init__(self) -> None:
+        self._parents = array("q")
+        self._first_child = array("q")
+        self._next_sibling = array("q")
+        self._prev_sibling = array("q")
+        self._keys: list[Key | None] = []
+        self._values: list[T | None] = []
+        self._data: list[Any] = []
+        # Key maps of the nodes with many children that were looked up
+        self._child_maps: dict[int, dict[Key, int]] = {}
+        self._root = NO_PARENT
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._values) - len(self._free)
+
+    def __iter__(self) -> Iterator[Path]:
+        cache: dict[int, Path] = {}
+        for node_id in self.ids():
+            yield self._cached_path(node_id, cache)
+
+    def __getitem__(self, path: Path) -> T:
+        node_id = self.id_of(path)
+        if node_id is None:
+            raise KeyError(path)
+        return self._values[node_id]  # type: ignore[return-value]
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, tuple) and self.id_of(cast(Path, path)) is not None
+
+    def __setitem__(self, path: Path, value: T) -> None:
+        node_id = self.id_of(path)
+        if node_id is not None:
+            self._values[node_id] = value
+            return
+        if not path:
+            self.add(NO_PARENT, None, value)
+            return
+        parent_id = self.id_of(path[:-1])
+        if parent_id is None:
+            raise KeyError(path[:-1])
+        self.add(parent_id, path[-1], value)
+
+    def __delitem__(self, path: Path) -> None:
+        node_id = self.id_of(path)
+        if node_id is None:
+            raise KeyError(path)
+        self.remove(node_id)
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def items(self) -> Iterator[tuple[Path, T]]:  # type: ignore[override]
+        """
+        Iterate over `(path, value)` pairs. Each path is built once, from the cached path of its parent.
+        """
+        cache: dict[int, Path] = {}
+        values = self._values
+        for node_id in self.ids():
+            yield self._cached_path(node_id, cache), values[node_id]  # type: ignore[misc]
+
+    def ids(self) -> Iterator[int]:
+        """
+        Iterate over the ids of all nodes.
+        """
+        free = set(self._free)
+        return (node_id for node_id in range(len(self._values)) if node_id not in free)
+
+    def add(self, parent_id: int, key: Key | None, value: T, data: Any = None) -> int:
+        """
+        Add a node below `parent_id` and return its id. With `parent_id=NO_PARENT`, the node replaces the root.
+
+        The parent must not have a child with the same key yet (see `child_id`), this is not checked.
+        """
+        if parent_id == NO_PARENT and self._root != NO_PARENT:
+            self.remove(self._root)
+
+        if self._free:
+            node_id = self._free.pop()
+            self._keys[node_id] = key
+            self._values[node_id] = value
+            self._data[node_id] = data
+        else:
+            node_id = len(self._values)
+            for ids in (self._parents, self._first_child, self._next_sibling, self._prev_sibling):
+                ids.append(NO_PARENT)
+            self._keys.append(key)
+            self._values.append(value)
+            self._data.append(data)
+        self._parents[node_id] = parent_id
+        self._first_child[node_id] = NO_PARENT
+        self._prev_sibling[node_id] = NO_PARENT
+
+        if parent_id == NO_PARENT:
+            self._root = node_id
+            self._next_sibling[node_id] = NO_PARENT
+        else:
+            first = self._first_child[parent_id]
+            self._next_sibling[node_id] = first
+            if first != NO_PARENT:
+                self._prev_sibling[first] = node_id
+            self._first_child[parent_id] = node_id
+            child_map = self._child_maps.get(parent_id)
+            if child_map is not None:
+                child_map[key] = node_id  # type: ignore[index]
+        return node_id
+
+    def remove(self, node_id: int) -> None:
+        """
+        Remove a single node. Its descendants have to be removed separately.
+        """
+        parent_id = self._parents[node_id]
+        if node_id == self._root:
+            self._root = NO_PARENT
+        else:
+            prev, next_ = self._prev_sibling[node_id], self._next_sibling[node_id]
+            if prev != NO_PARENT:
+                self._next_sibling[prev] = next_
+            else:
+                self._first_child[parent_id] = next_
+            if next_ != NO_PARENT:
+                self._prev_sibling[next_] = prev
+            child_map = self._child_maps.get(parent_id)
+            if child_map is not None:
+                child_map.pop(self._keys[node_id], None)  # type: ignore[arg-type]
+        self._child_maps.pop(node_id, None)
+        self._keys[node_id] = None
+        self._values[node_id] = None
+        self._data[node_id] = None
+        self._free.append(node_id)
+
+    def id_of(self, path: Path) -> int | None:
+        node_id: int | None = self._root
+        if node_id == NO_PARENT:
+            return None
+        for key in path:
+            node_id = self.child_id(node_id, key)  # type: ignore[arg-type]
+            if node_id is None:
+                return None
+        return node_id
+
+    def child_id(self, parent_id: int, key: Key) -> int | None:
+        """
+        Return the id of the child of `parent_id` with the given key, or None.
+        """
+        child_map = self._child_maps.get(parent_id)
+        if child_map is not None:
+            return child_map.get(key)
+        keys = self._keys
+        for scanned, child in enumerate(self.child_ids(parent_id)):
+            if scanned == _MAP_THRESHOLD:
+                # Only the root has no key
+                child_map = self._child_maps[parent_id] = {
+                    cast(Key, keys[child]): child for child in self.child_ids(parent_id)
+                }
+                return child_map.get(key)
+            if keys[child] == key:
+                return child
+        return None
+
+    def child_ids(self, parent_id: int) -> Iterator[int]:
+        """
+        Iterate over the ids of the children of `parent_id`, most recently added first.
+        """
+        next_sibling = self._next_sibling
+        child = self._first_child[parent_id]
+        while child != NO_PARENT:
+            yield child
+            child = next_sibling[child]
+
+    def parent_of(self, node_id: int) -> int:
+        return self._parents[node_id]
+
+    def key_of(self, node_id: int) -> Key | None:
+        return self._keys[node_id]
+
+    def value_of(self, node_id: int) -> T:
+        return self._values[node_id]  # type: ignore[return-value]
+
+    def data_of(self, node_id: int) -> Any:
+        return self._data[node_id]
+
+    def set_data(self, node_id: int, data: Any) -> None:
+        self._data[node_id] = data
+
+    def path_of(self, node_id: int) -> Path:
+        keys: list[Key] = []
+        parents, node_keys = self._parents, self._keys
+        while node_id != self._root:
+            keys.append(node_keys[node_id])  # type: ignore[arg-type]
+            node_id = parents[node_id]
+        keys.reverse()
+        return tuple(keys)
+
+    def _cached_path(self, node_id: int, cache: dict[int, Path]) -> Path:
+        # Walk up to the first ancestor with a known path and build the paths back down from there
+        chain: list[int] = []
+        while node_id not in cache and node_id != self._root:
+            chain.append(node_id)
+            node_id = self._parents[node_id]
+        path = cache.get(node_id, ())
+        for child_id in reversed(chain):
+            path = cache[child_id] = (*path, cast(Key, self._keys[child_id]))
+        return path
+
+    def nbytes(self) -> int:
+        """
+        Return the number of bytes used by the index itself, not counting the keys, values and data it refers to.
+        """
+        size = sum(
+            sys.getsizeof(table)
+            for table in (
+                self._parents,
+                self._first_child,
+                self._next_sibling,
+                self._prev_sibling,
+                self._keys,
+                self._values,
+                self._data,
+                self._free,
+                self._child_maps,
+            )
+        )
+        return size + sum(sys.getsizeof(child_map) for child_map in self._child_maps.values())
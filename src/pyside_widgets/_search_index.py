@@ -0,0 +1,118 @@
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class FilterState:
+    """
+    The result of the last filter pass, used to narrow down the next one.
+    """
+
+    query: str
+    columns: tuple[int, ...]
+    matches: set[int] = field(default_factory=set[int])
+    recursive: bool = False
+    # The rows that are visible, i.e. the matches plus their ancestors for recursive filters
+    visible: set[int] = field(default_factory=set[int])
+
+
+class SearchIndex[T]:
+    """
+    Case-folded substring index over the columns of a set of rows.
+
+    Each row is identified by the integer id returned from `add`. If `ngram_size` is larger than 0, an inverted
+    n-gram index is kept as well, which is used to preselect candidate rows for queries of at least `ngram_size`
+    characters.
+    """
+
+    def __init__(self, ngram_size: int = 0) -> None:
+        self._ngram_size = ngram_size
+        self._rows: list[T] = []
+        self._texts: list[tuple[str, ...]] = []
+        self._parents: list[int] = []
+        self._ngrams: dict[tuple[int, str], set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, row_id: int) -> T:
+        return self._rows[row_id]
+
+    def texts(self, row_id: int) -> tuple[str, ...]:
+        return self._texts[row_id]
+
+    def parent(self, row_id: int) -> int:
+        return self._parents[row_id]
+
+    def add(self, row: T, texts: Iterable[str], parent: int = -1) -> int:
+        """
+        Add a row with the given column texts to the index and return its id.
+
+        Args:
+            row (T): The object the row represents.
+            texts (Iterable[str]): The texts of the searchable columns.
+            parent (int, optional): The id of the parent row, or -1 for top level rows. Defaults to -1.
+        """
+        row_id = len(self._rows)
+        folded = tuple(text.casefold() for text in texts)
+        self._rows.append(row)
+        self._texts.append(folded)
+        self._parents.append(parent)
+
+        n = self._ngram_size
+        if n > 0:
+            for column, text in enumerate(folded):
+                for start in range(len(text) - n + 1):
+                    self._ngrams.setdefault((column, text[start : start + n]), set()).add(row_id)
+        return row_id
+
+    def search(self, query: str, columns: Collection[int] = (0,), candidates: Iterable[int] | None = None) -> set[int]:
+        """
+        Return the ids of all rows where any of the given columns contains `query` (case-insensitive).
+
+        Args:
+            query (str): The text to search for.
+            columns (Collection[int], optional): The columns to search. Defaults to (0,).
+            candidates (Iterable[int] | None, optional): Only consider these rows, e.g. the matches of a query that
+                the current query extends. Defaults to None (all rows).
+        """
+        query = query.casefold()
+        if candidates is None:
+            candidates = self._ngram_candidates(query, columns)
+        if candidates is None:
+            candidates = range(len(self._rows))
+        if not query:
+            return set(candidates)
+
+        texts = self._texts
+        return {row_id for row_id in candidates if any(query in texts[row_id][column] for column in columns)}
+
+    def with_ancestors(self, row_ids: Iterable[int]) -> set[int]:
+        """
+        Return the given rows together with all their ancestors.
+
+        Every row is visited at most once: walking up from a row stops at the first ancestor that was already added.
+        """
+        parents = self._parents
+        result: set[int] = set()
+        for row_id in row_ids:
+            while row_id >= 0 and row_id not in result:
+                result.add(row_id)
+                row_id = parents[row_id]
+        return result
+
+    def _ngram_candidates(self, query: str, columns: Collection[int]) -> set[int] | None:
+        n = self._ngram_size
+        if n <= 0 or len(query) < n:
+            return None
+
+        candidates: set[int] = set()
+        for column in columns:
+            column_candidates: set[int] | None = None
+            for start in range(len(query) - n + 1):
+                rows = self._ngrams.get((column, query[start : start + n]), set())
+                column_candidates = rows.copy() if column_candidates is None else column_candidates & rows
+                if not column_candidates:
+                    break
+            candidates |= column_candidates or set()
+        return candidates
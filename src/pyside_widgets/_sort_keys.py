@@ -0,0 +1,47 @@
+import math
+import re
+from typing import Any, Final, cast
+
+import numpy as np
+
+# Texts are compared by at most this many leading characters
+MAX_SORT_TEXT: Final = 256
+_DIGITS: Final = re.compile(r"(\d+)")
+
+type SortKey = tuple[Any, ...]
+
+
+def natural_key(text: str) -> SortKey:
+    """
+    Return a key that orders texts case-insensitively, with runs of digits compared as numbers ("item2" before
+    "item10").
+
+    The key alternates between text and integer parts, starting with a (possibly empty) text part, so keys of any two
+    texts can be compared.
+    """
+    parts: list[Any] = _DIGITS.split(text[:MAX_SORT_TEXT].casefold())
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+def name_sort_key(key: str | int | None, text: str) -> SortKey:
+    """
+    Return the sort key of a node name: integer keys (e.g. list indices) by their value, before all other keys, which
+    are ordered by `natural_key` of their text.
+    """
+    if isinstance(key, int):
+        return (0, key)
+    return (1, natural_key(text))
+
+
+def value_sort_key(data: Any, text: str) -> SortKey:
+    """
+    Return the sort key of a value: real numbers by their value, then NaNs, then everything else by `natural_key` of
+    its text.
+    """
+    if isinstance(data, (int, float, np.integer, np.floating, np.bool_)):
+        value: Any = cast(Any, data).item() if isinstance(data, np.generic) else data
+        if isinstance(value, float) and math.isnan(value):
+            return (1,)
+        return (0, value)
+    return (2, natural_key(text))
@@ -0,0 +1,347 @@
+import traceback
+import types
+from collections import deque
+from typing import Any, Protocol, cast
+
+import numpy as np
+import numpy.typing as npt
+from PySide6.QtCore import QAbstractItemModel, QLineF, QObject, QPointF, QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFontMetrics, QPainter, QPalette, QShowEvent
+from PySide6.QtWidgets import (
+    QApplication,
+    QLineEdit,
+    QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
+    QWidget,
+)
+
+from pyside_widgets._array_sparkline import MAX_CACHED_WIDTHS, Sparkline, SparklineKind, compute_sparkline
+from pyside_widgets._array_stats import ArrayStats, compute_array_stats
+from pyside_widgets._background import ArrayComputeEngine, IsCancelled
+from pyside_widgets._tree_nodes import PENDING_TEXT, ItemDataRole, ModelIndex, PreviewKindRole, SparklineRole
+from pyside_widgets.array_table_view import format_value, table_of
+from pyside_widgets.data_tree_handlers import PreviewKind
+
+
+class DelegateHost(Protocol):
+    """
+    What `DataTreeDelegate` needs from the view it paints, implemented by `DataTreeWidget`.
+    """
+
+    def viewport(self) -> QWidget: ...
+
+    def index_data(self, index: ModelIndex) -> Any: ...
+
+    def preview_payload(self, index: ModelIndex) -> Any: ...
+
+    def create_preview_editor(self, index: ModelIndex) -> QWidget: ...
+
+    def edit_text(self, index: ModelIndex) -> str: ...
+
+    def set_edit_text(self, index: ModelIndex, text: str) -> None: ...
+
+
+def _array_stats_of(array: npt.NDArray[Any], _: None, is_cancelled: IsCancelled) -> ArrayStats | None:
+    return compute_array_stats(array, is_cancelled=is_cancelled)
+
+
+def _sparkline_of(array: npt.NDArray[Any], width: int, _: IsCancelled) -> Sparkline | None:
+    return compute_sparkline(array, width)
+
+
+class ArraySummaryButton(QPushButton):
+    """
+    Shows the statistics of a large array. They are only computed (in the background) once the button is first shown.
+    """
+
+    def __init__(
+        self, array: npt.NDArray[Any], engine: ArrayComputeEngine[None, ArrayStats], parent: QWidget | None = None
+    ) -> None:
+        super().__init__(f"Array summary: {PENDING_TEXT}", parent)
+        self._array = array
+        self._engine = engine
+        self._requested = False
+        engine.sig_ready.connect(self._on_stats_ready)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        if not self._requested:
+            self._requested = True
+            self._engine.request(self._array, None)
+
+    def _on_stats_ready(self, array_id: int, _: None) -> None:
+        if array_id != id(self._array):
+            return
+        stats = self._engine.cached(self._array, None)[1]
+        self.setText(f"Array summary: {stats if stats is not None else 'n/a'}")
+        self._engine.sig_ready.disconnect(self._on_stats_ready)
+
+
+class DataTreeDelegate(QStyledItemDelegate):
+    """
+    Paints the preview rows of a `DataTreeWidget` in `PreviewMode.DELEGATE` (array summary line, a small snapshot of
+    an array table, a traceback excerpt or a long text). A real widget is only created, as a persistent editor, for
+    the preview row the user activates.
+
+    In both preview modes, it also paints a sparkline (a min/max waveform or a histogram, see `compute_sparkline`) of
+    1-D and 2-D arrays in the `Value` column, next to their description. Array statistics and sparklines are computed
+    in the background by `array_stats` and `sparklines`, the viewport of `host` is repainted when they are ready.
+    """
+
+    PREVIEW_LINES = 6
+    PREVIEW_COLUMNS = 8
+    EDITOR_HEIGHT = 200
+    SPARKLINE_MIN_WIDTH = 32
+    SPARKLINE_MAX_WIDTH = 240
+    # Sparklines are computed for widths rounded down to a multiple of this, so resizing a column does not request a
+    # new one for every pixel
+    SPARKLINE_WIDTH_STEP = 16
+
+    def __init__(self, host: DelegateHost, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._host = host
+        self._excerpts: dict[int, tuple[types.TracebackType, list[str]]] = {}
+        self._highlight = ""
+        self._highlight_columns: tuple[int, ...] = ()
+        self.highlight_color = QColor(255, 200, 0, 100)
+        self.array_stats = ArrayComputeEngine(_array_stats_of, self)
+        self.array_stats.sig_ready.connect(self._on_result_ready)
+        # Sparklines are computed per width, see `SPARKLINE_WIDTH_STEP`
+        self.sparklines = ArrayComputeEngine(_sparkline_of, self, max_parameters=MAX_CACHED_WIDTHS)
+        self.sparklines.sig_ready.connect(self._on_result_ready)
+
+    def clear_cache(self) -> None:
+        """
+        Forget the formatted traceback excerpts, and cancel the running computations of statistics and sparklines.
+        """
+        self._excerpts.clear()
+        self.array_stats.cancel_all()
+        self.sparklines.cancel_all()
+
+    def _on_result_ready(self, array_id: int, parameter: object) -> None:
+        self._host.viewport().update()
+
+    def set_highlight(self, text: str, columns: tuple[int, ...] = (0,)) -> None:
+        """
+        Highlight occurrences of `text` (case-insensitive) in the given columns. An empty text disables highlighting.
+        """
+        self._highlight = text.casefold()
+        self._highlight_columns = columns
+
+    def _paint_highlight(self, painter: QPainter, option: QStyleOptionViewItem, index: ModelIndex) -> None:
+        text: str = index.data(ItemDataRole.DisplayRole) or ""
+        folded = text.casefold()
+        start = folded.find(self._highlight)
+        if start < 0 or len(folded) != len(text):
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        # The stubs don't mark the widget as optional
+        widget = cast(QWidget | None, opt.widget)
+        style = widget.style() if widget is not None else QApplication.style()
+        text_rect = style.subElementRect(QStyle.SubElement.SE_ItemViewItemText, opt, opt.widget)
+        margin = style.pixelMetric(QStyle.PixelMetric.PM_FocusFrameHMargin, None, opt.widget) + 1
+        metrics = opt.fontMetrics
+        x = text_rect.left() + margin + metrics.horizontalAdvance(text[:start])
+        width = metrics.horizontalAdvance(text[start : start + len(self._highlight)])
+        span = QRect(x, text_rect.top(), width, text_rect.height()).intersected(text_rect)
+        painter.fillRect(span, self.highlight_color)
+
+    def preview_size_hint(self, kind: PreviewKind, payload: Any, metrics: QFontMetrics) -> QSize:
+        """
+        Return the size of a painted preview row.
+
+        The size is stored in the `SizeHintRole` of the row when it is created, so the view never has to call back
+        into Python to lay out the tree.
+        """
+        if kind is PreviewKind.ARRAY_TABLE:
+            lines = min(table_of(payload)[0].shape[0], self.PREVIEW_LINES) + 1
+        elif kind is PreviewKind.TRACEBACK and isinstance(payload, types.TracebackType):
+            # Estimated from the number of frames (two lines each), the excerpt is only formatted when painted
+            n_frames = 0
+            current: types.TracebackType | None = payload
+            while current is not None:
+                n_frames += 1
+                current = current.tb_next
+            shown = self.PREVIEW_LINES // 2
+            lines = 2 * min(n_frames, shown) + (n_frames > shown)
+        else:
+            lines = 1
+        return QSize(0, max(1, lines) * metrics.height() + 4)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: ModelIndex) -> None:
+        kind: PreviewKind | None = index.data(PreviewKindRole)
+        if kind is None:
+            super().paint(painter, option, index)
+            if self._highlight and index.column() in self._highlight_columns:
+                self._paint_highlight(painter, option, index)
+            if index.column() == 2 and index.data(SparklineRole) is not None:
+                self._paint_sparkline(painter, option, index)
+            return
+
+        payload = self._host.preview_payload(index)
+        if payload is None:
+            # The data was released since the tree was built
+            return
+        painter.save()
+        # The height of traceback rows is estimated, lines that don't fit must not spill into the next row
+        painter.setClipRect(option.rect)
+        painter.setFont(option.font)
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        if kind is PreviewKind.ARRAY_TABLE:
+            self._paint_table(painter, option, rect, payload)
+        else:
+            if kind is PreviewKind.ARRAY_SUMMARY:
+                lines = [f"Array summary: {self._array_summary(payload)} (activate to open)"]
+            elif kind is PreviewKind.TRACEBACK:
+                if isinstance(payload, types.TracebackType):
+                    lines = self._traceback_excerpt(payload)
+                else:
+                    lines = ["(activate to show)"]
+            else:
+                lines = [payload]
+            self._paint_lines(painter, option, rect, lines)
+        painter.restore()
+
+    def _paint_lines(self, painter: QPainter, option: QStyleOptionViewItem, rect: QRect, lines: list[str]) -> None:
+        metrics = option.fontMetrics
+        height = metrics.height()
+        for i, line in enumerate(lines):
+            line_rect = QRect(rect.left(), rect.top() + i * height, rect.width(), height)
+            text = metrics.elidedText(line, Qt.TextElideMode.ElideRight, rect.width())
+            painter.drawText(line_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+    def _paint_table(
+        self, painter: QPainter, option: QStyleOptionViewItem, rect: QRect, array: npt.NDArray[Any]
+    ) -> None:
+        table, fields = table_of(array)
+        n_rows = min(table.shape[0], self.PREVIEW_LINES)
+        n_cols = min(len(fields) or table.shape[1], self.PREVIEW_COLUMNS)
+
+        def cell(row: int, col: int) -> str:
+            return format_value(table[row, 0][fields[col]] if fields else table[row, col])
+
+        columns = [
+            [fields[col] if fields else str(col), *(cell(row, col) for row in range(n_rows))] for col in range(n_cols)
+        ]
+        columns.insert(0, ["", *(str(row) for row in range(n_rows))])
+        if n_cols < (len(fields) or table.shape[1]):
+            columns.append(["…"] * (n_rows + 1))
+
+        metrics = option.fontMetrics
+        height = metrics.height()
+        muted = option.palette.color(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Text)
+        text_color = option.palette.color(QPalette.ColorRole.Text)
+        x = rect.left()
+        for col, texts in enumerate(columns):
+            width = max(metrics.horizontalAdvance(text) for text in texts) + 12
+            for row, text in enumerate(texts):
+                painter.setPen(muted if row == 0 or col == 0 else text_color)
+                cell_rect = QRect(x, rect.top() + row * height, width - 6, height)
+                painter.drawText(cell_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, text)
+            x += width
+            if x > rect.right():
+                break
+
+    def _paint_sparkline(self, painter: QPainter, option: QStyleOptionViewItem, index: ModelIndex) -> None:
+        """
+        Paint the sparkline of an array in the free space right of its description. It is computed in the background
+        on the first paint at a given width.
+        """
+        text: str = index.data(ItemDataRole.DisplayRole) or ""
+        rect = option.rect.adjusted(0, 3, -4, -3)
+        left = rect.left() + option.fontMetrics.horizontalAdvance(text) + 16
+        width = min(rect.right() - left, self.SPARKLINE_MAX_WIDTH) // self.SPARKLINE_WIDTH_STEP
+        width *= self.SPARKLINE_WIDTH_STEP
+        if width < self.SPARKLINE_MIN_WIDTH or rect.height() < 4:
+            return
+        array = self._host.index_data(index)
+        if not isinstance(array, np.ndarray):
+            return
+        array = cast(npt.NDArray[Any], array)
+        engine = self.sparklines
+        found, sparkline = engine.cached(array, width)
+        if not found:
+            engine.request(array, width)
+            return
+        if sparkline is None:
+            return
+
+        n_bins = len(sparkline.lows)
+        valid = ~np.isnan(sparkline.lows)
+        step = width / n_bins
+        xs = (left + (np.arange(n_bins) + 0.5) * step)[valid].tolist()
+        bottoms = (rect.bottom() - sparkline.lows[valid] * rect.height()).tolist()
+        tops = (rect.bottom() - sparkline.highs[valid] * rect.height()).tolist()
+        selected = option.state & QStyle.StateFlag.State_Selected
+        color = option.palette.color(QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Link)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        if sparkline.kind is SparklineKind.HISTOGRAM:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            bar = max(1.0, step - 1)
+            painter.drawRects(
+                [QRectF(x - bar / 2, top, bar, bottom - top) for x, top, bottom in zip(xs, tops, bottoms, strict=True)]
+            )
+        elif step > 1:
+            # Fewer samples than pixels, the lines of the bins would be isolated dots
+            painter.setPen(color)
+            painter.drawPolyline([QPointF(x, top) for x, top in zip(xs, tops, strict=True)])
+            painter.drawPolyline([QPointF(x, bottom) for x, bottom in zip(xs, bottoms, strict=True)])
+        else:
+            painter.setPen(color)
+            painter.drawLines([QLineF(x, bottom, x, top) for x, top, bottom in zip(xs, tops, bottoms, strict=True)])
+        painter.restore()
+
+    def _array_summary(self, array: npt.NDArray[Any]) -> str:
+        found, stats = self.array_stats.cached(array, None)
+        if not found:
+            # The first paint counts as the first view of the array
+            self.array_stats.request(array, None)
+            return PENDING_TEXT
+        return str(stats) if stats is not None else "n/a"
+
+    def _traceback_excerpt(self, tb: types.TracebackType) -> list[str]:
+        cached = self._excerpts.get(id(tb))
+        if cached is not None and cached[0] is tb:
+            return cached[1]
+
+        # Only the last few frames are formatted
+        frames: deque[tuple[types.FrameType, int]] = deque(maxlen=self.PREVIEW_LINES // 2)
+        current: types.TracebackType | None = tb
+        n_frames = 0
+        while current is not None:
+            frames.append((current.tb_frame, current.tb_lineno))
+            n_frames += 1
+            current = current.tb_next
+        summary = traceback.StackSummary.extract(iter(frames))
+        lines = [line for entry in summary.format() for line in entry.rstrip().splitlines()]
+        if n_frames > len(frames):
+            lines.insert(0, f"... {n_frames - len(frames)} more frame(s), activate to show all")
+        self._excerpts[id(tb)] = (tb, lines)
+        return lines
+
+    def createEditor(self, parent: QWidget, option: QStyleOptionViewItem, index: ModelIndex) -> QWidget:
+        kind: PreviewKind | None = index.data(PreviewKindRole)
+        if kind is None:
+            # Inline editor of a value (see `DataTreeWidget.edit`)
+            return super().createEditor(parent, option, index)
+        editor = self._host.create_preview_editor(index)
+        editor.setParent(parent)
+        return editor
+
+    def updateEditorGeometry(self, editor: QWidget, option: QStyleOptionViewItem, index: ModelIndex) -> None:
+        editor.setGeometry(option.rect)
+
+    def setEditorData(self, editor: QWidget, index: ModelIndex) -> None:
+        if isinstance(editor, QLineEdit) and index.data(PreviewKindRole) is None:
+            editor.setText(self._host.edit_text(index))
+
+    def setModelData(self, editor: QWidget, model: QAbstractItemModel, index: ModelIndex) -> None:
+        if isinstance(editor, QLineEdit) and index.data(PreviewKindRole) is None:
+            self._host.set_edit_text(index, editor.text())
@@ -0,0 +1,112 @@
+import dataclasses
+import enum
+from collections.abc import Iterable, MutableMapping, MutableSequence
+from dataclasses import dataclass
+from typing import Any, Final, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from pyside_widgets.array_table_view import ElementIndex
+
+
+class EditMode(enum.Enum):
+    # Edits only change what the tree shows
+    DISPLAY = enum.auto()
+    # Edits are queued and written to the data on `DataTreeWidget.commit_edits`
+    WRITE_BACK = enum.auto()
+
+
+@dataclass(frozen=True, slots=True)
+class PendingEdit:
+    """
+    An edit queued in `EditMode.WRITE_BACK`, see `DataTreeWidget.queue_edit`.
+
+    Attributes:
+        path (tuple[str | int, ...]): The path of the edited value.
+        value (Any): The new value.
+        element (ElementIndex | None): For edits of an array element, its index in the array at `path`.
+    """
+
+    path: tuple[str | int, ...]
+    value: Any
+    element: ElementIndex | None = None
+
+
+# Types of the values that can be edited as text
+EDITABLE_TYPES: Final = (bool, int, float, complex, str, np.bool_, np.number, np.str_)
+
+
+def _is_dataclass_instance(value: Any) -> bool:
+    return dataclasses.is_dataclass(value) and not isinstance(value, type)
+
+
+def _is_field_key(container: Any, key: Any) -> bool:
+    """
+    Check whether `key` is the index of an element of a structured array followed by a field name.
+    """
+    if not isinstance(container, np.ndarray) or not isinstance(key, tuple):
+        return False
+    index = cast(tuple[Any, ...], key)
+    return bool(index) and isinstance(index[-1], str)
+
+
+def is_writable(container: Any) -> bool:
+    if isinstance(container, (MutableMapping, MutableSequence, np.ndarray, np.void)):
+        return True
+    return _is_dataclass_instance(container)
+
+
+def get_child(container: Any, key: Any) -> Any:
+    if _is_dataclass_instance(container):
+        return getattr(container, key)
+    if _is_field_key(container, key):
+        return container[key[-1]][key[:-1]]
+    return container[key]
+
+
+def set_child(container: Any, key: Any, value: Any) -> None:
+    if _is_dataclass_instance(container):
+        setattr(container, key, value)
+    elif _is_field_key(container, key):
+        # The field is a view, the element is written in place
+        container[key[-1]][key[:-1]] = value
+    else:
+        container[key] = value
+
+
+def write_edits(root_data: Any, edits: Iterable[PendingEdit]) -> None:
+    """
+    Write `edits` to the data below `root_data`, as one transaction.
+
+    All targets are looked up by path before anything is written, and the values already written are restored if a
+    write fails, so the data is either fully updated or left as it was. Array elements are written in place.
+
+    Raises:
+        LookupError, TypeError, ValueError: If a target no longer exists, cannot be written, or rejected the value.
+    """
+    targets: list[tuple[Any, Any, Any]] = []
+    for edit in edits:
+        keys = edit.path if edit.element is not None else edit.path[:-1]
+        container = root_data
+        for key in keys:
+            container = get_child(container, key)
+        if edit.element is not None:
+            if not isinstance(container, np.ndarray):
+                raise TypeError(f"The value at {edit.path} is not an array")
+            targets.append((cast(npt.NDArray[Any], container), edit.element, edit.value))
+        elif is_writable(container):
+            targets.append((container, edit.path[-1], edit.value))
+        else:
+            raise TypeError(f"{type(container).__name__} at {edit.path[:-1]} cannot be modified")
+
+    written: list[tuple[Any, Any, Any]] = []
+    try:
+        for container, key, value in targets:
+            old = get_child(container, key)
+            set_child(container, key, value)
+            written.append((container, key, old))
+    except Exception:
+        for container, key, old in reversed(written):
+            set_child(container, key, old)
+        raise
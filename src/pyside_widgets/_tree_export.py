@@ -0,0 +1,321 @@
+import contextlib
+import dataclasses
+import enum
+import io
+import json
+import os
+import time
+import zipfile
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, BinaryIO, Final, Self, TextIO, cast
+
+import numpy as np
+import numpy.typing as npt
+from PySide6.QtCore import Signal
+
+from pyside_widgets._background import Worker, WorkerSignals
+from pyside_widgets._bounded_repr import full_text
+from pyside_widgets.data_tree_handlers import registry as handlers
+
+# Arrays are written in slices of at most this many bytes
+DEFAULT_CHUNK_BYTES: Final = 16 << 20
+# Name of the member of `.npz` exports holding the structure
+TREE_MEMBER: Final = "tree.json"
+_PROGRESS_INTERVAL_S: Final = 0.05
+_CANCEL_CHECK_NODES: Final = 1024
+
+type ProgressCallback = Callable[[int, int], None]
+
+
+class ExportFormat(enum.Enum):
+    # Structure and scalars as JSON, arrays as `.npy` members of the same archive
+    NPZ = enum.auto()
+    # Structure and scalars as JSON, arrays as `.npy` files in a `<name>_arrays` directory next to it
+    JSON = enum.auto()
+    # A single array
+    NPY = enum.auto()
+
+    @classmethod
+    def from_path(cls, path: str | os.PathLike[str]) -> Self:
+        suffix = Path(path).suffix.lower()
+        names = {".npz": "NPZ", ".json": "JSON", ".npy": "NPY"}
+        if suffix not in names:
+            raise ValueError(f"Unknown export format: {suffix or path}")
+        return cls[names[suffix]]
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def write_npy(
+    fp: BinaryIO,
+    array: npt.NDArray[Any],
+    on_bytes: Callable[[int], None] | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> None:
+    """
+    Write `array` in the `.npy` format, in slices of at most `chunk_bytes` bytes.
+
+    The buffer of contiguous arrays (including `np.memmap`) is written as is, through memoryview slices, so nothing is
+    copied and only the pages of the current slice of a memory mapped file are read. Other arrays are copied one
+    bounded block of rows at a time.
+
+    Args:
+        fp (BinaryIO): The file to write to.
+        array (NDArray): The array, must not have an object dtype.
+        on_bytes (Callable[[int], None] | None, optional): Called with the number of bytes after each slice, may raise
+            to abort.
+        chunk_bytes (int, optional): Maximum number of bytes written at once.
+    """
+    if array.dtype.hasobject:
+        raise TypeError("Arrays of Python objects cannot be written as .npy")
+    header = np.lib.format.header_data_from_array_1_0(array)
+    try:
+        np.lib.format.write_array_header_1_0(fp, header)
+    except ValueError:
+        # The header of arrays with many dimensions or fields does not fit into version 1.0
+        np.lib.format.write_array_header_2_0(fp, header)
+
+    if array.flags.c_contiguous or array.flags.f_contiguous:
+        # In memory order, `header` declares Fortran order for arrays that are only F-contiguous
+        buffer = memoryview(array.reshape(-1, order="A").view(np.uint8))
+        for start in range(0, len(buffer), chunk_bytes):
+            chunk = buffer[start : start + chunk_bytes]
+            fp.write(chunk)
+            if on_bytes is not None:
+                on_bytes(len(chunk))
+        return
+
+    rows = max(1, chunk_bytes // max(1, array[0].nbytes))
+    for start in range(0, len(array), rows):
+        block = np.ascontiguousarray(array[start : start + rows])
+        fp.write(memoryview(block.reshape(-1).view(np.uint8)))
+        if on_bytes is not None:
+            on_bytes(block.nbytes)
+
+
+def _is_object(data: Any) -> bool:
+    if isinstance(data, (Mapping, np.void)):
+        return True
+    return dataclasses.is_dataclass(data) and not isinstance(data, type)
+
+
+def _scalar_json(data: Any) -> str:
+    value = cast(Any, data).item() if isinstance(data, np.generic) else data
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return json.dumps(value)
+    return json.dumps(full_text(value))
+
+
+def write_json(
+    data: Any,
+    out: TextIO,
+    store_array: Callable[[npt.NDArray[Any]], dict[str, Any]],
+    check: Callable[[], None] | None = None,
+) -> None:
+    """
+    Write `data` as JSON, one value at a time.
+
+    Containers are walked with an explicit stack over the lazy child iterators of their type handlers, so neither the
+    JSON text nor a converted copy of the data is ever built in memory. Mappings, dataclasses and records become JSON
+    objects (with their keys converted to strings), other containers and arrays of Python objects become arrays.
+    Other arrays are replaced by the object returned by `store_array`, containers that contain themselves by
+    `{"__cycle__": <type name>}`.
+
+    Args:
+        data (Any): The data to write.
+        out (TextIO): The file to write to.
+        store_array (Callable[[NDArray], dict[str, Any]]): Called for every array (without object dtype), returns
+            the JSON object written in its place.
+        check (Callable[[], None] | None, optional): Called regularly, may raise to abort.
+    """
+    # Per open container: its children, whether it is an object, its id and whether a child was written
+    stack: list[tuple[Iterator[tuple[str | int, Any]], bool, int, list[bool]]] = []
+    ancestors: set[int] = set()
+
+    def write_value(value: Any) -> None:
+        if isinstance(value, np.ndarray):
+            array = cast(npt.NDArray[Any], value)
+            if not array.dtype.hasobject:
+                out.write(json.dumps(store_array(array)))
+            elif array.ndim == 0:
+                write_value(array[()])
+            else:
+                # Arrays of Python objects are written element by element, as nested JSON arrays
+                open_container(array, enumerate(array), is_object=False)
+            return
+        children = handlers.handler(value).children
+        if children is None or isinstance(value, (str, bytes)):
+            out.write(_scalar_json(value))
+            return
+        open_container(value, children(value), _is_object(value))
+
+    def open_container(value: Any, children: Iterator[tuple[str | int, Any]], is_object: bool) -> None:
+        if id(value) in ancestors:
+            out.write(json.dumps({"__cycle__": type(value).__name__}))
+            return
+        out.write("{" if is_object else "[")
+        ancestors.add(id(value))
+        stack.append((children, is_object, id(value), [False]))
+
+    write_value(data)
+    n_nodes = 0
+    while stack:
+        children, is_object, container_id, started = stack[-1]
+        child = next(children, None)
+        if child is None:
+            out.write("}" if is_object else "]")
+            ancestors.discard(container_id)
+            stack.pop()
+            continue
+        if started[0]:
+            out.write(", ")
+        started[0] = True
+        key, value = child
+        if is_object:
+            out.write(json.dumps(str(key)))
+            out.write(": ")
+        write_value(value)
+        n_nodes += 1
+        if check is not None and n_nodes % _CANCEL_CHECK_NODES == 0:
+            check()
+
+
+def export_data(
+    data: Any,
+    path: str | os.PathLike[str],
+    fmt: ExportFormat | None = None,
+    progress: ProgressCallback | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> None:
+    """
+    Export `data` to `path` without building it in memory first.
+
+    The structure is written as JSON (see `write_json`), arrays are referenced in it as
+    `{"__array__": <name>, "dtype": ..., "shape": ...}` and written after it as `.npy` (see `write_npy`): as members
+    `arrays/<n>.npy` of the archive for `ExportFormat.NPZ`, whose structure is the member `tree.json`, or as files in
+    the directory `<name>_arrays` for `ExportFormat.JSON`. An array that occurs several times is written once.
+    `ExportFormat.NPY` writes a single array. Arrays of Python objects are written element by element as part of the
+    structure.
+
+    An existing `<name>_arrays` directory is reused, files of the same name in it are replaced. If the export fails or
+    is cancelled, the files written by it are removed, as is the directory if it was created by the export.
+
+    Args:
+        data (Any): The data to export.
+        path (str | PathLike): The file to write.
+        fmt (ExportFormat | None, optional): The format, by default derived from the suffix of `path`.
+        progress (ProgressCallback | None, optional): Called regularly with the number of bytes written and the
+            total, which is 0 while the structure is written.
+        is_cancelled (Callable[[], bool] | None, optional): Checked regularly, the export is aborted with
+            `ExportCancelled` if it returns True.
+        chunk_bytes (int, optional): Maximum number of array bytes written at once.
+    """
+    path = Path(path)
+    fmt = fmt if fmt is not None else ExportFormat.from_path(path)
+    if fmt is ExportFormat.NPY and not isinstance(data, np.ndarray):
+        raise TypeError("Only arrays can be exported as .npy")
+
+    done = 0
+    total = 0
+    last_report = 0.0
+
+    def check() -> None:
+        nonlocal last_report
+        if is_cancelled is not None and is_cancelled():
+            raise ExportCancelled
+        now = time.perf_counter()
+        if progress is not None and now - last_report >= _PROGRESS_INTERVAL_S:
+            last_report = now
+            progress(done, total)
+
+    def on_bytes(n_bytes: int) -> None:
+        nonlocal done
+        done += n_bytes
+        check()
+
+    arrays: list[npt.NDArray[Any]] = []
+    names: dict[int, str] = {}
+    array_dir = path.with_name(f"{path.stem}_arrays")
+    # What the export created in `array_dir`, the only things removed from it if the export fails
+    created_dir = False
+    written: list[Path] = []
+
+    def store_array(array: npt.NDArray[Any]) -> dict[str, Any]:
+        # Only a reference is kept, the array is written once the structure is complete
+        name = names.get(id(array))
+        if name is None:
+            name = names[id(array)] = f"arrays/{len(arrays)}.npy"
+            arrays.append(array)
+        if fmt is ExportFormat.JSON:
+            name = f"{array_dir.name}/{name.removeprefix('arrays/')}"
+        return {"__array__": name, "dtype": str(array.dtype), "shape": list(array.shape)}
+
+    try:
+        if fmt is ExportFormat.NPY:
+            array = cast(npt.NDArray[Any], data)
+            total = array.nbytes
+            with open(path, "wb") as fp:
+                write_npy(fp, array, on_bytes, chunk_bytes)
+        elif fmt is ExportFormat.NPZ:
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+                with io.TextIOWrapper(archive.open(TREE_MEMBER, "w", force_zip64=True), encoding="utf-8") as out:
+                    write_json(data, out, store_array, check)
+                total = sum(array.nbytes for array in arrays)
+                for array in arrays:
+                    with archive.open(names[id(array)], "w", force_zip64=True) as fp:
+                        write_npy(fp, array, on_bytes, chunk_bytes)  # type: ignore[arg-type]
+        else:
+            with open(path, "w", encoding="utf-8") as out:
+                write_json(data, out, store_array, check)
+            total = sum(array.nbytes for array in arrays)
+            if arrays and not array_dir.is_dir():
+                array_dir.mkdir()
+                created_dir = True
+            for array in arrays:
+                array_path = array_dir / names[id(array)].removeprefix("arrays/")
+                with open(array_path, "wb") as fp:
+                    written.append(array_path)
+                    write_npy(fp, array, on_bytes, chunk_bytes)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        for array_path in written:
+            array_path.unlink(missing_ok=True)
+        if created_dir:
+            with contextlib.suppress(OSError):
+                array_dir.rmdir()
+        raise
+    if progress is not None:
+        progress(total, total)
+
+
+class _ExportWorkerSignals(WorkerSignals):
+    sig_progress = Signal(object, object)
+
+
+class ExportWorker(Worker[_ExportWorkerSignals]):
+    """
+    Runs `export_data` in a thread pool. `sig_finished` is emitted with the worker's token and None, or the error
+    message if the export failed or was cancelled.
+    """
+
+    failed_result = "Unexpected error"
+
+    def __init__(self, token: int, data: Any, path: str | os.PathLike[str], fmt: ExportFormat | None = None) -> None:
+        super().__init__(token, _ExportWorkerSignals())
+        self.path = Path(path)
+        self._data = data
+        self._fmt = fmt
+
+    def work(self) -> str | None:
+        data, self._data = self._data, None
+        try:
+            export_data(data, self.path, self._fmt, self.signals.sig_progress.emit, self.is_cancelled)
+        except ExportCancelled:
+            return "Cancelled"
+        except (OSError, ValueError, TypeError) as exc:
+            return str(exc) or type(exc).__name__
+        return None
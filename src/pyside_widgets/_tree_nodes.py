@@ -0,0 +1,246 @@
+import itertools
+import types
+import weakref
+import zlib
+from collections.abc import Iterator, MutableMapping, MutableSequence, MutableSet
+from dataclasses import dataclass
+from typing import Any, Final, cast
+
+import numpy as np
+import numpy.typing as npt
+from PySide6.QtCore import QModelIndex, QPersistentModelIndex, Qt
+from PySide6.QtWidgets import QTreeWidgetItem
+
+from pyside_widgets._bounded_repr import full_text
+from pyside_widgets.data_tree_handlers import PreviewKind, TypeHandler
+from pyside_widgets.data_tree_handlers import registry as handlers
+
+ItemDataRole = Qt.ItemDataRole
+type ModelIndex = QModelIndex | QPersistentModelIndex
+
+PreviewKindRole = ItemDataRole.UserRole + 1
+PreviewDataRole = ItemDataRole.UserRole + 2
+MoreRowsRole = ItemDataRole.UserRole + 3
+ReferenceRole = ItemDataRole.UserRole + 4
+StaleRole = ItemDataRole.UserRole + 5
+SparklineRole = ItemDataRole.UserRole + 6
+
+PENDING_TEXT: Final = "…"
+
+
+def type_name(data: Any) -> str:
+    """
+    Return the type string shown in the `Type` column for the given data.
+    """
+    return _type_name(data, handlers.handler(data))
+
+
+def _type_name(data: Any, handler: TypeHandler) -> str:
+    if handler.type_name is not None:
+        return handler.type_name(data)
+    type_str = type(data).__name__
+    if type_str == "instance":
+        type_str += f": {data.__class__.__name__}"
+    return type_str
+
+
+def describe_data(data: Any) -> tuple[str, str]:
+    """
+    Return the type string and the short description shown for the given data.
+
+    Both are provided by the `TypeHandler` registered for the type of the data (see `data_tree_handlers`). By default,
+    the description of other objects than containers and arrays is bounded (see `BoundedRepr`), the full text is only
+    created on demand by `full_text`.
+
+    Args:
+        data (Any): Data to be described.
+
+    Returns:
+        tuple ((str, str)): type string, description text
+    """
+    handler = handlers.handler(data)
+    return _type_name(data, handler), handler.describe(data)
+
+
+def iter_children(data: Any) -> Iterator[tuple[str | int, Any]]:
+    """
+    Iterate over the `(key, value)` pairs of the children of the given data, without copying the container.
+
+    Args:
+        data (Any): Data whose children should be iterated.
+    """
+    children = handlers.handler(data).children
+    return children(data) if children is not None else iter(())
+
+
+def preview_text(data: Any) -> str | None:
+    """
+    Return the (potentially expensive to compute) text shown in the viewer of the given data, if any. It is only
+    computed when the preview of the data is activated.
+
+    Array statistics are not included here, they are computed lazily in the background (see `compute_array_stats`).
+
+    Args:
+        data (Any): Data to be summarized.
+
+    Returns:
+        str | None: The preview text provided by the type's handler (e.g. the formatted frames of tracebacks), otherwise
+        None.
+    """
+    text = handlers.handler(data).preview_text
+    return text(data) if text is not None else None
+
+
+def viewer_content(data: Any) -> str | types.TracebackType:
+    """
+    Return what the text viewer opened from the preview of the given data shows: the preview text of its handler if
+    there is one, otherwise the traceback itself (whose frames are formatted as they are paged in) or the full text.
+    """
+    text = preview_text(data)
+    if text is not None:
+        return text
+    return data if isinstance(data, types.TracebackType) else full_text(data)
+
+
+def preview_kind(data: Any, long_text: bool = False) -> PreviewKind | None:
+    """
+    Return the kind of preview shown below the node of the given data, if any.
+
+    Args:
+        data (Any): Data to be previewed.
+        long_text (bool, optional): Whether the description of the data is too long for the `Value` column.
+    """
+    preview = handlers.handler(data).preview
+    kind = preview(data) if preview is not None else None
+    if kind is None and long_text:
+        return PreviewKind.TEXT
+    return kind
+
+
+def has_children(data: Any) -> bool:
+    """
+    Check whether the given data has any children to display.
+
+    Args:
+        data (Any): Data to be checked.
+    """
+    handler = handlers.handler(data)
+    return handler.children is not None and handler.count(data) > 0
+
+
+class WeakData(weakref.ref[Any]):
+    """
+    Weak reference to the data of a node, used for data that is kept alive by the data of its parent node (see
+    `TypeHandler.owns_children`).
+    """
+
+    __slots__ = ()
+
+
+def data_ref(data: Any, strong: bool) -> Any:
+    """
+    Return what the path index stores for `data`: the data itself, or a weak reference if possible and `strong` is
+    False.
+    """
+    if strong or not type(data).__weakrefoffset__:
+        return data
+    return WeakData(data)
+
+
+def child_items(item: QTreeWidgetItem) -> list[QTreeWidgetItem]:
+    """
+    Return the children of `item` (which the stubs of `QTreeWidgetItem.child` declare as optional).
+    """
+    return cast(list[QTreeWidgetItem], [item.child(row) for row in range(item.childCount())])
+
+
+def is_container(data: Any) -> bool:
+    return handlers.handler(data).children is not None
+
+
+def values_equal(old: Any, new: Any) -> bool:
+    """
+    Cheap equality check used when diffing leaf values. Arrays are compared by identity, shape and dtype before their
+    contents are compared. A value is always equal to itself, changes made in place are found by `content_version`.
+    """
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, np.ndarray):
+        old_array, new_array = cast(npt.NDArray[Any], old), cast(npt.NDArray[Any], new)
+        if old_array.shape != new_array.shape or old_array.dtype != new_array.dtype:
+            return False
+        try:
+            return bool(np.array_equal(old_array, new_array, equal_nan=old_array.dtype.kind in "fc"))
+        except TypeError:
+            return False
+    if isinstance(old, types.TracebackType):
+        return False
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        # E.g. values whose comparison returns an array, which has no truth value
+        return False
+
+
+def content_version(data: Any) -> int | None:
+    """
+    Return a checksum of the contents of a mutable value, which changes when it is modified in place, or None for other
+    values. Arrays are checksummed by their bytes, mutable containers only by the identities of their items.
+    """
+    if isinstance(data, np.ndarray):
+        return zlib.crc32(cast(npt.NDArray[Any], data).tobytes())
+    if isinstance(data, MutableMapping):
+        mapping = cast(MutableMapping[Any, Any], data)
+        return hash((tuple(map(id, mapping)), tuple(map(id, mapping.values()))))
+    if isinstance(data, MutableSequence | MutableSet):
+        return hash(tuple(map(id, cast(MutableSequence[Any] | MutableSet[Any], data))))
+    return None
+
+
+def cheap_description(data: Any) -> str | None:
+    """
+    Return the description of `data` if it can be computed in constant time, otherwise None.
+    """
+    handler = handlers.handler(data)
+    return handler.describe(data) if handler.cheap else None
+
+
+@dataclass(frozen=True, slots=True)
+class MoreRows:
+    """
+    Placeholder for the children of a node that were not built because of the depth or child limits. It is shown as
+    the last child of the node.
+    """
+
+    offset: int
+    remaining: int
+
+
+def reference_text(path: tuple[str | int, ...], target: tuple[str | int, ...]) -> str:
+    """
+    Return the text shown for a node whose data was already shown at `target`.
+    """
+    target_str = "/".join(map(str, target)) or "<root>"
+    if path[: len(target)] == target:
+        return f"<cycle: reference to {target_str}>"
+    return f"<same object as {target_str}>"
+
+
+def child_slice(
+    data: Any, depth: int, offset: int, max_depth: int | None, max_children: int | None
+) -> tuple[list[tuple[str | int, Any]], MoreRows | None]:
+    """
+    Return the children of `data` to build, starting at `offset`, and the placeholder for the ones left out.
+    """
+    handler = handlers.handler(data)
+    total = handler.count(data) if handler.children is not None else 0
+    if offset >= total:
+        return [], None
+    if max_depth is not None and depth >= max_depth:
+        return [], MoreRows(offset, total - offset)
+    stop = total if max_children is None else min(total, offset + max_children)
+    more = MoreRows(stop, total - stop) if stop < total else None
+    return list(itertools.islice(iter_children(data), offset, stop)), more
+
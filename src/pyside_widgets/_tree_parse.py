@@ -0,0 +1,108 @@
+from typing import Any
+
+from PySide6.QtCore import Signal
+
+from pyside_widgets._background import Worker, WorkerSignals
+from pyside_widgets._path_index import NO_PARENT
+from pyside_widgets._tree_nodes import (
+    MoreRows,
+    cheap_description,
+    child_slice,
+    describe_data,
+    has_children,
+    reference_text,
+    type_name,
+)
+
+# (sequence number of the parent record, key, depth, type, data, description), see `ParseWorker`
+type NodeRecord = tuple[int, str | int | None, int, str, Any, str | None]
+# (sequence number of the node record, description)
+type DetailRecord = tuple[int, str]
+
+
+class _ParseWorkerSignals(WorkerSignals):
+    sig_nodes = Signal(int, list)
+    sig_details = Signal(int, list)
+
+
+class ParseWorker(Worker[_ParseWorkerSignals]):
+    """
+    Walks the data in a thread pool and streams the tree structure and node descriptions back in batches.
+
+    The structure (key, type and cheap descriptions) is sent first so the tree can be shown right away with
+    placeholders, the expensive descriptions (e.g. `str(data)` of arbitrary objects) follow. Records are
+    numbered in the order they are sent and refer to their parent by its number (-1 for the root), so no paths have to
+    be built.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        data: Any,
+        batch_size: int = 500,
+        max_depth: int | None = None,
+        max_children: int | None = None,
+    ) -> None:
+        super().__init__(generation, _ParseWorkerSignals())
+        self._data = data
+        self._batch_size = batch_size
+        self._max_depth = max_depth
+        self._max_children = max_children
+
+    def work(self) -> None:
+        expensive: list[tuple[int, Any]] = []
+        batch: list[NodeRecord] = []
+        # Parent and key of every record sent so far, only used to build the paths shown in reference rows
+        parents: list[int] = []
+        keys: list[str | int | None] = []
+
+        def path_of(seq: int) -> tuple[str | int, ...]:
+            path: list[str | int] = []
+            while seq >= 0 and parents[seq] >= 0:
+                path.append(keys[seq])  # type: ignore[arg-type]
+                seq = parents[seq]
+            return tuple(reversed(path))
+
+        seen: dict[int, int] = {}
+        stack: list[tuple[int, str | int | None, Any, int]] = [(NO_PARENT, None, self._data, 0)]
+        while stack:
+            if self.is_cancelled():
+                break
+            parent, key, data, depth = stack.pop()
+            seq = len(parents)
+            parents.append(parent)
+            keys.append(key)
+            if isinstance(data, MoreRows):
+                # Sent as a node record so it arrives after the children that were built
+                batch.append((parent, None, depth, "", data, None))
+            elif (target := seen.get(id(data)) if has_children(data) else None) is not None:
+                batch.append((parent, key, depth, type_name(data), data, reference_text(path_of(seq), path_of(target))))
+            else:
+                if has_children(data):
+                    seen[id(data)] = seq
+                desc = cheap_description(data)
+                batch.append((parent, key, depth, type_name(data), data, desc))
+                if desc is None:
+                    expensive.append((seq, data))
+                children, more = child_slice(data, depth, 0, self._max_depth, self._max_children)
+                if more is not None:
+                    stack.append((seq, None, more, depth + 1))
+                stack.extend((seq, key, child, depth + 1) for key, child in reversed(children))
+            if len(batch) >= self._batch_size:
+                self.signals.sig_nodes.emit(self.token, batch)
+                batch = []
+        if self.is_cancelled():
+            return
+        if batch:
+            self.signals.sig_nodes.emit(self.token, batch)
+
+        details: list[DetailRecord] = []
+        for seq, data in expensive:
+            if self.is_cancelled():
+                return
+            details.append((seq, describe_data(data)[1]))
+            if len(details) >= self._batch_size:
+                self.signals.sig_details.emit(self.token, details)
+                details = []
+        if details:
+            self.signals.sig_details.emit(self.token, details)
@@ -0,0 +1,205 @@
+import operator
+from collections.abc import Callable, Iterable
+from typing import Any, Final, cast
+
+from PySide6.QtCore import QObject, Qt, QTimer
+from PySide6.QtWidgets import QTreeWidget, QTreeWidgetItem
+
+from pyside_widgets._path_index import NO_PARENT, PathIndex
+from pyside_widgets._sort_keys import MAX_SORT_TEXT, SortKey, name_sort_key, natural_key, value_sort_key
+from pyside_widgets._tree_nodes import ItemDataRole, MoreRowsRole, child_items
+
+# If more nodes need their children re-sorted, the whole tree is sorted with a single layout change
+MAX_INCREMENTAL_SORTS: Final = 64
+
+
+class DataTreeItem(QTreeWidgetItem):
+    """
+    Item of a `DataTreeWidget`.
+
+    Items are ordered by the rank assigned to them by the last sort pass (see `TreeSorter`), so Qt moves them (keeping
+    expansion, selection and item widgets) without comparing their texts.
+    """
+
+    sort_rank = 0
+
+    def __lt__(self, other: QTreeWidgetItem) -> bool:
+        return self.sort_rank < getattr(other, "sort_rank", 0)
+
+
+class TreeSorter(QObject):
+    """
+    Keeps the children of every node of a `DataTreeWidget` sorted by a column.
+
+    Names are ordered by `name_sort_key` (integer keys like list indices by value, other keys in natural order), types
+    by `natural_key` of their text and values by `value_sort_key` (numbers by value, before all other values). Preview
+    rows stay first and "… N more" rows last. The sort key of a node is computed once and cached until its text
+    changes. Nodes whose children changed are marked with `add_unsorted`/`mark_unsorted`, texts of existing rows are
+    written with `set_text`, which marks their parent. Only the children of marked nodes are re-sorted, once control
+    returns to the event loop and `is_busy` returns False.
+    """
+
+    def __init__(
+        self,
+        tree: QTreeWidget,
+        nodes: PathIndex[QTreeWidgetItem],
+        node_data: Callable[[QTreeWidgetItem], Any],
+        is_busy: Callable[[], bool],
+    ) -> None:
+        super().__init__(tree)
+        self._tree = tree
+        self._nodes = nodes
+        self._node_data = node_data
+        self._is_busy = is_busy
+        self._column: int | None = None
+        self._order = Qt.SortOrder.AscendingOrder
+        # Sort keys by node id, with the text they were computed from
+        self._keys: dict[int, tuple[str, SortKey]] = {}
+        # Ids of the nodes whose children have to be re-sorted
+        self._unsorted: set[int] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._apply_pending)
+
+    def column(self) -> int | None:
+        return self._column
+
+    def order(self) -> Qt.SortOrder:
+        return self._order
+
+    def sort_by_column(self, column: int, order: Qt.SortOrder) -> None:
+        if column != self._column:
+            self._keys.clear()
+        self._column, self._order = column, order
+        header = self._tree.header()
+        header.setSortIndicator(column, order)
+        header.setSortIndicatorShown(True)
+        self._unsorted.clear()
+        self._timer.stop()
+        self._sort_all()
+
+    def stop(self) -> None:
+        """
+        Stop keeping the tree sorted. The current order is kept.
+        """
+        if self._column is None:
+            return
+        self._column = None
+        self.reset()
+        self._tree.header().setSortIndicatorShown(False)
+
+    def reset(self) -> None:
+        """
+        Forget the cached sort keys and the nodes marked as unsorted, e.g. when the tree is cleared.
+        """
+        self._keys.clear()
+        self._unsorted.clear()
+        self._timer.stop()
+
+    def forget(self, node_id: int) -> None:
+        self._keys.pop(node_id, None)
+
+    def add_unsorted(self, node_id: int) -> None:
+        """
+        Mark the children of a node as unsorted, without scheduling the sort (see `schedule`).
+        """
+        if self._column is not None and node_id != NO_PARENT:
+            self._unsorted.add(node_id)
+
+    def mark_unsorted(self, node: QTreeWidgetItem) -> None:
+        node_id: int | None = node.data(0, ItemDataRole.UserRole)
+        if node_id is not None:
+            self.add_unsorted(node_id)
+            self.schedule()
+
+    def set_text(self, item: QTreeWidgetItem, column: int, text: str) -> None:
+        """
+        Set the text of `item` in `column`, and mark its parent as unsorted if the tree is sorted by that column.
+        """
+        if column == self._column and item.text(column) != text:
+            self.mark_unsorted(item.parent() or self._tree.invisibleRootItem())
+        item.setText(column, text)
+
+    def schedule(self) -> None:
+        if self._unsorted and not self._timer.isActive():
+            self._timer.start()
+
+    def _sort_key(self, item: QTreeWidgetItem, node_id: int, column: int) -> SortKey:
+        text = item.text(column)
+        data = self._node_data(item) if column == 2 else None
+        if not text and isinstance(data, str):
+            # Long texts are shown in a preview row instead
+            text = data[:MAX_SORT_TEXT]
+        cached = self._keys.get(node_id)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        if column == 0:
+            key = name_sort_key(self._nodes.key_of(node_id), text)
+        elif column == 2:
+            key = value_sort_key(data, text)
+        else:
+            key = natural_key(text)
+        self._keys[node_id] = (text, key)
+        return key
+
+    def _rank_children(self, node: QTreeWidgetItem) -> bool:
+        """
+        Assign the sort ranks of the children of `node`. Returns whether they are out of order.
+        """
+        count = node.childCount()
+        if count < 2 or self._column is None:
+            return False
+        column = self._column
+        children = child_items(node)
+        first: list[QTreeWidgetItem] = []
+        last: list[QTreeWidgetItem] = []
+        keyed: list[tuple[SortKey, QTreeWidgetItem]] = []
+        for child in children:
+            child_id: int | None = child.data(0, ItemDataRole.UserRole)
+            if child_id is not None:
+                keyed.append((self._sort_key(child, child_id, column), child))
+            elif child.data(0, MoreRowsRole) is not None:
+                last.append(child)
+            else:
+                first.append(child)
+        keyed.sort(key=operator.itemgetter(0), reverse=self._order == Qt.SortOrder.DescendingOrder)
+        ordered = [*first, *(child for _, child in keyed), *last]
+        for rank, child in enumerate(ordered):
+            child.sort_rank = rank  # type: ignore[attr-defined]
+        return any(new is not old for new, old in zip(ordered, children, strict=True))
+
+    def _sort_all(self) -> None:
+        nodes = self._nodes
+        parents = {nodes.parent_of(node_id) for node_id in nodes.ids()}
+        parents.discard(NO_PARENT)
+        self._sort_nodes(parents, everything=True)
+
+    def _sort_nodes(self, node_ids: Iterable[int], everything: bool = False) -> None:
+        """
+        Re-sort the children of the given nodes. With `everything`, `node_ids` must include all nodes with children.
+        """
+        nodes = self._nodes
+        # Nodes that were removed since they were marked have no value
+        moved = [
+            node
+            for node_id in node_ids
+            if (node := cast(QTreeWidgetItem | None, nodes.value_of(node_id))) is not None and self._rank_children(node)
+        ]
+        if everything and len(moved) > MAX_INCREMENTAL_SORTS:
+            # The ranks of all children are up to date, so Qt sorts the whole tree by them in one layout change
+            self._tree.sortItems(0, Qt.SortOrder.AscendingOrder)
+            self._tree.header().setSortIndicator(self._column, self._order)  # type: ignore[arg-type]
+            return
+        for node in moved:
+            node.sortChildren(0, Qt.SortOrder.AscendingOrder)
+
+    def _apply_pending(self) -> None:
+        if self._column is None or self._is_busy():
+            # Scheduled again once the tree is done (see `schedule`)
+            return
+        unsorted, self._unsorted = self._unsorted, set()
+        if len(unsorted) > MAX_INCREMENTAL_SORTS:
+            self._sort_all()
+        else:
+            self._sort_nodes(unsorted)
@@ -0,0 +1,241 @@
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, Final, cast
+
+import numpy as np
+import numpy.typing as npt
+from PySide6.QtCore import Signal
+
+from pyside_widgets._array_stats import DEFAULT_CHUNK_SIZE, iter_chunks
+from pyside_widgets._background import Worker, WorkerSignals
+from pyside_widgets.array_table_view import ElementIndex
+from pyside_widgets.data_tree_handlers import registry as handlers
+
+# Matches are sent to the GUI thread at most this often
+_BATCH_INTERVAL_S: Final = 0.05
+_CANCEL_CHECK_NODES: Final = 1024
+
+type Path = tuple[str | int, ...]
+type _Matcher = Callable[[npt.NDArray[Any]], npt.NDArray[np.bool_]]
+
+
+@dataclass(frozen=True, slots=True)
+class ValueMatch:
+    """
+    A value found by `iter_value_matches`.
+
+    Attributes:
+        path (Path): The path of the matching value, or of the array containing matching elements.
+        count (int): The number of matching elements of an array, 1 for other values.
+        element (ElementIndex | None): The index of the first matching element of an array, None for other values.
+    """
+
+    path: Path
+    count: int = 1
+    element: ElementIndex | None = None
+
+
+def _number(text: str, kind: type[complex]) -> Any:
+    try:
+        return kind(text)
+    except ValueError:
+        return None
+
+
+def _ascii_lower(chunk: npt.NDArray[Any]) -> npt.NDArray[Any]:
+    # Much faster than `np.strings.lower`, which decodes every element
+    chunk = np.ascontiguousarray(chunk)
+    codes = chunk.view(np.uint32 if chunk.dtype.kind == "U" else np.uint8)
+    is_upper = (codes - codes.dtype.type(ord("A"))) < 26
+    return (codes | (is_upper.astype(codes.dtype) << 5)).view(chunk.dtype)
+
+
+def array_matcher(dtype: np.dtype[Any], query: str) -> _Matcher | None:
+    """
+    Return a vectorized predicate selecting the elements of arrays of `dtype` that match `query`, or None if no
+    element can match (e.g. a query that is not a number for a numeric dtype).
+
+    Floats are compared with the tolerance of `np.isclose`, complex numbers with `np.isclose`, integers and booleans
+    with `==`, strings with `np.strings.find` on the lowercased elements. Elements are never formatted as text.
+    """
+    query = query.strip()
+    kind = dtype.kind
+    if kind == "b":
+        lowered = query.lower()
+        if lowered in ("true", "1"):
+            return lambda chunk: chunk
+        if lowered in ("false", "0"):
+            return lambda chunk: ~chunk
+        return None
+    if kind in "iu":
+        value = _number(query, float)
+        if value is None or not value.is_integer():
+            return None
+        info = np.iinfo(dtype)
+        if not info.min <= value <= info.max:
+            return None
+        integer = int(value)
+        return lambda chunk: chunk == integer
+    if kind == "f":
+        value = _number(query, float)
+        if value is None:
+            return None
+        if np.isnan(value):
+            return np.isnan
+        if np.isinf(value):
+            return lambda chunk: chunk == value
+        # Two comparisons instead of `np.isclose`, which builds several temporaries and is ~3x slower
+        tolerance = 1e-8 + 1e-5 * abs(value)
+        low, high = value - tolerance, value + tolerance
+        return lambda chunk: (chunk >= low) & (chunk <= high)
+    if kind == "c":
+        value = _number(query.replace(" ", ""), complex)
+        if value is None:
+            return None
+        return lambda chunk: np.isclose(chunk, value, equal_nan=True)
+    if kind in "US":
+        needle: str | bytes = query.lower() if kind == "U" else query.lower().encode()
+        if query.isascii():
+            return lambda chunk: np.strings.find(_ascii_lower(chunk), needle) >= 0
+        return lambda chunk: np.strings.find(np.strings.lower(chunk), cast(Any, needle)) >= 0
+    return None
+
+
+def _numpy_array(value: Any) -> npt.NDArray[Any] | None:
+    """
+    Return `value` if it is an array that is searched as a whole, i.e. not one of Python objects.
+    """
+    if isinstance(value, np.ndarray):
+        array = cast(npt.NDArray[Any], value)
+        if not array.dtype.hasobject:
+            return array
+    return None
+
+
+def search_array(
+    array: npt.NDArray[Any],
+    query: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> tuple[int, ElementIndex | None]:
+    """
+    Count the elements of `array` matching `query` (see `array_matcher`), in chunks of at most `chunk_size` elements.
+
+    Structured arrays are searched field by field.
+
+    Returns:
+        tuple[int, ElementIndex | None]: The number of matches and the index of the first one (with the field name
+        appended for structured arrays).
+    """
+    if array.dtype.names:
+        count, first = 0, None
+        for name in array.dtype.names:
+            n_field, field_first = search_array(array[name], query, chunk_size, is_cancelled)
+            if n_field and first is None and field_first is not None:
+                first = (*field_first[: array.ndim], name)
+            count += n_field
+        return count, first
+
+    matcher = array_matcher(array.dtype, query)
+    if matcher is None or array.size == 0:
+        return 0, None
+    count, first, offset = 0, None, 0
+    for chunk in iter_chunks(array, chunk_size):
+        if is_cancelled is not None and is_cancelled():
+            break
+        mask = matcher(chunk)
+        n_chunk = int(np.count_nonzero(mask))
+        if n_chunk and first is None:
+            flat_index = offset + int(np.argmax(mask))
+            first = tuple(int(i) for i in np.unravel_index(flat_index, array.shape))
+        count += n_chunk
+        offset += chunk.size
+    return count, first
+
+
+def iter_value_matches(
+    data: Any,
+    query: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> Iterator[ValueMatch]:
+    """
+    Iterate over the values in `data` that match `query`, depth first.
+
+    Values without children match if the text of their `Value` column (the bounded description of their type
+    handler) contains the query, case-insensitively. Arrays are searched element by element with vectorized
+    comparisons (see `search_array`). Containers are walked with an explicit stack over the lazy child iterators of
+    their type handlers and searched only once, even if they occur at several paths.
+    """
+    folded = query.casefold()
+    # Containers by id. They are kept alive, handlers create some on the fly (e.g. record fields), and the id of a
+    # freed one can be reused by another container.
+    seen: dict[int, Any] = {}
+    stack: list[tuple[Path, Iterator[tuple[str | int, Any]]]] = []
+    pending: list[tuple[Path, Any]] = [((), data)]
+    n_nodes = 0
+    while pending or stack:
+        if not pending:
+            path, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            key, value = child
+            pending.append(((*path, key), value))
+
+        if is_cancelled is not None and n_nodes % _CANCEL_CHECK_NODES == 0 and is_cancelled():
+            return
+        n_nodes += 1
+        path, value = pending.pop()
+        if (array := _numpy_array(value)) is not None:
+            count, element = search_array(array, query, chunk_size, is_cancelled)
+            if count:
+                yield ValueMatch(path, count, element)
+            continue
+
+        handler = handlers.handler(value)
+        if handler.children is not None and not isinstance(value, (str, bytes)):
+            if id(value) not in seen:
+                seen[id(value)] = value
+                stack.append((path, handler.children(value)))
+        elif folded in handler.describe(value).casefold():
+            yield ValueMatch(path)
+
+
+class _ValueSearchWorkerSignals(WorkerSignals):
+    sig_matches = Signal(int, list)
+
+
+class ValueSearchWorker(Worker[_ValueSearchWorkerSignals]):
+    """
+    Runs `iter_value_matches` in a thread pool. Matches are sent in batches with `sig_matches`, `sig_finished` is
+    emitted with the worker's token and the number of matches.
+    """
+
+    failed_result = 0
+
+    def __init__(self, token: int, data: Any, query: str) -> None:
+        super().__init__(token, _ValueSearchWorkerSignals())
+        self._data = data
+        self._query = query
+
+    def work(self) -> int:
+        data, self._data = self._data, None
+        n_matches = 0
+        batch: list[ValueMatch] = []
+        last_emit = time.perf_counter()
+        try:
+            for match in iter_value_matches(data, self._query, is_cancelled=self.is_cancelled):
+                batch.append(match)
+                n_matches += 1
+                now = time.perf_counter()
+                if now - last_emit >= _BATCH_INTERVAL_S:
+                    self.signals.sig_matches.emit(self.token, batch)
+                    batch = []
+                    last_emit = now
+        finally:
+            if batch:
+                self.signals.sig_matches.emit(self.token, batch)
+        return n_matches
@@ -0,0 +1,278 @@
+from typing import Any, Final, cast
+
+import numpy as np
+import numpy.typing as npt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, QPersistentModelIndex, Qt, Signal
+from PySide6.QtWidgets import QHBoxLayout, QHeaderView, QLabel, QSpinBox, QTableView, QVBoxLayout, QWidget
+
+ItemDataRole = Qt.ItemDataRole
+type ModelIndex = QModelIndex | QPersistentModelIndex
+# Index of an element of an array, a trailing field name selects a field of a structured array
+type ElementIndex = tuple[int | str, ...]
+
+# The parent of the rows of a table
+_ROOT: Final = QModelIndex()
+
+
+def format_value(value: Any) -> str:
+    if isinstance(value, (np.floating, float)):
+        return f"{value:.6g}"
+    return str(value)
+
+
+def parse_value(text: str, like: Any) -> Any:
+    """
+    Convert text entered by the user to the type of the value `like` it replaces.
+
+    Args:
+        text (str): The entered text.
+        like (Any): The current value, a Python or numpy scalar.
+
+    Raises:
+        ValueError: If the text cannot be converted, or the value does not fit the numpy type.
+        TypeError: If values of the type of `like` cannot be entered as text.
+    """
+    value_type = cast(type[Any], type(like))
+    if isinstance(like, (bool, np.bool_)):
+        lowered = text.strip().lower()
+        if lowered in ("true", "1", "yes"):
+            return value_type(True)
+        if lowered in ("false", "0", "no"):
+            return value_type(False)
+        raise ValueError(f"Not a boolean: {text!r}")
+    if not isinstance(like, (int, float, complex, str, np.number, np.str_)):
+        raise TypeError(f"Values of type {value_type.__name__} cannot be edited as text")
+    try:
+        return value_type(text)
+    except OverflowError as exc:
+        raise ValueError(f"{text} does not fit into {value_type.__name__}") from exc
+
+
+def table_of(array: npt.NDArray[Any], index: tuple[int, ...] = ()) -> tuple[npt.NDArray[Any], tuple[str, ...]]:
+    """
+    Return a 2-D view of `array` as it is shown in a table, and the field names if the columns are record fields.
+
+    Args:
+        array (NDArray): The array to display.
+        index (tuple[int, ...], optional): Indices into the leading axes of arrays with more than 2 dimensions.
+            Defaults to the first slice.
+    """
+    # All of these are views into the original array, no data is read here
+    if array.ndim == 0:
+        return array.reshape(1, 1), ()
+    if array.ndim == 1:
+        return array[:, np.newaxis], array.dtype.names or ()
+    if array.ndim == 2:
+        return array, ()
+    if array.size == 0:
+        return np.empty((0, 0), dtype=array.dtype), ()
+    return array[index or (0,) * (array.ndim - 2)], ()
+
+
+class ArrayTableModel(QAbstractTableModel):
+    """
+    Table model that reads its cells directly from a numpy array.
+
+    Nothing is copied or converted up front: a cell is only read from the array buffer (or memory mapped file) and
+    formatted when the view asks for it, i.e. when it is painted. 1-D arrays are shown as a single column (or one
+    column per field for structured arrays), arrays with more than 2 dimensions are shown as a 2-D slice through the
+    last two axes, see `set_slice`.
+
+    With `set_editable(True)`, cells can be edited. The model never writes to the array itself: an edited value is
+    shown in place of the array's (see `set_overrides`) and `sig_value_edited` is emitted with the index of the element
+    and the new value, which the owner of the array writes (or queues).
+    """
+
+    sig_value_edited = Signal(object, object)
+
+    def __init__(self, parent: QObject | None = None, array: npt.NDArray[Any] | None = None) -> None:
+        super().__init__(parent)
+        self._array: npt.NDArray[Any] = np.empty((0, 0))
+        self._slice: tuple[int, ...] = ()
+        self._table: npt.NDArray[Any] = self._array
+        self._fields: tuple[str, ...] = ()
+        self._editable = False
+        self._overrides: dict[ElementIndex, Any] = {}
+        if array is not None:
+            self.set_array(array)
+
+    def array(self) -> npt.NDArray[Any]:
+        return self._array
+
+    def set_array(self, array: npt.NDArray[Any]) -> None:
+        """
+        Set the array to display. For arrays with more than 2 dimensions, the first slice is shown.
+        """
+        self.beginResetModel()
+        self._array = array
+        self._overrides = {}
+        self._slice = (0,) * max(0, array.ndim - 2)
+        self._update_table()
+        self.endResetModel()
+
+    def slice_index(self) -> tuple[int, ...]:
+        return self._slice
+
+    def set_slice(self, index: tuple[int, ...]) -> None:
+        """
+        Select which 2-D slice of an array with more than 2 dimensions is shown.
+
+        Args:
+            index (tuple[int, ...]): Indices into the leading `ndim - 2` axes.
+        """
+        if len(index) != len(self._slice):
+            raise ValueError(f"Expected {len(self._slice)} indices, got {len(index)}")
+        self.beginResetModel()
+        self._slice = tuple(index)
+        self._update_table()
+        self.endResetModel()
+
+    def _update_table(self) -> None:
+        self._table, self._fields = table_of(self._array, self._slice)
+
+    def rowCount(self, parent: ModelIndex = _ROOT) -> int:
+        if parent.isValid():
+            return 0
+        return self._table.shape[0]
+
+    def columnCount(self, parent: ModelIndex = _ROOT) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._fields) or self._table.shape[1]
+
+    def is_editable(self) -> bool:
+        return self._editable
+
+    def set_editable(self, editable: bool) -> None:
+        self._editable = editable
+
+    def set_overrides(self, overrides: dict[ElementIndex, Any]) -> None:
+        """
+        Show the given values instead of those of the array, e.g. edits that were not written to it yet.
+
+        Args:
+            overrides (dict[ElementIndex, Any]): The values, by index of the element in the array (see
+                `element_index`).
+        """
+        self._overrides = dict(overrides)
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def element_index(self, row: int, column: int) -> ElementIndex:
+        """
+        Return the index into the array of the element shown in the given cell.
+        """
+        if self._array.ndim == 0:
+            return ()
+        if self._array.ndim == 1:
+            return (row, self._fields[column]) if self._fields else (row,)
+        return (*self._slice, row, column)
+
+    def value(self, row: int, column: int) -> Any:
+        """
+        Return the raw value of the given cell.
+        """
+        if self._overrides:
+            key = self.element_index(row, column)
+            if key in self._overrides:
+                return self._overrides[key]
+        if self._fields:
+            return self._table[row, 0][self._fields[column]]
+        return self._table[row, column]
+
+    def flags(self, index: ModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if self._editable and index.isValid():
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: ModelIndex, value: Any, role: int = ItemDataRole.EditRole) -> bool:
+        if not (self._editable and index.isValid() and role == ItemDataRole.EditRole):
+            return False
+        current = self.value(index.row(), index.column())
+        try:
+            new_value = parse_value(value, current) if isinstance(value, str) else value
+        except (ValueError, TypeError):
+            return False
+        key = self.element_index(index.row(), index.column())
+        self._overrides[key] = new_value
+        self.dataChanged.emit(index, index)
+        self.sig_value_edited.emit(key, new_value)
+        return True
+
+    def data(self, index: ModelIndex, role: int = ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role in (ItemDataRole.DisplayRole, ItemDataRole.ToolTipRole):
+            return format_value(self.value(index.row(), index.column()))
+        if role == ItemDataRole.EditRole:
+            return str(self.value(index.row(), index.column()))
+        if role == ItemDataRole.TextAlignmentRole and self._array.dtype.kind in "biufc":
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = ItemDataRole.DisplayRole) -> Any:
+        if role != ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal and self._fields:
+            return self._fields[section]
+        return str(section)
+
+
+class ArrayTableView(QWidget):
+    """
+    Table view for numpy arrays of any size and dimension, backed by an `ArrayTableModel`.
+
+    For arrays with more than 2 dimensions, a spin box per leading axis selects the displayed slice.
+    """
+
+    def __init__(self, parent: QWidget | None = None, array: npt.NDArray[Any] | None = None) -> None:
+        super().__init__(parent)
+        self._model = ArrayTableModel(self)
+
+        self.table = QTableView()
+        self.table.setModel(self._model)
+        self.table.setAlternatingRowColors(True)
+        # Fixed/Interactive section sizes keep the headers from measuring every row/column
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+
+        self._slice_layout = QHBoxLayout()
+        self._slice_layout.setContentsMargins(0, 0, 0, 0)
+        self._slice_spin_boxes: list[QSpinBox] = []
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self._slice_layout)
+        layout.addWidget(self.table)
+
+        if array is not None:
+            self.set_array(array)
+
+    def model(self) -> ArrayTableModel:
+        return self._model
+
+    def set_array(self, array: npt.NDArray[Any]) -> None:
+        self._model.set_array(array)
+
+        while self._slice_layout.count():
+            item = self._slice_layout.takeAt(0)
+            if item is not None and (widget := item.widget()) is not None:
+                widget.deleteLater()
+        self._slice_spin_boxes = []
+        if array.ndim <= 2:
+            return
+
+        self._slice_layout.addWidget(QLabel(f"shape={array.shape}, slice:"))
+        for size in array.shape[:-2]:
+            spin_box = QSpinBox()
+            spin_box.setRange(0, size - 1)
+            spin_box.valueChanged.connect(self._on_slice_changed)
+            self._slice_layout.addWidget(spin_box)
+            self._slice_spin_boxes.append(spin_box)
+        self._slice_layout.addStretch()
+
+    def _on_slice_changed(self) -> None:
+        self._model.set_slice(tuple(spin_box.value() for spin_box in self._slice_spin_boxes))
@@ -0,0 +1,223 @@
+import abc
+import dataclasses
+import enum
+import types
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from pyside_widgets._bounded_repr import bounded_description
+
+type Key = str | int
+
+
+class PreviewKind(enum.Enum):
+    """
+    The kind of preview shown in the row below a node.
+    """
+
+    ARRAY_TABLE = enum.auto()
+    ARRAY_SUMMARY = enum.auto()
+    TRACEBACK = enum.auto()
+    TEXT = enum.auto()
+
+
+@dataclass(frozen=True, slots=True)
+class TypeHandler:
+    """
+    Describes how values of a type are shown in a `DataTreeWidget`/`DataTreeView`.
+
+    Attributes:
+        describe (Callable[[Any], str]): Returns the text of the `Value` column. Defaults to a bounded repr.
+        children (Callable[[Any], Iterator[tuple[Key, Any]]] | None): Returns an iterator over the `(key, value)`
+            pairs of the children, or None for types without children. Only the children that are actually shown
+            are taken from the iterator.
+        count (Callable[[Any], int]): Returns the number of children, must be cheap. Defaults to `len`.
+        preview (Callable[[Any], PreviewKind | None] | None): Returns the kind of preview shown below the node.
+        preview_text (Callable[[Any], str | None] | None): Returns the (potentially expensive) text shown in the
+            viewer that opens when the preview is activated, instead of the default content. Only computed then.
+        cheap (bool): Whether `describe` is cheap enough to be called on the GUI thread for every node.
+        type_name (Callable[[Any], str] | None): Returns the text of the `Type` column. Defaults to the name of the
+            type.
+        owns_children (bool): Whether the children are objects kept alive by the value itself (like the items of a
+            list), rather than created by `children` on the fly. Only then the tree references them weakly.
+    """
+
+    describe: Callable[[Any], str] = bounded_description
+    children: Callable[[Any], Iterator[tuple[Key, Any]]] | None = None
+    count: Callable[[Any], int] = len
+    preview: Callable[[Any], PreviewKind | None] | None = None
+    preview_text: Callable[[Any], str | None] | None = None
+    cheap: bool = False
+    type_name: Callable[[Any], str] | None = None
+    owns_children: bool = False
+
+
+class HandlerRegistry:
+    """
+    Maps types to `TypeHandler`s.
+
+    Like `functools.singledispatch`, the handler of a type is the one registered for the first class in its MRO,
+    falling back to the abstract base classes it is a (virtual) subclass of, e.g. `collections.abc.Mapping`, and
+    finally to the default handler. The resolved handler is cached per type, so the lookup for a node is a single dict
+    access.
+    """
+
+    def __init__(self, default: TypeHandler | None = None) -> None:
+        self._default = default if default is not None else TypeHandler()
+        self._handlers: dict[type, TypeHandler] = {}
+        self._predicates: list[tuple[Callable[[type], bool], TypeHandler]] = []
+        self._cache: dict[type, TypeHandler] = {}
+        self._cache_token = abc.get_cache_token()
+
+    def register(self, cls: type, handler: TypeHandler) -> None:
+        """
+        Register the handler for `cls` and its subclasses. Registering `object` replaces the default handler.
+        """
+        if cls is object:
+            self._default = handler
+        else:
+            self._handlers[cls] = handler
+        self._cache.clear()
+
+    def register_predicate(self, predicate: Callable[[type], bool], handler: TypeHandler) -> None:
+        """
+        Register the handler for all types for which `predicate` returns True, e.g. `dataclasses.is_dataclass`.
+
+        Predicates are checked after the classes in the MRO and before abstract base classes.
+        """
+        self._predicates.append((predicate, handler))
+        self._cache.clear()
+
+    def unregister(self, cls: type) -> None:
+        self._handlers.pop(cls, None)
+        self._cache.clear()
+
+    def dispatch(self, cls: type) -> TypeHandler:
+        """
+        Return the handler for the given type.
+        """
+        token = abc.get_cache_token()
+        if token != self._cache_token:
+            # An ABC got a new virtual subclass, which may change the resolution
+            self._cache.clear()
+            self._cache_token = token
+        handler = self._cache.get(cls)
+        if handler is None:
+            handler = self._cache[cls] = self._resolve(cls)
+        return handler
+
+    def handler(self, data: Any) -> TypeHandler:
+        """
+        Return the handler for the type of `data`.
+        """
+        # Fast path of `dispatch`, this is called several times for every node
+        cls = cast(type[Any], type(data))
+        handler = self._cache.get(cls)
+        if handler is None or self._cache_token != abc.get_cache_token():
+            return self.dispatch(cls)
+        return handler
+
+    def _resolve(self, cls: type) -> TypeHandler:
+        handlers = self._handlers
+        for base in cls.__mro__:
+            handler = handlers.get(base)
+            if handler is not None:
+                return handler
+        for predicate, handler in reversed(self._predicates):
+            if predicate(cls):
+                return handler
+        for base, handler in reversed(handlers.items()):
+            if issubclass(cls, base):
+                return handler
+        return self._default
+
+
+def _length(data: Any) -> str:
+    return f"length={len(data)}"
+
+
+def _array_description(array: npt.NDArray[Any]) -> str:
+    if array.dtype.names:
+        return f"shape={array.shape} fields={', '.join(array.dtype.names)}"
+    return f"shape={array.shape} dtype={array.dtype}"
+
+
+def _array_preview(array: npt.NDArray[Any]) -> PreviewKind:
+    return PreviewKind.ARRAY_SUMMARY if array.size > 1000 else PreviewKind.ARRAY_TABLE
+
+
+def _dataclass_children(data: Any) -> Iterator[tuple[Key, Any]]:
+    for field in dataclasses.fields(data):
+        yield field.name, getattr(data, field.name)
+
+
+def _is_dataclass_type(cls: type) -> bool:
+    return dataclasses.is_dataclass(cls)
+
+
+def _record_children(record: np.void) -> Iterator[tuple[Key, Any]]:
+    for name in record.dtype.names or ():
+        yield name, record[name]
+
+
+def _register_defaults(registry: HandlerRegistry) -> None:
+    leaf = TypeHandler(cheap=True)
+    for cls in (str, int, float, complex, bool, type(None), bytes, bytearray, memoryview, range, np.generic):
+        registry.register(cls, leaf)
+
+    mapping = TypeHandler(describe=_length, children=lambda data: iter(data.items()), cheap=True)
+    sequence = TypeHandler(describe=_length, children=enumerate, cheap=True)
+    registry.register(Sequence, sequence)
+    registry.register(AbstractSet, sequence)
+    registry.register(Mapping, mapping)
+    # Other implementations of the ABCs may create their items on access
+    registry.register(dict, dataclasses.replace(mapping, owns_children=True))
+    for cls in (list, tuple, set, frozenset):
+        registry.register(cls, dataclasses.replace(sequence, owns_children=True))
+
+    registry.register(np.ndarray, TypeHandler(describe=_array_description, preview=_array_preview, cheap=True))
+    registry.register(
+        np.void,
+        TypeHandler(
+            children=_record_children,
+            count=lambda record: len(record.dtype.names or ()),
+            cheap=True,
+        ),
+    )
+    registry.register(
+        types.TracebackType,
+        TypeHandler(
+            describe=lambda tb: "",
+            preview=lambda tb: PreviewKind.TRACEBACK,
+            cheap=True,
+        ),
+    )
+    registry.register_predicate(
+        _is_dataclass_type,
+        TypeHandler(
+            describe=lambda data: f"fields={len(dataclasses.fields(data))}",
+            children=_dataclass_children,
+            count=lambda data: len(dataclasses.fields(data)),
+            cheap=True,
+            owns_children=True,
+        ),
+    )
+
+
+registry = HandlerRegistry()
+_register_defaults(registry)
+
+
+def register_handler(cls: type, handler: TypeHandler) -> None:
+    """
+    Register a handler for `cls` in the default registry used by `DataTreeWidget` and `DataTreeView`.
+
+    Example:
+        >>> register_handler(Point, TypeHandler(describe=lambda p: f"({p.x}, {p.y})", cheap=True))
+    """
+    registry.register(cls, handler)
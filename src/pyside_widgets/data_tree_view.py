@@ -0,0 +1,491 @@
+import bisect
+import functools
+import itertools
+import operator
+from collections.abc import Callable, Iterator
+from typing import Any, Final, cast
+
+import numpy as np
+import numpy.typing as npt
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, QObject, QPersistentModelIndex, QPoint, Qt
+from PySide6.QtGui import QAction
+from PySide6.QtWidgets import (
+    QApplication,
+    QDialog,
+    QInputDialog,
+    QMenu,
+    QMessageBox,
+    QTreeView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from pyside_widgets._sort_keys import SortKey, name_sort_key, natural_key, value_sort_key
+from pyside_widgets._tree_nodes import describe_data, has_children, iter_children
+from pyside_widgets.array_table_view import ArrayTableView
+
+ItemDataRole = Qt.ItemDataRole
+type ModelIndex = QModelIndex | QPersistentModelIndex
+
+# The parent of the top level rows
+_ROOT: Final = QModelIndex()
+
+
+class _TreeNode:
+    """
+    A single node of a `DataTreeModel`. Children are only created once the node is fetched by the view.
+    """
+
+    __slots__ = (
+        "_row",
+        "children",
+        "data",
+        "desc",
+        "key",
+        "parent",
+        "pending",
+        "renumber_from",
+        "sort_keys",
+        "type_str",
+    )
+
+    def __init__(self, parent: _TreeNode | None, key: str | int, data: Any, row: int = 0) -> None:
+        self.parent = parent
+        self.key = key
+        self.data = data
+        self._row = row
+        self.type_str, self.desc = describe_data(data) if parent is not None else ("", "")
+        self.children: list[_TreeNode] = []
+        # Sort keys of the children in their order while the model is sorted, None if they have to be recomputed
+        self.sort_keys: list[SortKey] | None = None
+        # The children from this row on have to be renumbered, see `row`
+        self.renumber_from: int | None = None
+        self.pending: Iterator[tuple[str | int, Any]] | None = None
+        if has_children(data):
+            self.pending = iter_children(data)
+
+    @property
+    def row(self) -> int:
+        """
+        The row of the node below its parent. Rows inserted in between are only numbered when a row is read, so
+        fetching many batches renumbers the children once.
+        """
+        parent = self.parent
+        if parent is not None and parent.renumber_from is not None:
+            children = parent.children
+            for row in range(parent.renumber_from, len(children)):
+                children[row]._row = row
+            parent.renumber_from = None
+        return self._row
+
+    @row.setter
+    def row(self, row: int) -> None:
+        self._row = row
+
+    def renumber(self, first: int) -> None:
+        """
+        Mark the rows of the children from `first` on as outdated, they are renumbered when a row is read.
+        """
+        if self.renumber_from is None or first < self.renumber_from:
+            self.renumber_from = first
+
+    def path(self) -> tuple[str | int, ...]:
+        keys: list[str | int] = []
+        node = self
+        while node.parent is not None:
+            keys.append(node.key)
+            node = node.parent
+        return tuple(reversed(keys))
+
+
+class DataTreeModel(QAbstractItemModel):
+    """
+    Item model for hierarchical python data structures that materializes children only when they are fetched.
+
+    Works like `DataTreeWidget`, but instead of creating an item for every node up front, a node's children are
+    created in batches of `batch_size` when the view asks for them (i.e. when the node is expanded or scrolled to).
+    The cost of `set_data` is therefore independent of the size of the data.
+    """
+
+    HEADERS = ("Name", "Type", "Value")
+
+    def __init__(self, parent: QObject | None = None, batch_size: int = 256) -> None:
+        super().__init__(parent)
+        self._batch_size = batch_size
+        self._root = _TreeNode(None, "", None)
+        # Key and direction of the current sort order, children fetched later are inserted in this order
+        self._sort_key: Callable[[_TreeNode], SortKey] | None = None
+        self._sort_reverse = False
+
+    def set_data(self, data: Any, hide_root: bool = True) -> None:
+        """
+        Set the data to be displayed.
+
+        Args:
+            data (Any): The data to be displayed.
+            hide_root (bool, optional): Whether to hide the root node. Defaults to True.
+        """
+        self.beginResetModel()
+        self._sort_key = None
+        if hide_root:
+            self._root = _TreeNode(None, "", data)
+        else:
+            self._root = _TreeNode(None, "", None)
+            self._root.children.append(_TreeNode(self._root, "", data))
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._sort_key = None
+        self._root = _TreeNode(None, "", None)
+        self.endResetModel()
+
+    def node(self, index: ModelIndex) -> _TreeNode:
+        """
+        Return the node for the given index, or the (invisible) root node for an invalid index.
+        """
+        if index.isValid():
+            return index.internalPointer()  # type: ignore
+        return self._root
+
+    def iter_nodes(self) -> Iterator[tuple[_TreeNode, QModelIndex]]:
+        """
+        Iterate over all nodes that have been materialized so far, together with the index of their parent.
+        """
+        stack: list[tuple[_TreeNode, QModelIndex]] = [(self._root, _ROOT)]
+        while stack:
+            node, index = stack.pop()
+            for child in node.children:
+                yield child, index
+                if child.children:
+                    stack.append((child, self.createIndex(child.row, 0, child)))
+
+    def index(self, row: int, column: int, parent: ModelIndex = _ROOT) -> QModelIndex:
+        node = self.node(parent)
+        if 0 <= row < len(node.children) and 0 <= column < len(self.HEADERS):
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index: ModelIndex = _ROOT) -> QModelIndex:  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+        parent = self.node(index).parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: ModelIndex = _ROOT) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent: ModelIndex = _ROOT) -> int:
+        return len(self.HEADERS)
+
+    def hasChildren(self, parent: ModelIndex = _ROOT) -> bool:
+        node = self.node(parent)
+        return bool(node.children) or node.pending is not None
+
+    def canFetchMore(self, parent: ModelIndex) -> bool:
+        return self.node(parent).pending is not None
+
+    def fetchMore(self, parent: ModelIndex) -> None:
+        node = self.node(parent)
+        if node.pending is None:
+            return
+        batch = list(itertools.islice(node.pending, self._batch_size))
+        if len(batch) < self._batch_size:
+            node.pending = None
+        if not batch:
+            return
+
+        start = len(node.children)
+        new_children = [_TreeNode(node, key, child_data, row) for row, (key, child_data) in enumerate(batch, start)]
+        if self._sort_key is None:
+            self.beginInsertRows(parent, start, start + len(batch) - 1)
+            node.children.extend(new_children)
+            self.endInsertRows()
+        else:
+            self._insert_sorted(parent, node, new_children)
+
+    def fetch_all(self, parent: ModelIndex) -> None:
+        """
+        Fetch all remaining children of the given node (but not their children).
+        """
+        while self.canFetchMore(parent):
+            self.fetchMore(parent)
+
+    def data(self, index: ModelIndex, role: int = ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        node = self.node(index)
+        column = index.column()
+        if role == ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(node.key)
+            if column == 1:
+                return node.type_str
+            desc = node.desc
+            return f"{desc[:97]}..." if len(desc) > 100 else desc
+        if role == ItemDataRole.ToolTipRole and column == 2 and len(node.desc) > 100:
+            return node.desc[:1000]
+        if role == ItemDataRole.UserRole and column == 2:
+            return node.data
+        return None
+
+    def setData(self, index: ModelIndex, value: Any, role: int = ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or index.column() != 2 or role not in (ItemDataRole.EditRole, ItemDataRole.UserRole):
+            return False
+        node = self.node(index)
+        node.data = value
+        node.type_str, node.desc = describe_data(value)
+        if node.parent is not None:
+            # The sort key of the row may have changed
+            node.parent.sort_keys = None
+        type_index = self.index(index.row(), 1, index.parent())
+        self.dataChanged.emit(type_index, index, [ItemDataRole.DisplayRole, ItemDataRole.UserRole])
+        return True
+
+    def flags(self, index: ModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Sort the children of every node by the given column, in the same order as `DataTreeWidget.sort_by_column`.
+
+        Only the rows fetched so far are sorted, rows fetched later are inserted at their place in the sorted order.
+        """
+
+        def sort_key(child: _TreeNode) -> SortKey:
+            if column == 0:
+                return name_sort_key(child.key, str(child.key))
+            if column == 1:
+                return natural_key(child.type_str)
+            return value_sort_key(child.data, child.desc)
+
+        self._sort_key = sort_key
+        self._sort_reverse = order == Qt.SortOrder.DescendingOrder
+
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = self.persistentIndexList()
+        old_nodes = [(self.node(index), index.column()) for index in old_persistent]
+
+        for node in [self._root, *(node for node, _ in self.iter_nodes() if node.children)]:
+            keys = [sort_key(child) for child in node.children]
+            by_key = sorted(range(len(keys)), key=keys.__getitem__, reverse=self._sort_reverse)
+            node.children = [node.children[i] for i in by_key]
+            node.sort_keys = [keys[i] for i in by_key]
+            node.renumber_from = None
+            for row, child in enumerate(node.children):
+                child.row = row
+
+        new_persistent = [
+            self.createIndex(node.row, column, node) if node is not self._root else _ROOT for node, column in old_nodes
+        ]
+        self.changePersistentIndexList(old_persistent, new_persistent)
+        self.layoutChanged.emit()
+
+    def _insert_sorted(self, parent: ModelIndex, node: _TreeNode, new_children: list[_TreeNode]) -> None:
+        """
+        Insert newly fetched children into the (sorted) children of `node`. The sort keys of the old children are
+        cached in `node.sort_keys`, so only the keys of the new children are computed.
+        """
+        sort_key = self._sort_key
+        assert sort_key is not None
+        children = node.children
+        keys = node.sort_keys
+        if keys is None:
+            keys = node.sort_keys = [sort_key(child) for child in children]
+        new_keys = [sort_key(child) for child in new_children]
+        by_key = sorted(range(len(new_children)), key=new_keys.__getitem__, reverse=self._sort_reverse)
+        # `before(key)(other)` tells whether a row with `key` goes before a row with `other`
+        before = operator.gt if self._sort_reverse else operator.lt
+
+        runs: list[tuple[int, list[_TreeNode], list[SortKey]]] = []
+        for i in by_key:
+            key = new_keys[i]
+            # Behind all equal rows, like a stable sort of the old rows followed by the new ones. The predicate is
+            # False for the rows before the position and True for the rows after it.
+            pos = bisect.bisect_left(keys, True, key=functools.partial(before, key))
+            if runs and runs[-1][0] == pos:
+                runs[-1][1].append(new_children[i])
+                runs[-1][2].append(key)
+            else:
+                runs.append((pos, [new_children[i]], [key]))
+
+        if len(runs) == 1:
+            pos, run, run_keys = runs[0]
+            self.beginInsertRows(parent, pos, pos + len(run) - 1)
+            children[pos:pos] = run
+            keys[pos:pos] = run_keys
+            node.renumber(pos)
+            self.endInsertRows()
+            return
+
+        # An insert per run would move and renumber the rows behind it every time, so the new rows are appended with
+        # a single insert and moved to their place with a single layout change
+        start = len(children)
+        self.beginInsertRows(parent, start, start + len(new_children) - 1)
+        children.extend(new_children)
+        self.endInsertRows()
+
+        self.layoutAboutToBeChanged.emit()
+        old_persistent = [index for index in self.persistentIndexList() if self.node(index).parent is node]
+        old_nodes = [(self.node(index), index.column()) for index in old_persistent]
+        merged: list[_TreeNode] = []
+        merged_keys: list[SortKey] = []
+        done = 0
+        for pos, run, run_keys in runs:
+            merged += children[done:pos]
+            merged_keys += keys[done:pos]
+            merged += run
+            merged_keys += run_keys
+            done = pos
+        merged += children[done:start]
+        merged_keys += keys[done:]
+        node.children, node.sort_keys = merged, merged_keys
+        node.renumber(runs[0][0])
+
+        # Looked up instead of read from `row`, which would renumber all children
+        new_persistent = [self.createIndex(merged.index(child), column, child) for child, column in old_nodes]
+        self.changePersistentIndexList(old_persistent, new_persistent)
+        self.layoutChanged.emit()
+
+
+class DataTreeView(QTreeView):
+    """
+    Model/view based alternative to `DataTreeWidget` for very large data structures.
+
+    Offers the same `set_data`/`filter_tree`/`toggle_sort` API and context menu, but only creates rows for the parts
+    of the data that are actually visible (see `DataTreeModel`).
+    """
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        data: Any = None,
+        allow_edit: bool = False,
+        hide_root: bool = True,
+    ) -> None:
+        super().__init__(parent)
+        self.setVerticalScrollMode(self.ScrollMode.ScrollPerPixel)
+        self.setAlternatingRowColors(True)
+        self.setUniformRowHeights(True)
+
+        self._allow_edit = allow_edit
+        # Lower case text of the name filter, also applied to rows fetched later
+        self._filter_text = ""
+        self._model = DataTreeModel(self)
+        self._model.rowsInserted.connect(self._filter_inserted_rows)
+        self.setModel(self._model)
+
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+        self.doubleClicked.connect(self._on_double_clicked)
+
+        if data is not None:
+            self.set_data(data, hide_root=hide_root)
+
+    def model(self) -> DataTreeModel:
+        return self._model
+
+    def set_data(self, data: Any, hide_root: bool = True, expand_depth: int = 0) -> None:
+        """
+        Set the data to be displayed.
+
+        Args:
+            data (Any): The data to be displayed.
+            hide_root (bool, optional): Whether to hide the root node. Defaults to True.
+            expand_depth (int, optional): Depth up to which the tree is expanded initially. Every expanded level
+                fetches the (first batch of) children of its nodes. Defaults to 0.
+        """
+        self._model.set_data(data, hide_root=hide_root)
+        if expand_depth >= 0:
+            self.expandToDepth(expand_depth)
+        self.resizeColumnToContents(0)
+
+    def clear(self) -> None:
+        self._model.clear()
+
+    def filter_tree(self, text: str) -> None:
+        """
+        Hide all rows whose name does not contain the given text, including rows fetched later.
+
+        Args:
+            text (str): The text to search for.
+        """
+        self._filter_text = text = text.lower()
+        for node, parent_index in self._model.iter_nodes():
+            self.setRowHidden(node.row, parent_index, text not in str(node.key).lower())
+
+    def _filter_inserted_rows(self, parent: QModelIndex, first: int, last: int) -> None:
+        text = self._filter_text
+        if not text:
+            return
+        children = self._model.node(parent).children
+        for row in range(first, last + 1):
+            self.setRowHidden(row, parent, text not in str(children[row].key).lower())
+
+    def toggle_sort(self) -> None:
+        self._model.sort(0, Qt.SortOrder.AscendingOrder)
+
+    def show_context_menu(self, pos: QPoint) -> None:
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+
+        menu = QMenu(self)
+        for column, label in enumerate(("Copy Name", "Copy Type", "Copy Value")):
+            action = QAction(label, menu)
+            text = index.siblingAtColumn(column).data() or ""
+            action.triggered.connect(lambda _=False, text=text: QApplication.clipboard().setText(text))
+            menu.addAction(action)
+        if self._allow_edit:
+            edit_action = QAction("Edit Value", menu)
+            edit_action.triggered.connect(lambda: self.edit_item_value(index))
+            menu.addAction(edit_action)
+
+        menu.exec(self.mapToGlobal(pos))
+
+    def edit_item_value(self, index: ModelIndex) -> None:
+        """
+        Edit the value at the given index.
+
+        Args:
+            index (QModelIndex): Index of the row to edit.
+        """
+        if not self._allow_edit:
+            return
+        index = self._model.index(index.row(), 2, index.parent())
+        data = self._model.node(index).data
+        if isinstance(data, (int, float, str, bool)):
+            new_value, ok = QInputDialog.getText(self, "Edit Value", "Enter new value:", text=str(data))
+            if ok:
+                try:
+                    if isinstance(data, bool):
+                        new_data = new_value.lower() in ("true", "1", "yes")
+                    else:
+                        new_data = type(data)(new_value)
+                    self._model.setData(index, new_data)
+                except ValueError:
+                    QMessageBox.warning(self, "Invalid Input", "Could not convert input to correct type")
+
+    def show_full_array(self, data: npt.NDArray[Any]) -> None:
+        dialog = QDialog(self)
+        layout = QVBoxLayout()
+        layout.addWidget(ArrayTableView(array=data))
+        dialog.setLayout(layout)
+        dialog.resize(600, 400)
+        dialog.exec()
+
+    def _on_double_clicked(self, index: QModelIndex) -> None:
+        data = self._model.node(index).data
+        if isinstance(data, np.ndarray):
+            self.show_full_array(cast(npt.NDArray[Any], data))
@@ -1,20 +1,31 @@
-import traceback
-import types
-from typing import Any
+import contextlib
+import enum
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, Final, cast, overload
 
 import numpy as np
 import numpy.typing as npt
-import pyqtgraph as pg
-from PySide6.QtCore import QModelIndex, QPersistentModelIndex, QPoint, Qt
-from PySide6.QtGui import QAction
+from PySide6.QtCore import QEvent, QPoint, QSize, Qt, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QAction, QHideEvent, QShowEvent
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
+    QCheckBox,
     QDialog,
-    QInputDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
     QLineEdit,
     QMenu,
     QMessageBox,
-    QPlainTextEdit,
+    QProgressBar,
+    QProgressDialog,
     QPushButton,
     QTreeWidget,
     QTreeWidgetItem,
@@ -22,23 +33,146 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-ItemDataRole = Qt.ItemDataRole
-type ModelIndex = QModelIndex | QPersistentModelIndex
+from pyside_widgets._array_sparkline import sparkline_kind
+from pyside_widgets._bounded_repr import full_text
+from pyside_widgets._path_index import NO_PARENT, PathIndex
+from pyside_widgets._search_index import FilterState, SearchIndex
+from pyside_widgets._tree_delegate import ArraySummaryButton, DataTreeDelegate
+from pyside_widgets._tree_editing import EDITABLE_TYPES, EditMode, PendingEdit, is_writable, write_edits
+from pyside_widgets._tree_export import ExportFormat, ExportWorker
+from pyside_widgets._tree_nodes import (
+    PENDING_TEXT,
+    ItemDataRole,
+    ModelIndex,
+    MoreRows,
+    MoreRowsRole,
+    PreviewDataRole,
+    PreviewKindRole,
+    ReferenceRole,
+    SparklineRole,
+    StaleRole,
+    WeakData,
+    child_items,
+    child_slice,
+    content_version,
+    data_ref,
+    describe_data,
+    has_children,
+    is_container,
+    iter_children,
+    preview_kind,
+    reference_text,
+    type_name,
+    values_equal,
+    viewer_content,
+)
+from pyside_widgets._tree_parse import DetailRecord, NodeRecord, ParseWorker
+from pyside_widgets._tree_sort import DataTreeItem, TreeSorter
+from pyside_widgets._value_search import ValueMatch, ValueSearchWorker
+from pyside_widgets.array_table_view import ArrayTableView, ElementIndex, parse_value
+from pyside_widgets.data_tree_handlers import PreviewKind
+from pyside_widgets.data_tree_handlers import registry as handlers
+from pyside_widgets.paged_text_view import PagedTextView
+
+FRAME_BUDGET_S: Final = 0.008
+MIN_BIND_INTERVAL_MS: Final = 16
+# The interval between refreshes of a bound source is at least this multiple of the duration of a refresh
+BIND_LOAD_FACTOR: Final = 4
+# Memory of a `QTreeWidgetItem` with three empty columns and an int in its `UserRole`, including its Python wrapper
+# (measured with Qt 6.12 on 64 bit Linux). The texts come on top of this.
+ITEM_BYTES: Final = 840
+
+
+class PreviewMode(enum.Enum):
+    WIDGETS = enum.auto()
+    DELEGATE = enum.auto()
+
+
+@dataclass(slots=True)
+class TreeState:
+    """
+    The view state of a `DataTreeWidget`, keyed by node paths so it can be reapplied to a rebuilt tree.
+    """
+
+    expanded: set[tuple[str | int, ...]]
+    # All paths that existed when the state was saved, new paths get the default expansion
+    known: set[tuple[str | int, ...]]
+    selected: list[tuple[str | int, ...]]
+    current: tuple[str | int, ...] | None = None
+    # The topmost visible node and its offset from the top of the viewport
+    scroll_anchor: tuple[str | int, ...] | None = None
+    scroll_offset: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class TreeMemoryUsage:
+    """
+    Approximate memory used by the items of a `DataTreeWidget`, not counting the displayed data itself.
+
+    Attributes:
+        nodes (int): The number of data nodes.
+        items (int): The number of items, including preview and "… N more" rows.
+        index_bytes (int): Bytes used by the path index, including weak references to the data.
+        item_bytes (int): Estimated bytes used by the items and their texts (see `ITEM_BYTES`).
+        weak_refs (int): The number of nodes whose data is referenced weakly.
+        widgets (int): The number of preview widgets.
+    """
+
+    nodes: int
+    items: int
+    index_bytes: int
+    item_bytes: int
+    weak_refs: int
+    widgets: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.index_bytes + self.item_bytes
+
+    @property
+    def bytes_per_node(self) -> float:
+        return self.total_bytes / self.nodes if self.nodes else 0.0
+
+
+type _BuildEntry = tuple[Any, QTreeWidgetItem, str, str | int | None, int, int, bool] | tuple[MoreRows, QTreeWidgetItem]
 
 
 class DataTreeWidget(QTreeWidget):
     """
     Widget for displaying hierarchical python data structures (eg. nested dicts, lists, arrays, etc.)
 
-    Based on `pyqtgraph.widgets.DataTreeWidget`.
+    Based on `pyqtgraph.widgets.DataTreeWidget`. Large data can be parsed in the background (`background_parsing`),
+    built lazily (`max_depth`, `max_children_per_node`), mirrored while it changes (`bind`), filtered, searched,
+    sorted, edited and exported.
     """
 
+    DEFAULT_EXPAND_DEPTH = 3
+    # Only the first matches of `search_values` are revealed by expanding their ancestors
+    MAX_REVEALED_MATCHES = 100
+
+    sig_parsing_finished = Signal()
+    sig_filter_progress = Signal(int, int)
+    sig_filter_finished = Signal(int)
+    sig_filter_cancelled = Signal()
+    sig_edits_committed = Signal(list)
+    sig_pending_edits_changed = Signal(int)
+    sig_export_progress = Signal(object, object)
+    sig_export_finished = Signal(str, object)
+    sig_value_matches = Signal(list)
+    sig_value_search_finished = Signal(int)
+
     def __init__(
         self,
         parent: QWidget | None = None,
         data: dict[str, Any] | None = None,
         allow_edit: bool = False,
         hide_root: bool = True,
+        background_parsing: bool = False,
+        preview_mode: PreviewMode = PreviewMode.WIDGETS,
+        search_ngram_size: int = 0,
+        max_depth: int | None = None,
+        max_children_per_node: int | None = None,
+        edit_mode: EditMode = EditMode.DISPLAY,
     ) -> None:
         super().__init__(parent)
         self.setVerticalScrollMode(self.ScrollMode.ScrollPerPixel)
@@ -47,6 +181,64 @@ class DataTreeWidget(QTreeWidget):
         self.setAlternatingRowColors(True)
 
         self._allow_edit = allow_edit
+        self._edit_mode = edit_mode
+        self._pending_edits: dict[tuple[tuple[str | int, ...], ElementIndex | None], PendingEdit] = {}
+        self._hide_root = hide_root
+        self._max_depth = max_depth
+        self._max_children_per_node = max_children_per_node
+        self._widgets: list[QWidget] = []
+        # Items store their node id in the `UserRole` of column 0, their data is kept in the index
+        self._nodes = PathIndex[QTreeWidgetItem]()
+
+        self._preview_mode = preview_mode
+        self._search_ngram_size = search_ngram_size
+        self._search_index: SearchIndex[QTreeWidgetItem] | None = None
+        self._filter_state: FilterState | None = None
+        self._pending_filter: tuple[FilterState, deque[tuple[QTreeWidgetItem, bool]], int] | None = None
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setInterval(0)
+        self._filter_timer.timeout.connect(self._apply_pending_filter)
+        self._delegate = DataTreeDelegate(self, self)
+        self.setItemDelegate(self._delegate)
+        self._active_preview: QTreeWidgetItem | None = None
+        self._preview_size = QSize()
+        self.itemActivated.connect(self._on_item_activated)
+        self._background_parsing = background_parsing
+        self._parse_generation = 0
+        self._parse_worker: ParseWorker | None = None
+        self._pending_state: TreeState | None = None
+        # Node ids of the records received from the parse worker, by sequence number
+        self._parse_ids: list[int] = []
+        self._running_workers: dict[int, ParseWorker] = {}
+        self._export_worker: ExportWorker | None = None
+        self._export_token = 0
+        # Export workers are kept alive until they have stopped, cancelled ones included
+        self._export_workers: dict[int, ExportWorker] = {}
+        self._export_dialog: QProgressDialog | None = None
+        self._value_search_worker: ValueSearchWorker | None = None
+        self._value_search_token = 0
+        self._value_search_workers: dict[int, ValueSearchWorker] = {}
+        self._value_matches: list[ValueMatch] = []
+        # Sorting waits for a running background parse
+        self._sorter = TreeSorter(self, self._nodes, self._node_data, lambda: self._parse_worker is not None)
+        self._pending_records: deque[tuple[str, Any]] = deque()
+        self._drain_timer = QTimer(self)
+        self._drain_timer.setInterval(0)
+        self._drain_timer.timeout.connect(self._drain_pending_records)
+        self._pending_appends: dict[tuple[str | int, ...], list[tuple[str | int | None, Any]]] = {}
+        self._append_limits: dict[tuple[str | int, ...], int] = {}
+        self._detached_previews: list[tuple[QTreeWidgetItem, QWidget | None]] = []
+        self._append_timer = QTimer(self)
+        self._append_timer.setSingleShot(True)
+        self._append_timer.setInterval(0)
+        self._append_timer.timeout.connect(self._flush_appends)
+        self._binding: tuple[Callable[[], Any], contextlib.AbstractContextManager[Any]] | None = None
+        # While bound, the `content_version` of the mutable values by node id, to find changes made in place
+        self._content_versions: dict[int, int] = {}
+        self._bind_interval = 200
+        self._bind_timer = QTimer(self)
+        self._bind_timer.setSingleShot(True)
+        self._bind_timer.timeout.connect(self.refresh_binding)
 
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
@@ -54,21 +246,471 @@ class DataTreeWidget(QTreeWidget):
         if data is not None:
             self.set_data(data, hide_root=hide_root)
 
-    def set_data(self, data: dict[str, Any], hide_root: bool = True) -> None:
+    def set_data(
+        self,
+        data: dict[str, Any],
+        hide_root: bool = True,
+        update: bool = False,
+        background: bool | None = None,
+    ) -> None:
         """
         Set the data to be displayed.
 
         Args:
             data (dict[str, Any]): The data to be displayed.
             hide_root (bool, optional): Whether to hide the root node. Defaults to True.
+            update (bool, optional): If True and the tree already shows data with the same `hide_root` setting, only
+                the nodes that differ from the currently displayed data are inserted, removed or updated (see
+                `update_data`). Defaults to False.
+            background (bool | None, optional): Whether to parse the data in a worker thread (see
+                `background_parsing`). Defaults to None, which uses the value passed to the constructor.
         """
+        if background is None:
+            background = self._background_parsing
+        if update and self._nodes and self._hide_root == hide_root and self._parse_worker is None:
+            self.update_data(data)
+            return
+
+        state = self.save_state() if self._nodes else None
         self.clear()
 
-        self._widgets: list[QWidget] = []
-        self._nodes: dict[tuple[str | int, ...], QTreeWidgetItem] = {}
+        self._hide_root = hide_root
+        if background:
+            self._pending_state = state
+            self._start_background_parse(data)
+            return
         self.build_tree(data, self.invisibleRootItem(), hide_root=hide_root)
-        self.expandToDepth(3)
-        self.resizeColumnToContents(0)
+        self.restore_state(state)
+        self.fit_column_width(0)
+
+    def _should_expand(self, path: tuple[str | int, ...], state: TreeState | None) -> bool:
+        if state is not None and path in state.known:
+            return path in state.expanded
+        return len(path) - self._hide_root <= self.DEFAULT_EXPAND_DEPTH
+
+    def _should_expand_node(self, node_id: int, depth: int, state: TreeState | None) -> bool:
+        # Only builds the path of the node if there is a state to look it up in
+        if state is not None:
+            return self._should_expand(self._nodes.path_of(node_id), state)
+        return depth - self._hide_root <= self.DEFAULT_EXPAND_DEPTH
+
+    def save_state(self) -> TreeState:
+        """
+        Return the expansion, selection and scroll state of the tree, keyed by node paths.
+        """
+        anchor = self.itemAt(0, 0)
+        while anchor is not None and anchor.data(0, ItemDataRole.UserRole) is None:
+            # Preview and "… N more" rows have no path of their own
+            anchor = anchor.parent()
+        current = self.currentItem()
+        known: set[tuple[str | int, ...]] = set()
+        expanded: set[tuple[str | int, ...]] = set()
+        for path, item in self._nodes.items():
+            known.add(path)
+            if item.isExpanded():
+                expanded.add(path)
+        return TreeState(
+            expanded=expanded,
+            known=known,
+            selected=[path for item in self.selectedItems() if (path := self.item_path(item)) is not None],
+            current=self.item_path(current) if current is not None else None,
+            scroll_anchor=self.item_path(anchor) if anchor is not None else None,
+            scroll_offset=self.visualItemRect(anchor).top() if anchor is not None else 0,
+        )
+
+    def item_path(self, item: QTreeWidgetItem) -> tuple[str | int, ...] | None:
+        """
+        Return the path of the node shown by `item`, or None for preview and "… N more" rows.
+        """
+        node_id: int | None = item.data(0, ItemDataRole.UserRole)
+        return self._nodes.path_of(node_id) if node_id is not None else None
+
+    def find_item(self, path: tuple[str | int, ...]) -> QTreeWidgetItem | None:
+        """
+        Return the item of the node at `path`, or None if the node does not exist or was not built yet.
+        """
+        return self._nodes.get(path)
+
+    def restore_state(self, state: TreeState | None) -> None:
+        """
+        Reapply a state returned by `save_state` in a single pass over the nodes. Nodes that did not exist when the
+        state was saved are expanded up to `DEFAULT_EXPAND_DEPTH`.
+
+        Args:
+            state (TreeState | None): The state to restore, or None to apply the default expansion.
+        """
+        for path, item in self._nodes.items():
+            if self._should_expand(path, state):
+                item.setExpanded(True)
+        if state is not None:
+            self._restore_selection(state)
+
+    def _restore_selection(self, state: TreeState) -> None:
+        for path in state.selected:
+            if (item := self._nodes.get(path)) is not None:
+                item.setSelected(True)
+        if state.current is not None and (item := self._nodes.get(state.current)) is not None:
+            self.setCurrentItem(item, 0, self.selectionModel().SelectionFlag.NoUpdate)
+        if state.scroll_anchor is not None and (item := self._nodes.get(state.scroll_anchor)) is not None:
+            self.scrollToItem(item, self.ScrollHint.PositionAtTop)
+            scroll_bar = self.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.value() - state.scroll_offset)
+
+    def _iter_shown_items(self) -> Iterator[tuple[QTreeWidgetItem, int]]:
+        """
+        Iterate over the rows in display order together with their depth, starting at the top of the viewport.
+
+        While the widget is hidden, this starts at the first row and does not need the view's item layout.
+        """
+        if self.isVisible():
+            item = self.itemAt(0, 0)
+            while item is not None:
+                depth = 0
+                parent = item.parent()
+                while parent is not None:
+                    depth += 1
+                    parent = parent.parent()
+                yield item, depth
+                item = self.itemBelow(item)
+            return
+
+        root = self.invisibleRootItem()
+        stack = [(child, 0) for child in reversed(child_items(root))]
+        while stack:
+            item, depth = stack.pop()
+            if item.isHidden():
+                continue
+            yield item, depth
+            if item.isExpanded():
+                stack.extend((child, depth + 1) for child in reversed(child_items(item)))
+
+    def fit_column_width(self, column: int = 0, max_rows: int = 200) -> None:
+        """
+        Set the width of a column to fit its visible contents.
+
+        Unlike `resizeColumnToContents`, only the rows from the top of the viewport are measured (at most `max_rows`),
+        instead of every item in the tree.
+
+        Args:
+            column (int, optional): The column to resize. Defaults to 0.
+            max_rows (int, optional): The maximum number of rows to measure. Defaults to 200.
+        """
+        metrics = self.fontMetrics()
+        style = self.style()
+        # Text margins of the item delegate, on both sides
+        padding = 2 * (style.pixelMetric(style.PixelMetric.PM_FocusFrameHMargin, None, self) + 1) + 1
+        indentation = self.indentation()
+        root_decoration = indentation if self.rootIsDecorated() else 0
+        width = 0
+        for item, depth in itertools.islice(self._iter_shown_items(), max_rows):
+            if not item.isFirstColumnSpanned():
+                indent = depth * indentation + root_decoration if column == 0 else 0
+                width = max(width, indent + metrics.horizontalAdvance(item.text(column)) + padding)
+        self.setColumnWidth(column, max(width, self.header().sectionSizeFromContents(column).width()))
+
+    def memory_usage(self) -> TreeMemoryUsage:
+        """
+        Return an estimate of the memory used by the tree for its items and path index.
+
+        This walks all items, so its cost is proportional to the size of the tree.
+        """
+        nodes = self._nodes
+        weak_refs = 0
+        ref_bytes = 0
+        for node_id in nodes.ids():
+            data = nodes.data_of(node_id)
+            if type(data) is WeakData:
+                weak_refs += 1
+                ref_bytes += sys.getsizeof(data)
+
+        items = 0
+        text_bytes = 0
+        stack = [self.invisibleRootItem()]
+        while stack:
+            item = stack.pop()
+            for child in child_items(item):
+                items += 1
+                # QString stores UTF-16
+                text_bytes += 2 * (len(child.text(0)) + len(child.text(1)) + len(child.text(2)))
+                stack.append(child)
+        return TreeMemoryUsage(
+            nodes=len(nodes),
+            items=items,
+            index_bytes=nodes.nbytes() + ref_bytes,
+            item_bytes=items * ITEM_BYTES + text_bytes,
+            weak_refs=weak_refs,
+            widgets=len(self._widgets),
+        )
+
+    def clear(self) -> None:
+        self._cancel_background_parse()
+        self._append_timer.stop()
+        self._pending_appends.clear()
+        self._append_limits.clear()
+        self.cancel_value_search()
+        self._value_matches = []
+        self._sorter.reset()
+        self._content_versions.clear()
+        if self._pending_edits:
+            self._pending_edits.clear()
+            self.sig_pending_edits_changed.emit(0)
+        self._active_preview = None
+        self._delegate.clear_cache()
+        self._invalidate_search_index()
+        super().clear()
+        # The invisible root item is not replaced, it only loses its children
+        self.invisibleRootItem().setData(0, ItemDataRole.UserRole, None)
+        self._widgets = []
+        self._nodes.clear()
+
+    def _start_background_parse(self, data: Any) -> None:
+        self._parse_generation += 1
+        self._parse_ids = []
+        worker = ParseWorker(
+            self._parse_generation, data, max_depth=self._max_depth, max_children=self._max_children_per_node
+        )
+        worker.signals.sig_nodes.connect(self._on_nodes_parsed)
+        worker.signals.sig_details.connect(self._on_details_parsed)
+        worker.signals.sig_finished.connect(self._on_parsing_finished)
+        self._parse_worker = worker
+        self._running_workers[self._parse_generation] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _cancel_background_parse(self) -> None:
+        if self._parse_worker is not None:
+            self._parse_worker.cancel()
+            self._parse_worker = None
+        self._parse_generation += 1
+        self._pending_records.clear()
+        self._drain_timer.stop()
+
+    def _on_nodes_parsed(self, generation: int, records: list[NodeRecord]) -> None:
+        if generation == self._parse_generation:
+            self._pending_records.extend(("node", record) for record in records)
+            self._drain_timer.start()
+
+    def _on_details_parsed(self, generation: int, records: list[DetailRecord]) -> None:
+        if generation == self._parse_generation:
+            self._pending_records.extend(("detail", record) for record in records)
+            self._drain_timer.start()
+
+    def _on_parsing_finished(self, generation: int, _: None) -> None:
+        self._running_workers.pop(generation, None)
+        if generation == self._parse_generation:
+            self._pending_records.append(("finished", None))
+            self._drain_timer.start()
+
+    def _drain_pending_records(self) -> None:
+        """
+        Apply queued worker results until the frame budget is used up, then yield back to the event loop.
+        """
+        deadline = time.perf_counter() + FRAME_BUDGET_S
+        records = self._pending_records
+        if records:
+            self._invalidate_search_index()
+        while records and time.perf_counter() < deadline:
+            kind, record = records.popleft()
+            if kind == "node":
+                self._apply_node_record(record)
+            elif kind == "detail":
+                self._apply_detail_record(record)
+            else:
+                self._parse_worker = None
+                self._sorter.schedule()
+                state, self._pending_state = self._pending_state, None
+                if state is not None:
+                    self._restore_selection(state)
+                self.fit_column_width(0)
+                self.sig_parsing_finished.emit()
+        if not records:
+            self._drain_timer.stop()
+
+    def _apply_node_record(self, record: NodeRecord) -> None:
+        parent_seq, key, depth, type_str, data, desc = record
+        ids = self._parse_ids
+        parent_id = ids[parent_seq] if parent_seq >= 0 else NO_PARENT
+        if parent_seq >= 0 and parent_id == NO_PARENT:
+            # The parent was dropped
+            ids.append(NO_PARENT)
+            return
+        if isinstance(data, MoreRows):
+            ids.append(NO_PARENT)
+            self._add_more_row(data, self._nodes.value_of(parent_id))
+            return
+
+        root = self.invisibleRootItem()
+        if parent_id == NO_PARENT and self._hide_root:
+            node = root
+        else:
+            node = DataTreeItem([str(key) if key is not None else "", "", ""])
+            (self._nodes.value_of(parent_id) if parent_id != NO_PARENT else root).addChild(node)
+            # Sorted once the parse has finished
+            self._sorter.add_unsorted(parent_id)
+        node_id = self._nodes.add(parent_id, key, node)
+        ids.append(node_id)
+        node.setData(0, ItemDataRole.UserRole, node_id)
+        if node is not root and self._should_expand_node(node_id, depth, self._pending_state):
+            node.setExpanded(True)
+
+        node.setText(1, type_str)
+        self._set_node_data(node, data)
+        node.setText(2, PENDING_TEXT if desc is None else desc)
+        if desc is not None:
+            self._set_description(node, desc, self._preview_widget(data))
+
+    def _apply_detail_record(self, record: DetailRecord) -> None:
+        seq, desc = record
+        node_id = self._parse_ids[seq]
+        if node_id == NO_PARENT:
+            return
+        node = self._nodes.value_of(node_id)
+        data = self._node_data(node)
+        self._set_description(node, desc, self._preview_widget(data))
+
+    def update_data(self, data: dict[str, Any]) -> None:
+        """
+        Update the displayed data in place by diffing it against the current tree.
+
+        Only paths that were added, removed or whose value changed are touched, so the cost of an update depends on
+        the size of the change rather than on the size of the tree. Expansion and selection state of unchanged nodes
+        is kept.
+
+        Args:
+            data (dict[str, Any]): The new data to be displayed.
+        """
+        root = self._nodes.get(())
+        if root is None:
+            self.set_data(data, hide_root=self._hide_root)
+            return
+
+        self._invalidate_search_index()
+        self._update_node(root, data)
+
+    def append_children(
+        self,
+        path: tuple[str | int, ...],
+        items: Iterable[Any] | Mapping[str | int, Any],
+        max_rows: int | None = None,
+    ) -> None:
+        """
+        Append children to the node at `path` without rebuilding it, e.g. for a growing log.
+
+        Appends are queued and inserted with a single `addChildren` call per node once control returns to the event
+        loop, so appending single items at a high rate stays cheap. The displayed data itself is not modified, the
+        `Value` column of the node is refreshed from it.
+
+        Args:
+            path (tuple[str | int, ...]): The path of the node to append to.
+            items (Iterable[Any] | Mapping[str | int, Any]): The values to append. The values of a mapping are appended
+                under their keys (replacing existing children with the same key), other values get consecutive integer
+                keys following the last child of the node.
+            max_rows (int | None, optional): Keep at most this many children, evicting the oldest ones. Applies to
+                later appends to the node as well. Defaults to None (keep the current limit, if any).
+        """
+        if path not in self._nodes and self._parse_worker is None:
+            raise KeyError(path)
+        if max_rows is not None:
+            self._append_limits[path] = max_rows
+        pending = self._pending_appends.setdefault(path, [])
+        if isinstance(items, Mapping):
+            pending.extend(cast(Mapping[str | int, Any], items).items())
+        else:
+            pending.extend((None, item) for item in items)
+        if not self._append_timer.isActive():
+            self._append_timer.start()
+
+    def append_child(self, path: tuple[str | int, ...], value: Any, key: str | int | None = None) -> None:
+        """
+        Append a single child to the node at `path`, see `append_children`.
+
+        Args:
+            path (tuple[str | int, ...]): The path of the node to append to.
+            value (Any): The value to append.
+            key (str | int | None, optional): The key of the child. Defaults to None (the next integer key).
+        """
+        if path not in self._nodes and self._parse_worker is None:
+            raise KeyError(path)
+        self._pending_appends.setdefault(path, []).append((key, value))
+        if not self._append_timer.isActive():
+            self._append_timer.start()
+
+    def has_pending_appends(self) -> bool:
+        """
+        Check whether appended children are still queued, i.e. not inserted into the tree yet.
+        """
+        return bool(self._pending_appends)
+
+    def _flush_appends(self) -> None:
+        pending, self._pending_appends = self._pending_appends, {}
+        for path, entries in pending.items():
+            node = self._nodes.get(path)
+            if node is None:
+                if self._parse_worker is not None:
+                    # The node has not been parsed yet
+                    self._pending_appends[path] = entries
+                continue
+            self._append_to_node(node, path, entries)
+        if self._pending_appends:
+            self._append_timer.start()
+        self._invalidate_search_index()
+
+    def _append_to_node(
+        self, node: QTreeWidgetItem, path: tuple[str | int, ...], entries: list[tuple[str | int | None, Any]]
+    ) -> None:
+        next_key = self._next_child_key(node)
+        keyed: list[tuple[str | int, Any]] = []
+        for key, value in entries:
+            if key is None:
+                key = next_key
+                next_key += 1
+            keyed.append((key, value))
+        limit = self._append_limits.get(path)
+        if limit is not None:
+            keyed = keyed[max(0, len(keyed) - limit) :]
+
+        node_id: int = node.data(0, ItemDataRole.UserRole)
+        items: list[QTreeWidgetItem] = []
+        for key, _ in keyed:
+            old_id = self._nodes.child_id(node_id, key)
+            if old_id is not None:
+                self._remove_item(self._nodes.value_of(old_id))
+            items.append(DataTreeItem([str(key), "", ""]))
+        # Built in append order, the eviction below relies on the index listing the children in that order
+        stack: list[_BuildEntry] = [
+            (value, item, "", key, node_id, 1, True)
+            for (key, value), item in zip(reversed(keyed), reversed(items), strict=True)
+        ]
+        # The new items are built while detached, so they are inserted with a single model update
+        self._build_items(stack, self._ancestor_ids(node))
+        for item, (_, value) in zip(items, keyed, strict=True):
+            # The appended values are not part of the data of the node, so nothing else keeps them alive
+            self._set_node_data(item, value, strong=True)
+        node.addChildren(items)
+        self._sorter.mark_unsorted(node)
+        detached, self._detached_previews = self._detached_previews, []
+        for sub_node, widget in detached:
+            self._attach_preview(sub_node, widget)
+
+        if limit is not None:
+            # Most recently added first, the rows may be sorted
+            child_ids = list(self._nodes.child_ids(node_id))
+            for child_id in reversed(child_ids[limit:]):
+                self._remove_item(self._nodes.value_of(child_id))
+
+        data = self._node_data(node)
+        if is_container(data):
+            self._sorter.set_text(node, 2, describe_data(data)[1])
+
+    def _next_child_key(self, node: QTreeWidgetItem) -> int:
+        if self._sorter.column() is not None:
+            node_id: int = node.data(0, ItemDataRole.UserRole)
+            keys = (self._nodes.key_of(child_id) for child_id in self._nodes.child_ids(node_id))
+            return max((key + 1 for key in keys if isinstance(key, int)), default=0)
+        for row in reversed(range(node.childCount())):
+            child_id: int | None = cast(QTreeWidgetItem, node.child(row)).data(0, ItemDataRole.UserRole)
+            if child_id is not None and isinstance(key := self._nodes.key_of(child_id), int):
+                return key + 1
+        return 0
 
     def build_tree(
         self,
@@ -79,7 +721,12 @@ class DataTreeWidget(QTreeWidget):
         path: tuple[str | int, ...] = (),
     ) -> None:
         """
-        Recursively build the tree from the given data.
+        Build the tree from the given data.
+
+        The tree is built iteratively, so the nesting depth of the data is not limited by the recursion limit.
+        Containers that appear more than once are only expanded the first time, later occurrences are shown as
+        back-references (for cycles) or as references to the first occurrence (for shared objects). Children beyond
+        `max_depth` or `max_children_per_node` are replaced by a "… N more" row that builds them when activated.
 
         Args:
             data (dict[str, Any]): A dictionary containing the data to be displayed.
@@ -88,37 +735,456 @@ class DataTreeWidget(QTreeWidget):
             hide_root (bool, optional): Whether to hide the root node. Defaults to True.
             path (tuple[str | int, ...], optional): A tuple containing the path to the current node. Defaults to ().
         """
-        if hide_root:
-            node = parent
-        else:
-            node = QTreeWidgetItem([name, "", ""])
-            parent.addChild(node)
+        parent_id = self._nodes.id_of(path[:-1]) if path else NO_PARENT
+        if parent_id is None:
+            raise KeyError(path[:-1])
+        key = path[-1] if path else None
+        self._build_items([(data, parent, name, key, parent_id, 0, hide_root)], self._ancestor_ids(parent))
+
+    def _build_items(self, stack: list[_BuildEntry], seen: dict[int, int]) -> None:
+        """
+        Build items for the entries on `stack` and all their descendants, using `stack` as the work list.
+        """
+        max_depth, max_children = self._max_depth, self._max_children_per_node
+        nodes = self._nodes
+        # Parents that get new or rebuilt children have to be re-sorted
+        sorter = self._sorter if self._sorter.column() is not None else None
+        bound = self._binding is not None
+        while stack:
+            entry = stack.pop()
+            if len(entry) == 2:
+                self._add_more_row(*entry)
+                continue
+
+            data, parent, name, key, parent_id, depth, use_parent = entry
+            if use_parent:
+                node = parent
+                node_id = node.data(0, ItemDataRole.UserRole)
+            else:
+                node = DataTreeItem([name, "", ""])
+                parent.addChild(node)
+                node_id = None
+            if sorter is not None:
+                sorter.add_unsorted(parent_id)
+            if node_id is None:
+                # Rebuilt nodes keep their id
+                node_id = nodes.add(parent_id, key, node)
+                node.setData(0, ItemDataRole.UserRole, node_id)
+
+            if has_children(data):
+                target = seen.get(id(data))
+                if target is not None:
+                    target_path = nodes.path_of(target)
+                    node.setText(1, type_name(data))
+                    node.setText(2, reference_text(nodes.path_of(node_id), target_path))
+                    self._set_node_data(node, data)
+                    node.setData(0, ReferenceRole, target_path)
+                    continue
+                seen[id(data)] = node_id
+
+            self._populate_item(node, node_id, data)
+            if bound:
+                self._record_version(node_id, data)
+            children, more = child_slice(data, depth, 0, max_depth, max_children)
+            if more is not None:
+                stack.append((more, node))
+            stack.extend((child, node, str(key), key, node_id, depth + 1, False) for key, child in reversed(children))
+        if sorter is not None:
+            sorter.schedule()
 
-        self._nodes[path] = node
+    def _ancestor_ids(self, item: QTreeWidgetItem | None) -> dict[int, int]:
+        """
+        Return the ids of the containers shown by `item` and its ancestors, mapped to their node ids. Used to detect
+        cycles when building a subtree below `item`.
+        """
+        seen: dict[int, int] = {}
+        while item is not None:
+            node_id = item.data(0, ItemDataRole.UserRole)
+            data = self._node_data(item)
+            if node_id is not None and has_children(data):
+                seen[id(data)] = node_id
+            item = item.parent()
+        return seen
 
-        type_str, desc, childs, widget = self.parse_data(data)
+    def _add_more_row(self, more: MoreRows, node: QTreeWidgetItem) -> None:
+        item = DataTreeItem([f"… {more.remaining} more", "", ""])
+        item.setData(0, MoreRowsRole, more)
+        item.setToolTip(0, "Activate to show more")
+        node.addChild(item)
+
+    def load_more(self, item: QTreeWidgetItem) -> None:
+        """
+        Replace a "… N more" row with the children it stands for (up to the configured limits).
+
+        Args:
+            item (QTreeWidgetItem): The "… N more" row.
+        """
+        more: MoreRows | None = item.data(0, MoreRowsRole)
+        if more is None:
+            return
+
+        node = item.parent() or self.invisibleRootItem()
+        node_id: int = node.data(0, ItemDataRole.UserRole)
+        node.removeChild(item)
+        data = self._node_data(node)
+        # The depth limit applies relative to the node whose children are loaded
+        children, next_more = child_slice(data, 0, more.offset, None, self._max_children_per_node)
+        stack: list[_BuildEntry] = [(next_more, node)] if next_more is not None else []
+        stack.extend((child, node, str(key), key, node_id, 1, False) for key, child in reversed(children))
+        self._build_items(stack, self._ancestor_ids(node))
+        self._invalidate_search_index()
+
+    def _populate_item(self, node: QTreeWidgetItem, node_id: int, data: Any) -> None:
+        """
+        Set the type/value columns of `node` and attach its preview widget.
+        """
+        type_str, desc = describe_data(data)
 
         node.setText(1, type_str)
-        node.setData(2, ItemDataRole.UserRole, data)
+        self._nodes.set_data(node_id, data_ref(data, not self._is_owned(node_id)))
+        self._set_description(node, desc, self._preview_widget(data))
+
+    def _node_data(self, item: QTreeWidgetItem) -> Any:
+        """
+        Return the data shown by `item`, or None for preview rows and data that was released since (see
+        `_set_node_data`).
+        """
+        node_id: int | None = item.data(0, ItemDataRole.UserRole)
+        if node_id is None:
+            return None
+        data = self._nodes.data_of(node_id)
+        return data() if type(data) is WeakData else data
+
+    def _is_released(self, item: QTreeWidgetItem) -> bool:
+        node_id: int | None = item.data(0, ItemDataRole.UserRole)
+        if node_id is None:
+            return False
+        data = self._nodes.data_of(node_id)
+        return type(data) is WeakData and data() is None
+
+    def _set_node_data(self, item: QTreeWidgetItem, data: Any, strong: bool = False) -> None:
+        """
+        Store the data shown by `item` in the path index.
+
+        Children that their parent's handler declares as owned (see `TypeHandler.owns_children`, e.g. the items of
+        lists and dicts) are referenced weakly where possible, so the tree does not keep data alive that was removed
+        from its container. Everything else, like the root, children created by a handler on the fly (e.g. the fields
+        of a record) and values that are not part of the data (appended or edited values), is referenced strongly.
+        """
+        node_id: int = item.data(0, ItemDataRole.UserRole)
+        self._nodes.set_data(node_id, data_ref(data, strong or not self._is_owned(node_id)))
+
+    def _is_owned(self, node_id: int) -> bool:
+        """
+        Return whether the data of the node is kept alive by the data of its parent node.
+        """
+        parent_id = self._nodes.parent_of(node_id)
+        if parent_id == NO_PARENT:
+            return False
+        parent = self._nodes.data_of(parent_id)
+        if type(parent) is WeakData:
+            parent = parent()
+        return parent is not None and handlers.handler(parent).owns_children
+
+    def _item_at(self, index: ModelIndex) -> QTreeWidgetItem | None:
+        # The stubs don't declare that `itemFromIndex` returns None for invalid indexes
+        return cast(QTreeWidgetItem | None, self.itemFromIndex(index))
+
+    def index_data(self, index: ModelIndex) -> Any:
+        """
+        Return the data of the node at `index`, or None for preview rows and data that was released since.
+        """
+        item = self._item_at(index)
+        return self._node_data(item) if item is not None else None
 
-        if len(desc) > 100:
+    def preview_payload(self, index: ModelIndex) -> Any:
+        """
+        Return what the preview row at `index` shows: the text for text previews, otherwise the data of its node.
+        """
+        item = self.itemFromIndex(index)
+        payload = item.data(0, PreviewDataRole)
+        if payload is not None:
+            return payload
+        return self._node_data(item.parent() or self.invisibleRootItem())
+
+    def _set_description(self, node: QTreeWidgetItem, desc: str, widget: QWidget | None) -> None:
+        long_text = len(desc) > 100
+        if long_text:
             desc = f"{desc[:97]}..."
-            if widget is None:
-                widget = QPlainTextEdit()
-                widget.setReadOnly(True)
-                widget.setPlainText(desc)
+            node.setText(2, "")
         else:
             node.setText(2, desc)
 
+        data = self._node_data(node)
+        if isinstance(data, np.ndarray):
+            data = cast(npt.NDArray[Any], data)
+            # Painted next to the description by the delegate
+            node.setData(2, SparklineRole, sparkline_kind(data))
+
         if widget is not None:
             self._widgets.append(widget)
-            sub_node = QTreeWidgetItem(["", "", ""])
-            node.addChild(sub_node)
+            sub_node = DataTreeItem(["", "", ""])
+            node.insertChild(0, sub_node)
+            self._attach_preview(sub_node, widget)
+            return
+
+        # Previews without a widget (all of them in `PreviewMode.DELEGATE`, texts and tracebacks in
+        # `PreviewMode.WIDGETS`) are painted, a widget is only created when the row is activated
+        kind = preview_kind(data, long_text)
+        if kind is not None:
+            sub_node = DataTreeItem(["", "", ""])
+            sub_node.setData(0, PreviewKindRole, kind)
+            if kind is PreviewKind.TEXT:
+                # Other previews read the data from their node, so they don't keep it alive
+                sub_node.setData(0, PreviewDataRole, desc)
+            payload = desc if kind is PreviewKind.TEXT else data
+            sub_node.setSizeHint(0, self._delegate.preview_size_hint(kind, payload, self.fontMetrics()))
+            node.insertChild(0, sub_node)
+            self._attach_preview(sub_node, None)
+
+    def _attach_preview(self, sub_node: QTreeWidgetItem, widget: QWidget | None) -> None:
+        # The stubs don't declare that `treeWidget` returns None for detached items
+        if cast(QTreeWidget | None, sub_node.treeWidget()) is None:
+            # Items built detached (see `append_children`) only get their widget once they are inserted
+            self._detached_previews.append((sub_node, widget))
+            return
+        if widget is not None:
             self.setItemWidget(sub_node, 0, widget)
-            sub_node.setFirstColumnSpanned(True)
+            self._setup_array_editing(widget, sub_node.parent())
+        sub_node.setFirstColumnSpanned(True)
+
+    def _is_truncated(self, node: QTreeWidgetItem, data: Any) -> bool:
+        """
+        Check whether not all children of `node` were built (reference node or depth/child limits).
+        """
+        if not has_children(data):
+            return False
+        count = node.childCount()
+        return count == 0 or cast(QTreeWidgetItem, node.child(count - 1)).data(0, MoreRowsRole) is not None
+
+    def _rebuild_item(self, node: QTreeWidgetItem, data: Any) -> None:
+        self._clear_children(node)
+        node.setData(0, ReferenceRole, None)
+        node_id: int = node.data(0, ItemDataRole.UserRole)
+        nodes = self._nodes
+        entry = (data, node, "", nodes.key_of(node_id), nodes.parent_of(node_id), len(nodes.path_of(node_id)), True)
+        self._build_items([entry], self._ancestor_ids(node.parent()))
+
+    def _update_node(self, node: QTreeWidgetItem, data: Any, expanded_only: bool = False) -> bool:
+        """
+        Diff `data` against the subtree of `node` and update it in place. Returns whether anything changed.
+
+        With `expanded_only`, the children of collapsed nodes are not diffed, the node is flagged as stale instead if
+        its data was replaced (see `bind`). While bound, mutable values that are the same object are compared by their
+        `content_version`, so changes made in place are found too.
+        """
+        changed = False
+        root = self.invisibleRootItem()
+        nodes = self._nodes
+        # The old data of the parent is kept on the stack, it keeps the weakly referenced old data of the children
+        # alive until they are compared
+        stack: list[tuple[QTreeWidgetItem, Any, Any]] = [(node, data, None)]
+        while stack:
+            node, data, _ = stack.pop()
+            old_data = self._node_data(node)
+            node_id: int = node.data(0, ItemDataRole.UserRole)
+            modified = self._modified_in_place(node_id, old_data, data)
+
+            if not (is_container(old_data) and type(old_data) is type(data)):
+                if modified or not values_equal(old_data, data):
+                    if modified and isinstance(data, np.ndarray):
+                        # Cached by identity, which did not change
+                        self._delegate.array_stats.forget(cast(npt.NDArray[Any], data))
+                        self._delegate.sparklines.forget(cast(npt.NDArray[Any], data))
+                    self._rebuild_item(node, data)
+                    changed = True
+                elif old_data is not data:
+                    # Refer to the new object, the old one may be released with its container
+                    self._set_node_data(node, data)
+                continue
+            if expanded_only and node is not root and not node.isExpanded():
+                if modified or old_data is not data:
+                    self._set_stale(node, data)
+                    changed = True
+                continue
+            if self._is_truncated(node, old_data) or self._is_truncated(node, data):
+                self._rebuild_item(node, data)
+                changed = True
+                continue
+
+            if node.data(0, StaleRole):
+                self._clear_stale(node)
+            self._set_node_data(node, data)
+            self._sorter.set_text(node, 2, describe_data(data)[1])
+
+            existing: dict[str | int, QTreeWidgetItem] = {}
+            for child in reversed(child_items(node)):
+                child_id: int | None = child.data(0, ItemDataRole.UserRole)
+                if child_id is not None:
+                    existing[nodes.key_of(child_id)] = child  # type: ignore[index]
+
+            new_childs = dict(iter_children(data))
+            for key, child in existing.items():
+                if key not in new_childs:
+                    self._remove_item(child)
+                    changed = True
+            for key, child_data in new_childs.items():
+                child = existing.get(key)
+                if child is None:
+                    self._build_items([(child_data, node, str(key), key, node_id, 0, False)], self._ancestor_ids(node))
+                    changed = True
+                else:
+                    stack.append((child, child_data, old_data))
+        return changed
+
+    def _record_version(self, node_id: int, data: Any) -> None:
+        version = content_version(data)
+        if version is None:
+            self._content_versions.pop(node_id, None)
+        else:
+            self._content_versions[node_id] = version
+
+    def _modified_in_place(self, node_id: int, old_data: Any, data: Any) -> bool:
+        """
+        While bound, check whether `data`, the same object as `old_data`, was modified in place since its version was
+        recorded, and record its current version.
+        """
+        if self._binding is None:
+            return False
+        recorded = self._content_versions.get(node_id)
+        self._record_version(node_id, data)
+        return old_data is data and recorded is not None and recorded != self._content_versions.get(node_id)
+
+    def _set_stale(self, node: QTreeWidgetItem, data: Any) -> None:
+        """
+        Flag a collapsed node whose children were not updated to `data`.
+        """
+        self._set_node_data(node, data)
+        self._sorter.set_text(node, 2, describe_data(data)[1])
+        node.setData(0, StaleRole, True)
+        font = node.font(2)
+        font.setItalic(True)
+        node.setFont(2, font)
+        node.setToolTip(2, "Outdated, expand to refresh")
+
+    def _clear_stale(self, node: QTreeWidgetItem) -> None:
+        node.setData(0, StaleRole, None)
+        node.setData(2, ItemDataRole.FontRole, None)
+        node.setData(2, ItemDataRole.ToolTipRole, None)
+
+    def bind(
+        self,
+        source: Callable[[], Any] | Any,
+        interval_ms: int = 200,
+        lock: contextlib.AbstractContextManager[Any] | None = None,
+    ) -> None:
+        """
+        Mirror data that is modified elsewhere, e.g. by an acquisition thread.
+
+        Every `interval_ms` milliseconds, the data is read from `source` and the visible part of the tree is updated in
+        place: shown values and the children of expanded nodes are diffed (see `update_data`), collapsed nodes are not
+        descended into. A collapsed node whose data was replaced is flagged as stale (shown in italics) and refreshed
+        as soon as it is expanded. Arrays and containers modified in place are found by comparing checksums of their
+        contents, recorded when they are bound or shown (see `content_version`), containers only by their own items.
+        Refreshing is paused while the widget is hidden, and the interval is stretched when a refresh takes up a
+        significant part of it.
+
+        Args:
+            source (Callable[[], Any] | Any): Either a callable returning a consistent snapshot of the data, which is
+                called on the GUI thread and must be thread-safe, or the (mutable) data itself, which is then only read
+                while holding `lock`.
+            interval_ms (int, optional): The minimum time between two refreshes. Defaults to 200.
+            lock (AbstractContextManager | None, optional): The lock guarding `source`, e.g. a `threading.Lock`.
+                Required if `source` is not a callable. Defaults to None.
+        """
+        if lock is None and not callable(source):
+            raise ValueError("A lock is required to bind to data that is not a snapshot callable")
+        if self._binding is None:
+            self.itemExpanded.connect(self._on_item_expanded)
+            # Changes made in place from now on are found by comparing against these versions
+            for node_id in self._nodes.ids():
+                self._record_version(node_id, self._node_data(self._nodes.value_of(node_id)))
+        if lock is None:
+            self._binding = (source, contextlib.nullcontext())
+        else:
+            self._binding = (lambda: source, lock)
+        self._bind_interval = max(interval_ms, MIN_BIND_INTERVAL_MS)
+        self.refresh_binding()
+
+    def unbind(self) -> None:
+        """
+        Stop mirroring the data passed to `bind`. The tree keeps showing the last state.
+        """
+        if self._binding is not None:
+            self.itemExpanded.disconnect(self._on_item_expanded)
+        self._binding = None
+        self._bind_timer.stop()
+        self._content_versions.clear()
+
+    def is_bound(self) -> bool:
+        return self._binding is not None
+
+    def refresh_binding(self) -> None:
+        """
+        Update the tree from the bound source now (see `bind`).
+        """
+        if self._binding is None or self._parse_worker is not None:
+            return
+        if not self.isVisible():
+            # Resumed by showEvent
+            return
+
+        started = time.perf_counter()
+        snapshot, lock = self._binding
+        with lock:
+            data = snapshot()
+            root = self._nodes.get(())
+            if root is None or type(self._node_data(root)) is not type(data):
+                self.set_data(data, hide_root=self._hide_root, background=False)
+            elif self._update_node(root, data, expanded_only=True):
+                self._invalidate_search_index()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._bind_timer.start(max(self._bind_interval, int(elapsed_ms * BIND_LOAD_FACTOR)))
+
+    def _on_item_expanded(self, item: QTreeWidgetItem) -> None:
+        if self._binding is not None and item.data(0, StaleRole):
+            self._bind_timer.start(0)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        if self._binding is not None:
+            self._bind_timer.start(0)
 
-        for key, child_data in childs.items():
-            self.build_tree(child_data, node, str(key), path=path + (key,))
+    def hideEvent(self, event: QHideEvent) -> None:
+        super().hideEvent(event)
+        self._bind_timer.stop()
+
+    def _clear_children(self, node: QTreeWidgetItem) -> None:
+        for child in reversed(child_items(node)):
+            self._remove_item(child)
+
+    def _remove_item(self, item: QTreeWidgetItem) -> None:
+        """
+        Remove `item` and its descendants from the tree, the path index and the widget list.
+        """
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            node_id = current.data(0, ItemDataRole.UserRole)
+            if node_id is not None:
+                self._nodes.remove(node_id)
+                self._sorter.forget(node_id)
+                self._content_versions.pop(node_id, None)
+            if current is self._active_preview:
+                self._active_preview = None
+            # itemWidget has to resolve the item's model index, skip it when there are no widgets
+            widget = self.itemWidget(current, 0) if self._widgets else None
+            if widget is not None and widget in self._widgets:
+                self._widgets.remove(widget)
+            stack.extend(child_items(current))
+
+        parent = item.parent() or self.invisibleRootItem()
+        parent.removeChild(item)
 
     def parse_data(self, data: Any) -> tuple[str, str, dict[int, Any], QWidget | None]:
         """
@@ -131,53 +1197,349 @@ class DataTreeWidget(QTreeWidget):
             tuple ((str, str, dict[int, Any], QWidget | None)): type string, description text, dictionary of
             child data to recursively parse, widget to display the data if supported
         """
-        type_str = type(data).__name__
-        if type_str == "instance":
-            type_str += f": {data.__class__.__name__}"
-        widget = None
-        desc = ""
-        childs: dict[int, Any] = {}
-
-        if isinstance(data, dict):
-            desc = f"length={len(data)}"  # type: ignore
-            childs = dict(data.items())  # type: ignore
-        elif isinstance(data, (list, tuple)):
-            desc = f"length={len(data)}"  # type: ignore
-            childs = dict(enumerate(data))  # type: ignore
-        elif isinstance(data, np.ndarray):
-            desc = f"shape={data.shape} dtype={data.dtype}"
-            if data.size > 1000:
-                summary = f"min={data.min()}, max={data.max()}, mean={data.mean():.2f}"
-                widget = QPushButton(f"Array summary: {summary}")
-                widget.clicked.connect(lambda: self.show_full_array(data))  # type: ignore
-            else:
-                table = pg.TableWidget()
-                table.setData(data)
-                table.setMaximumHeight(200)
-                widget = table
-        elif isinstance(data, types.TracebackType):
-            frames = list(map(str.strip, traceback.format_list(traceback.extract_tb(data))))
-            widget = QPlainTextEdit()
-            widget.setPlainText("\n".join(frames))
-            widget.setMaximumHeight(200)
-            widget.setReadOnly(True)
-        else:
-            desc = str(data)
+        type_str, desc = describe_data(data)
+        childs: dict[int, Any] = dict(iter_children(data))  # type: ignore
+        widget = self._preview_widget(data)
 
         return type_str, desc, childs, widget
 
-    def filter_tree(self, text: str) -> None:
+    def _preview_widget(self, data: Any) -> QWidget | None:
+        """
+        Return the widget shown below the node of `data` in `PreviewMode.WIDGETS`. Only arrays get a widget up front.
+        """
+        if self._preview_mode is PreviewMode.DELEGATE:
+            return None
+        kind = preview_kind(data)
+        if kind is PreviewKind.ARRAY_SUMMARY or kind is PreviewKind.ARRAY_TABLE:
+            return self._create_preview_widget(data)
+        return None
+
+    def _create_preview_widget(self, data: Any) -> QWidget | None:
+        """
+        Create the widget that shows the preview of `data`.
+        """
+        kind = preview_kind(data)
+        if kind is PreviewKind.ARRAY_SUMMARY:
+            widget = ArraySummaryButton(data, self._delegate.array_stats)
+            widget.clicked.connect(lambda: self.show_full_array(data))  # type: ignore
+            return widget
+        if kind is PreviewKind.ARRAY_TABLE:
+            table = ArrayTableView(array=data)
+            table.setMaximumHeight(200)
+            return table
+        if kind is PreviewKind.TRACEBACK:
+            return PagedTextView(text=viewer_content(data))
+        return None
+
+    def create_preview_editor(self, index: ModelIndex) -> QWidget:
+        """
+        Create the widget shown in place of the painted preview row at `index` while it is open (see `open_preview`).
+        """
+        item = self.itemFromIndex(index)
+        node = item.parent() or self.invisibleRootItem()
+        if item.data(0, PreviewKindRole) is PreviewKind.TEXT:
+            # The painted preview only shows the bounded description, the full text is created when it is opened
+            widget = PagedTextView(text=viewer_content(self._node_data(node)))
+        else:
+            widget = self._create_preview_widget(self.preview_payload(index))
+            if widget is None:
+                # The data was released since the row was built
+                widget = QLabel("The data is no longer available")
+        self._setup_array_editing(widget, node)
+        return widget
+
+    def is_preview_open(self, index: ModelIndex) -> bool:
+        """
+        Check whether the preview row at `index` currently shows its widget (`PreviewMode.DELEGATE` only).
+        """
+        return self._active_preview is not None and self.indexFromItem(self._active_preview) == index
+
+    def open_preview(self, item: QTreeWidgetItem) -> None:
         """
-        Search the tree for items containing the given text and hide/show them accordingly.
+        Replace the painted preview of the given preview row with a real widget, closing any other open preview.
+
+        Args:
+            item (QTreeWidgetItem): A preview row, i.e. an item with a `PreviewKindRole`.
+        """
+        if item.data(0, PreviewKindRole) is None or item is self._active_preview:
+            return
+        self.close_preview()
+        self._active_preview = item
+        self._preview_size = item.sizeHint(0)
+        item.setSizeHint(0, QSize(0, self._delegate.EDITOR_HEIGHT))
+        self.openPersistentEditor(item, 0)
+
+    def close_preview(self) -> None:
+        item = self._active_preview
+        if item is None:
+            return
+        self._active_preview = None
+        self.closePersistentEditor(item, 0)
+        item.setSizeHint(0, self._preview_size)
+
+    def _on_item_activated(self, item: QTreeWidgetItem, column: int) -> None:
+        if item.data(0, MoreRowsRole) is not None:
+            self.load_more(item)
+            return
+        kind = item.data(0, PreviewKindRole)
+        if kind is PreviewKind.ARRAY_SUMMARY:
+            if (data := self.preview_payload(self.indexFromItem(item))) is not None:
+                self.show_full_array(data)
+        elif kind is not None:
+            self.open_preview(item)
+
+    def filter_tree(self, text: str, columns: tuple[int, ...] = (0,), recursive: bool = False) -> None:
+        """
+        Search the tree for items containing the given text and hide/show them accordingly. The matching part of the
+        text is highlighted.
+
+        Uses a case-folded search index that is built on the first search after the data changed. If the query
+        extends the previous one, only the previous matches are searched, and only items whose visibility changes
+        are touched.
 
         Args:
             text (str): The text to search for.
+            columns (tuple[int, ...], optional): The columns to search in (0: Name, 1: Type, 2: Value). Defaults to
+                (0,).
+            recursive (bool, optional): If True, the ancestors of matching items stay visible and only the branches
+                leading to a match are expanded. Defaults to False.
+        """
+        self.cancel_filter()
+        self._apply_filter(text, columns, recursive)
+
+    def _ensure_search_index(self) -> SearchIndex[QTreeWidgetItem]:
         """
-        for item in self._nodes.values():
-            item.setHidden(item.text(0).lower().find(text.lower()) == -1)
+        Return the search index, building it from the path index if the tree changed since it was last built.
+        """
+        if self._search_index is None:
+            index = SearchIndex[QTreeWidgetItem](self._search_ngram_size)
+            nodes = self._nodes
+            root = self.invisibleRootItem()
+            node_ids = [node_id for node_id in nodes.ids() if nodes.value_of(node_id) is not root]
+            # Rows are numbered in the order they are added, parents may come after their children
+            row_ids = {node_id: row_id for row_id, node_id in enumerate(node_ids)}
+            for node_id in node_ids:
+                item = nodes.value_of(node_id)
+                parent = row_ids.get(nodes.parent_of(node_id), -1)
+                index.add(item, (item.text(0), item.text(1), item.text(2)), parent)
+            self._search_index = index
+            self._filter_state = None
+        return self._search_index
+
+    def _invalidate_search_index(self) -> None:
+        self.cancel_filter()
+        self._search_index = None
+        self._filter_state = None
+        self._delegate.set_highlight("", ())
+
+    def _apply_filter(self, text: str, columns: tuple[int, ...], recursive: bool = False) -> set[int]:
+        """
+        Update the visibility of all indexed items for the given query, returning the ids of the matching items.
+        """
+        state, changes = self._filter_changes(text, columns, recursive)
+        for item, hidden in changes:
+            item.setHidden(hidden)
+        self._finish_filter(state)
+        return state.matches
+
+    def _filter_changes(
+        self, text: str, columns: tuple[int, ...], recursive: bool
+    ) -> tuple[FilterState, list[tuple[QTreeWidgetItem, bool]]]:
+        """
+        Compute the matches for the given query and the visibility changes needed to show exactly those items (and
+        their ancestors for recursive filters).
+        """
+        index = self._ensure_search_index()
+        query = text.casefold()
+        state = self._filter_state
+        if state is not None and state.columns == columns and state.query in query:
+            # Any match of the new query is also a match of the previous one, so only those need to be checked
+            matches = index.search(query, columns, candidates=state.matches)
+        else:
+            matches = index.search(query, columns)
+        visible = index.with_ancestors(matches) if recursive and query else matches
+        new_state = FilterState(query, columns, matches, recursive, visible)
+
+        if state is not None:
+            changes = [(index.row(row_id), True) for row_id in state.visible - visible]
+            changes.extend((index.row(row_id), False) for row_id in visible - state.visible)
+            return new_state, changes
+
+        changes: list[tuple[QTreeWidgetItem, bool]] = []
+        for row_id in range(len(index)):
+            item = index.row(row_id)
+            hidden = row_id not in visible
+            if item.isHidden() != hidden:
+                changes.append((item, hidden))
+        return new_state, changes
+
+    def _finish_filter(self, state: FilterState) -> None:
+        self._filter_state = state
+        self._delegate.set_highlight(state.query, state.columns)
+        self.viewport().update()
+        if state.recursive and state.query:
+            # Only open the branches that lead to a match
+            index = self._ensure_search_index()
+            for row_id in {index.parent(row_id) for row_id in state.visible} - {-1}:
+                index.row(row_id).setExpanded(True)
+
+    def filter_tree_async(self, text: str, columns: tuple[int, ...] = (0,), recursive: bool = False) -> None:
+        """
+        Like `filter_tree`, but applies the visibility changes in time-sliced batches from the event loop.
+
+        A filter that is still being applied is cancelled. `sig_filter_progress` is emitted after every batch and
+        `sig_filter_finished` with the number of matches once all changes are applied.
+
+        Args:
+            text (str): The text to search for.
+            columns (tuple[int, ...], optional): The columns to search in. Defaults to (0,).
+            recursive (bool, optional): Keep the ancestors of matches visible. Defaults to False.
+        """
+        self.cancel_filter()
+        state, changes = self._filter_changes(text, columns, recursive)
+        # Until all changes are applied, the visibility doesn't match any filter state
+        self._filter_state = None
+        self._pending_filter = (state, deque(changes), len(changes))
+        self._filter_timer.start()
+
+    def cancel_filter(self) -> None:
+        """
+        Stop applying the visibility changes of a running `filter_tree_async` call.
+        """
+        if self._pending_filter is not None:
+            self._pending_filter = None
+            self._filter_timer.stop()
+            self.sig_filter_cancelled.emit()
+
+    def is_filtering(self) -> bool:
+        return self._pending_filter is not None
+
+    def _apply_pending_filter(self) -> None:
+        if self._pending_filter is None:
+            self._filter_timer.stop()
+            return
+
+        state, changes, total = self._pending_filter
+        deadline = time.perf_counter() + FRAME_BUDGET_S
+        while changes and time.perf_counter() < deadline:
+            for _ in range(min(len(changes), 256)):
+                item, hidden = changes.popleft()
+                item.setHidden(hidden)
+        self.sig_filter_progress.emit(total - len(changes), total)
+
+        if not changes:
+            self._pending_filter = None
+            self._filter_timer.stop()
+            self._finish_filter(state)
+            self.sig_filter_finished.emit(len(state.matches))
+
+    def search_values(self, text: str) -> None:
+        """
+        Search the values of the whole data for `text` in a worker thread (see `iter_value_matches`).
+
+        Values without children match if their `Value` column contains `text`. Arrays are searched element by element
+        with vectorized comparisons: numbers are compared to `text` parsed as a number, strings are searched for it.
+        Matches are emitted in batches with `sig_value_matches` as they are found, their rows are highlighted and the
+        first `MAX_REVEALED_MATCHES` are revealed. `sig_value_search_finished` is emitted with the number of matches.
+        A search that is still running is cancelled, an empty text only clears the matches.
+
+        Args:
+            text (str): The text to search for.
+        """
+        self.cancel_value_search()
+        self._clear_value_matches()
+        root_id = self._nodes.id_of(())
+        if not text or root_id is None:
+            self.sig_value_search_finished.emit(0)
+            return
+        data = self._nodes.data_of(root_id)
+        self._value_search_token += 1
+        worker = ValueSearchWorker(self._value_search_token, data() if type(data) is WeakData else data, text)
+        worker.signals.sig_matches.connect(self._on_value_matches)
+        worker.signals.sig_finished.connect(self._on_value_search_finished)
+        self._value_search_worker = self._value_search_workers[worker.token] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel_value_search(self) -> None:
+        if self._value_search_worker is not None:
+            self._value_search_worker.cancel()
+            self._value_search_worker = None
+
+    def is_searching_values(self) -> bool:
+        return self._value_search_worker is not None
+
+    def value_matches(self) -> list[ValueMatch]:
+        """
+        Return the matches found by the last `search_values` call so far.
+        """
+        return list(self._value_matches)
+
+    def _clear_value_matches(self) -> None:
+        for match in self._value_matches:
+            if (node := self._nodes.get(match.path)) is not None:
+                node.setData(2, ItemDataRole.BackgroundRole, None)
+                node.setData(2, ItemDataRole.ToolTipRole, None)
+        self._value_matches = []
+
+    def _on_value_matches(self, token: int, matches: list[ValueMatch]) -> None:
+        if token != self._value_search_token or self._value_search_worker is None:
+            return
+        root = self.invisibleRootItem()
+        for match in matches:
+            node = self._nodes.get(match.path)
+            if node is None or node is root:
+                self._value_matches.append(match)
+                continue
+            node.setData(2, ItemDataRole.BackgroundRole, self._delegate.highlight_color)
+            if match.element is not None:
+                node.setToolTip(2, f"{match.count} matching elements, first at {match.element}")
+            if len(self._value_matches) < self.MAX_REVEALED_MATCHES:
+                parent = node.parent()
+                while parent is not None and not parent.isExpanded():
+                    parent.setExpanded(True)
+                    parent = parent.parent()
+                if not self._value_matches:
+                    self.scrollToItem(node)
+            self._value_matches.append(match)
+        self.sig_value_matches.emit(matches)
+
+    def _on_value_search_finished(self, token: int, n_matches: int) -> None:
+        worker = self._value_search_workers.pop(token, None)
+        if worker is None or worker is not self._value_search_worker:
+            return
+        self._value_search_worker = None
+        self.sig_value_search_finished.emit(n_matches)
 
     def toggle_sort(self) -> None:
-        self.sortItems(0, Qt.SortOrder.AscendingOrder)
+        """
+        Sort by name in ascending order, see `sort_by_column`.
+        """
+        self.sort_by_column(0, Qt.SortOrder.AscendingOrder)
+
+    def sort_by_column(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Sort the children of every node by `column` and keep them sorted as the tree changes (see `TreeSorter`).
+
+        Later insertions and changes (e.g. from `update_data` or `append_children`) only get the children of the
+        affected nodes re-sorted.
+
+        Args:
+            column (int): The column to sort by.
+            order (Qt.SortOrder, optional): The sort order. Defaults to ascending.
+        """
+        self._sorter.sort_by_column(column, order)
+
+    def clear_sort(self) -> None:
+        """
+        Stop keeping the tree sorted. The current order is kept.
+        """
+        self._sorter.stop()
+
+    def sort_column(self) -> int | None:
+        return self._sorter.column()
+
+    def sort_order(self) -> Qt.SortOrder:
+        return self._sorter.order()
 
     def show_context_menu(self, pos: QPoint) -> None:
         item = self.itemAt(pos)
@@ -195,51 +1557,357 @@ class DataTreeWidget(QTreeWidget):
 
         copy_name_action.triggered.connect(lambda: QApplication.clipboard().setText(item.text(0)))
         copy_type_action.triggered.connect(lambda: QApplication.clipboard().setText(item.text(1)))
-        copy_value_action.triggered.connect(lambda: QApplication.clipboard().setText(item.text(2)))
-        if self._allow_edit:
+        copy_value_action.triggered.connect(lambda: QApplication.clipboard().setText(self.value_text(item)))
+        if self.can_edit(item):
             edit_action = QAction("Edit Value")
             menu.addAction(edit_action)
             edit_action.triggered.connect(lambda: self.edit_item_value(item))
+        export_action = QAction("Export…")
+        if item.data(0, ItemDataRole.UserRole) is not None and not self._is_released(item):
+            menu.addAction(export_action)
+            export_action.triggered.connect(lambda: self._export_interactive(item))
+        if self._pending_edits:
+            commit_action = QAction(f"Commit Edits ({len(self._pending_edits)})")
+            discard_action = QAction("Discard Edits")
+            menu.addSeparator()
+            menu.addAction(commit_action)
+            menu.addAction(discard_action)
+            commit_action.triggered.connect(self._commit_edits_interactive)
+            discard_action.triggered.connect(self.discard_edits)
 
         menu.exec(self.mapToGlobal(pos))
 
+    def value_text(self, item: QTreeWidgetItem) -> str:
+        """
+        Return the complete text of the value of the given item, which the `Value` column may only show in part.
+
+        Args:
+            item (QTreeWidgetItem): The item whose value is requested.
+        """
+        data = self._node_data(item)
+        if (
+            item.data(0, ItemDataRole.UserRole) is None
+            or item.data(0, ReferenceRole) is not None
+            or self._is_released(item)
+            or is_container(data)
+            or preview_kind(data) is not None
+        ):
+            return item.text(2)
+        return full_text(data)
+
     def edit_item_value(self, item: QTreeWidgetItem) -> None:
         """
-        Edit the value of the given item.
+        Open the inline editor of the value of the given item.
 
         Args:
             item (QTreeWidgetItem): The item to edit.
         """
-        if not self._allow_edit:
+        if self.can_edit(item):
+            self.edit(self.indexFromItem(item, 2))
+
+    @overload
+    def edit(self, index: ModelIndex, /) -> None: ...
+
+    @overload
+    def edit(self, index: ModelIndex, trigger: QAbstractItemView.EditTrigger, event: QEvent, /) -> bool: ...
+
+    def edit(
+        self,
+        index: ModelIndex,
+        trigger: QAbstractItemView.EditTrigger = QAbstractItemView.EditTrigger.AllEditTriggers,
+        event: QEvent | None = None,
+        /,
+    ) -> bool | None:
+        # Items are only made editable when they are about to be edited, so building the tree costs nothing extra
+        if index.column() != 2:
+            return False
+        item = self._item_at(index)
+        if item is None or not self.can_edit(item):
+            return False
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
+        # Qt passes no event for edits that were not triggered by one, e.g. from `edit(index)`
+        return super().edit(index, trigger, event)  # type: ignore[arg-type]
+
+    def can_edit(self, item: QTreeWidgetItem) -> bool:
+        """
+        Check whether editing is allowed and the value of `item` can be edited as text, and in `EditMode.WRITE_BACK`
+        written back.
+        """
+        if (
+            not self._allow_edit
+            or item.data(0, ItemDataRole.UserRole) is None
+            or item.data(0, ReferenceRole) is not None
+            or self._is_released(item)
+            or not isinstance(self._current_value(item), EDITABLE_TYPES)
+        ):
+            return False
+        if self._edit_mode is EditMode.DISPLAY:
+            return True
+        parent = item.parent() or self.invisibleRootItem()
+        return not self._is_released(parent) and is_writable(self._node_data(parent))
+
+    def _current_value(self, item: QTreeWidgetItem) -> Any:
+        """
+        Return the value of `item`, or the value of the edit queued for it.
+        """
+        if self._pending_edits:
+            path = self.item_path(item)
+            if path is not None and (edit := self._pending_edits.get((path, None))) is not None:
+                return edit.value
+        return self._node_data(item)
+
+    def edit_text(self, index: ModelIndex) -> str:
+        """
+        Return the text the inline editor of the value at `index` starts with.
+        """
+        value = self._current_value(self.itemFromIndex(index))
+        return value if isinstance(value, str) else str(value)
+
+    def set_edit_text(self, index: ModelIndex, text: str) -> None:
+        """
+        Apply the text entered in the inline editor of the value at `index`: it is parsed as a value of the type of the
+        current value, and shown or, in `EditMode.WRITE_BACK`, queued (see `queue_edit`).
+        """
+        item = self.itemFromIndex(index)
+        try:
+            value = parse_value(text, self._current_value(item))
+        except (ValueError, TypeError):
+            QMessageBox.warning(self, "Invalid Input", "Could not convert input to correct type")
+            return
+        if self._edit_mode is EditMode.WRITE_BACK:
+            path = self.item_path(item)
+            if path is not None:
+                self.queue_edit(path, value)
+            return
+        self._set_node_data(item, value, strong=True)
+        self._sorter.set_text(item, 2, describe_data(value)[1])
+        self._invalidate_search_index()
+
+    def queue_edit(self, path: tuple[str | int, ...], value: Any, element: ElementIndex | None = None) -> None:
+        """
+        Queue an edit, to be written to the data by `commit_edits`. The tree shows the new value right away.
+
+        A later edit of the same value replaces the queued one.
+
+        Args:
+            path (tuple[str | int, ...]): The path of the edited value, or of the array whose element is edited.
+            value (Any): The new value.
+            element (ElementIndex | None, optional): The index of the edited element in the array at `path`.
+                Defaults to None.
+
+        Raises:
+            RuntimeError: If the widget is not in `EditMode.WRITE_BACK`.
+            ValueError: If `path` is the root and no element is given.
+        """
+        if self._edit_mode is not EditMode.WRITE_BACK:
+            raise RuntimeError("Edits are only queued with edit_mode=EditMode.WRITE_BACK")
+        if not path and element is None:
+            raise ValueError("The root itself cannot be replaced")
+        self._pending_edits[(path, element)] = PendingEdit(path, value, element)
+        node = self._nodes.get(path)
+        if node is not None:
+            if element is None:
+                self._sorter.set_text(node, 2, describe_data(value)[1])
+            font = node.font(2)
+            font.setBold(True)
+            node.setFont(2, font)
+            node.setToolTip(2, "Edited, not committed yet")
+        self.sig_pending_edits_changed.emit(len(self._pending_edits))
+
+    def pending_edits(self) -> list[PendingEdit]:
+        return list(self._pending_edits.values())
+
+    def commit_edits(self) -> list[tuple[str | int, ...]]:
+        """
+        Write all queued edits to the data, as one transaction (see `write_edits`).
+
+        If the tree is bound to a lock (see `bind`), it is held while writing. `sig_edits_committed` is emitted once,
+        with the paths of all edited values.
+
+        Returns:
+            list[tuple[str | int, ...]]: The paths of the edited values, in the order they were first edited.
+
+        Raises:
+            LookupError, TypeError, ValueError: If a target no longer exists, cannot be written, or rejected the
+                value. Nothing is written then, and the edits stay queued.
+        """
+        if not self._pending_edits:
+            return []
+        root = self._nodes.get(())
+        if root is None:
+            raise LookupError("The tree shows no data")
+        root_data = self._node_data(root)
+        edits = list(self._pending_edits.values())
+        lock = self._binding[1] if self._binding is not None else contextlib.nullcontext()
+
+        with lock:
+            write_edits(root_data, edits)
+
+        self._pending_edits.clear()
+        paths = list(dict.fromkeys(edit.path for edit in edits))
+        for edit in edits:
+            node = self._nodes.get(edit.path)
+            if node is not None and edit.element is None:
+                self._set_node_data(node, edit.value)
+        if any(edit.element is not None for edit in edits):
+            # Cached statistics and sparklines of the edited arrays are outdated
+            self._delegate.array_stats.clear_cache()
+            self._delegate.sparklines.clear_cache()
+        self._end_edits(paths)
+        self.sig_pending_edits_changed.emit(0)
+        self.sig_edits_committed.emit(paths)
+        return paths
+
+    def discard_edits(self) -> None:
+        """
+        Drop all queued edits, the tree shows the values of the data again.
+        """
+        if not self._pending_edits:
+            return
+        edits = list(self._pending_edits.values())
+        self._pending_edits.clear()
+        for edit in edits:
+            node = self._nodes.get(edit.path)
+            if node is not None and edit.element is None:
+                self._sorter.set_text(node, 2, describe_data(self._node_data(node))[1])
+        self._end_edits(list(dict.fromkeys(edit.path for edit in edits)))
+        self.sig_pending_edits_changed.emit(0)
+
+    def _end_edits(self, paths: list[tuple[str | int, ...]]) -> None:
+        for path in paths:
+            node = self._nodes.get(path)
+            if node is not None:
+                node.setData(2, ItemDataRole.FontRole, None)
+                node.setData(2, ItemDataRole.ToolTipRole, None)
+        for view in self.findChildren(ArrayTableView):
+            if view.model().is_editable():
+                view.model().set_overrides({})
+        self._invalidate_search_index()
+        self.viewport().update()
+
+    def _commit_edits_interactive(self) -> None:
+        try:
+            self.commit_edits()
+        except (LookupError, TypeError, ValueError, AttributeError) as exc:
+            QMessageBox.warning(self, "Commit Failed", f"The edits could not be written: {exc}")
+
+    def _setup_array_editing(self, widget: QWidget, node: QTreeWidgetItem | None) -> None:
+        """
+        Make the array table `widget` below `node` editable in `EditMode.WRITE_BACK`, its edits are queued.
+        """
+        if not (self._allow_edit and self._edit_mode is EditMode.WRITE_BACK) or node is None:
+            return
+        if not isinstance(widget, ArrayTableView):
+            return
+        path = self.item_path(node)
+        if path is None:
+            return
+        model = widget.model()
+        model.set_editable(True)
+        model.set_overrides(
+            {
+                edit.element: edit.value
+                for edit in self._pending_edits.values()
+                if edit.path == path and edit.element is not None
+            }
+        )
+
+        def on_value_edited(element: ElementIndex, value: Any) -> None:
+            self._on_array_value_edited(node, element, value)
+
+        model.sig_value_edited.connect(on_value_edited)
+
+    def _on_array_value_edited(self, node: QTreeWidgetItem, element: ElementIndex, value: Any) -> None:
+        path = self.item_path(node)
+        if path is not None:
+            self.queue_edit(path, value, element)
+
+    def export_item(self, item: QTreeWidgetItem, path: str | os.PathLike[str], fmt: ExportFormat | None = None) -> None:
+        """
+        Export the data of `item`, including everything below it, to `path` in a worker thread (see `export_data`).
+
+        Nothing is converted or copied up front: containers are streamed as JSON and arrays are written from their
+        buffers, so exporting a large subtree does not need additional memory. `sig_export_progress` reports the bytes
+        written and the total (0 while the structure is written), `sig_export_finished` is emitted with the path and
+        None, or the error message. Starting an export cancels the one that is running. The data must not be modified
+        until the export has finished.
+
+        Args:
+            item (QTreeWidgetItem): The item to export.
+            path (str | PathLike): The file to write.
+            fmt (ExportFormat | None, optional): The format, by default derived from the suffix of `path`.
+        """
+        if item.data(0, ItemDataRole.UserRole) is None or self._is_released(item):
+            raise ValueError("The item has no data to export")
+        data = self._node_data(item)
+        self.cancel_export()
+        self._export_token += 1
+        token = self._export_token
+        worker = ExportWorker(token, data, path, fmt)
+
+        def on_progress(done: int, total: int) -> None:
+            self._on_export_progress(token, done, total)
+
+        worker.signals.sig_progress.connect(on_progress)
+        worker.signals.sig_finished.connect(self._on_export_finished)
+        self._export_worker = self._export_workers[token] = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel_export(self) -> None:
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+            self._export_worker = None
+        self._close_export_dialog()
+
+    def _close_export_dialog(self) -> None:
+        if self._export_dialog is not None:
+            self._export_dialog.reset()
+            self._export_dialog.deleteLater()
+            self._export_dialog = None
+
+    def is_exporting(self) -> bool:
+        return self._export_worker is not None
+
+    def _on_export_progress(self, token: int, done: int, total: int) -> None:
+        if token != self._export_token or self._export_worker is None:
             return
-        data = item.data(2, ItemDataRole.UserRole)
-        if isinstance(data, (int, float, str, bool)):
-            new_value, ok = QInputDialog.getText(
-                self,
-                "Edit Value",
-                "Enter new value:",
-                text=str(data),
-            )
-            if ok:
-                try:
-                    if isinstance(data, bool):
-                        new_data = new_value.lower() in ("true", "1", "yes")
-                    else:
-                        new_data = type(data)(new_value)
-
-                    item.setData(2, ItemDataRole.UserRole, new_data)
-                    item.setText(2, str(new_data))
-                except ValueError:
-                    QMessageBox.warning(self, "Invalid Input", "Could not convert input to correct type")
-
-    def toggle_full_text(self, item: QTreeWidgetItem, widget: QWidget) -> None:
-        widget.setVisible(not widget.isVisible())
+        self.sig_export_progress.emit(done, total)
+        if self._export_dialog is not None and total:
+            self._export_dialog.setMaximum(1000)
+            self._export_dialog.setValue(done * 1000 // total)
+
+    def _on_export_finished(self, token: int, error: str | None) -> None:
+        worker = self._export_workers.pop(token, None)
+        if worker is None:
+            return
+        if worker is self._export_worker:
+            self._export_worker = None
+            if self._export_dialog is not None:
+                self._close_export_dialog()
+                if error is not None:
+                    QMessageBox.warning(self, "Export Failed", f"Could not export to {worker.path}: {error}")
+        self.sig_export_finished.emit(str(worker.path), error)
+
+    def _export_interactive(self, item: QTreeWidgetItem) -> None:
+        filters = {"NumPy archive (*.npz)": ".npz", "JSON with .npy files (*.json)": ".json"}
+        if isinstance(self._node_data(item), np.ndarray):
+            filters["NumPy array (*.npy)"] = ".npy"
+        path, selected = QFileDialog.getSaveFileName(self, "Export", item.text(0) or "data", ";;".join(filters))
+        if not path:
+            return
+        if os.path.splitext(path)[1].lower() not in filters.values():
+            path += filters.get(selected, ".npz")
+
+        self.export_item(item, path)
+        label = f"Exporting to {os.path.basename(path)}…"
+        dialog = self._export_dialog = QProgressDialog(label, "Cancel", 0, 0, self)
+        dialog.setMinimumDuration(500)
+        dialog.canceled.connect(self.cancel_export)
 
     def show_full_array(self, data: npt.NDArray[Any]) -> None:
         dialog = QDialog()
         layout = QVBoxLayout()
-        table = pg.TableWidget()
-        table.setData(data)
+        table = ArrayTableView(array=data)
         layout.addWidget(table)
         dialog.setLayout(layout)
         dialog.resize(600, 400)
@@ -247,32 +1915,162 @@ class DataTreeWidget(QTreeWidget):
 
 
 class SearchableDataTreeWidget(QWidget):
-    def __init__(self, parent: QWidget | None = None, allow_edit: bool = False) -> None:
+    """
+    `DataTreeWidget` with a search bar.
+
+    Typing in the search bar starts a filter pass once no key was pressed for `debounce_ms` milliseconds. The filter
+    is applied in time-sliced batches (see `DataTreeWidget.filter_tree_async`), a new query cancels the one that is
+    still being applied. With `recursive_filter=True`, the parents of matching items stay visible.
+
+    With `value_search=True` (or the "Values" check box), the query searches the values instead of the names, see
+    `DataTreeWidget.search_values`.
+    """
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        allow_edit: bool = False,
+        debounce_ms: int = 150,
+        recursive_filter: bool = False,
+        edit_mode: EditMode = EditMode.DISPLAY,
+        value_search: bool = False,
+    ) -> None:
         super().__init__(parent)
         layout = QVBoxLayout()
+        self._recursive_filter = recursive_filter
+        self._value_search = value_search
+        self._n_value_matches = 0
 
         self.search_bar = QLineEdit()
-        self.search_bar.textChanged.connect(self.filter_tree)
+        self.search_bar.textChanged.connect(self._on_search_text_changed)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(lambda: self.filter_tree(self.search_bar.text()))
 
         self.btn_sort = QPushButton("Sort")
         self.btn_sort.clicked.connect(self.toggle_sort)
 
-        self.data_tree = DataTreeWidget(allow_edit=allow_edit)
+        self.chk_values = QCheckBox("Values")
+        self.chk_values.setToolTip("Search the values, including array elements, instead of the names")
+        self.chk_values.setChecked(value_search)
+        self.chk_values.toggled.connect(self.set_value_search)
+
+        self.data_tree = DataTreeWidget(allow_edit=allow_edit, edit_mode=edit_mode)
+        self.data_tree.sig_filter_progress.connect(self._on_filter_progress)
+        self.data_tree.sig_filter_finished.connect(self._on_filter_finished)
+        self.data_tree.sig_filter_cancelled.connect(self._on_filter_cancelled)
+        self.data_tree.sig_value_matches.connect(self._on_value_matches)
+        self.data_tree.sig_value_search_finished.connect(self._on_filter_finished)
+
+        self.lbl_matches = QLabel()
+        self.filter_progress = QProgressBar()
+        self.filter_progress.setMaximumHeight(self.lbl_matches.sizeHint().height())
+        self.filter_progress.setTextVisible(False)
+        self.filter_progress.hide()
+        self.btn_cancel_filter = QPushButton("Cancel")
+        self.btn_cancel_filter.clicked.connect(self.cancel_filter)
+        self.btn_cancel_filter.hide()
+
+        status_layout = QHBoxLayout()
+        status_layout.setContentsMargins(0, 0, 0, 0)
+        status_layout.addWidget(self.lbl_matches)
+        status_layout.addWidget(self.filter_progress, 1)
+        status_layout.addWidget(self.btn_cancel_filter)
 
-        layout.addWidget(self.search_bar)
+        search_layout = QHBoxLayout()
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        search_layout.addWidget(self.search_bar, 1)
+        search_layout.addWidget(self.chk_values)
+
+        layout.addLayout(search_layout)
         layout.addWidget(self.btn_sort)
+        layout.addLayout(status_layout)
         layout.addWidget(self.data_tree)
 
         self.setLayout(layout)
 
+    def debounce_interval(self) -> int:
+        return self._debounce_timer.interval()
+
+    def set_debounce_interval(self, msec: int) -> None:
+        self._debounce_timer.setInterval(msec)
+
+    def set_recursive_filter(self, recursive: bool) -> None:
+        self._recursive_filter = recursive
+        self.filter_tree(self.search_bar.text())
+
+    def set_value_search(self, enabled: bool) -> None:
+        """
+        Search the values instead of the names. The name filter is reset, so all matches can be shown.
+        """
+        if self.chk_values.isChecked() != enabled:
+            # Comes back through `toggled`
+            self.chk_values.setChecked(enabled)
+            return
+        self._value_search = enabled
+        if enabled:
+            self.data_tree.cancel_filter()
+            self.data_tree.filter_tree("")
+        else:
+            self.data_tree.search_values("")
+        self.filter_tree(self.search_bar.text())
+
+    def _on_search_text_changed(self, text: str) -> None:
+        self.data_tree.cancel_filter()
+        self.data_tree.cancel_value_search()
+        self._debounce_timer.start()
+
     def filter_tree(self, text: str) -> None:
-        self.data_tree.filter_tree(text)
+        self._debounce_timer.stop()
+        if not self._value_search:
+            self.data_tree.filter_tree_async(text, recursive=self._recursive_filter)
+            return
+        self._n_value_matches = 0
+        self.data_tree.search_values(text)
+        if self.data_tree.is_searching_values():
+            # The number of values to search is not known up front
+            self.filter_progress.setRange(0, 0)
+            self.filter_progress.show()
+            self.btn_cancel_filter.show()
+
+    def cancel_filter(self) -> None:
+        """
+        Stop a pending or running filter pass. Rows that were already shown/hidden stay that way.
+        """
+        self._debounce_timer.stop()
+        self.data_tree.cancel_filter()
+        if self.data_tree.is_searching_values():
+            self.data_tree.cancel_value_search()
+            self._on_filter_cancelled()
+
+    def _on_value_matches(self, matches: list[ValueMatch]) -> None:
+        self._n_value_matches += len(matches)
+        self.lbl_matches.setText(f"matches: {self._n_value_matches}…")
+
+    def _on_filter_progress(self, done: int, total: int) -> None:
+        if done < total:
+            self.filter_progress.setRange(0, total)
+            self.filter_progress.setValue(done)
+            self.filter_progress.show()
+            self.btn_cancel_filter.show()
+
+    def _on_filter_finished(self, n_matches: int) -> None:
+        self.filter_progress.hide()
+        self.btn_cancel_filter.hide()
+        self.lbl_matches.setText(f"matches: {n_matches}")
+
+    def _on_filter_cancelled(self) -> None:
+        self.filter_progress.hide()
+        self.btn_cancel_filter.hide()
+        self.lbl_matches.setText("matches: -")
 
     def toggle_sort(self) -> None:
         self.data_tree.toggle_sort()
 
-    def set_data(self, data: dict[str, Any], hide_root: bool = False) -> None:
-        self.data_tree.set_data(data, hide_root)
+    def set_data(self, data: dict[str, Any], hide_root: bool = False, update: bool = False) -> None:
+        self.data_tree.set_data(data, hide_root, update=update)
 
     def collapseAll(self) -> None:
         self.data_tree.collapseAll()
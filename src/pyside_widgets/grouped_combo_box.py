@@ -3,8 +3,12 @@
 
 # pyright: reportAttributeAccessIssue=false, reportUnknownArgumentType=false, reportUnknownVariableType=false
 
+import array
+import bisect
+import contextlib
 import enum
 import typing as t
+from collections.abc import Generator, Iterable, Iterator, Mapping
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
@@ -13,6 +17,8 @@ ItemDataRole = QtCore.Qt.ItemDataRole
 ItemTypeRole = ItemDataRole.UserRole + 1
 
 type ModelIndex = QtCore.QModelIndex | QtCore.QPersistentModelIndex
+# Children of a group: a mapping of texts to data, or texts (without data) and `(text, data)` pairs
+type GroupItems = Mapping[str, t.Any] | Iterable[str | tuple[str, t.Any]]
 
 
 class ItemType(enum.Enum):
@@ -21,15 +27,209 @@ class ItemType(enum.Enum):
     CHILD = enum.auto()
 
 
+# Codes of the item types in the type array of `GroupedItemModel`
+_SEPARATOR: t.Final = ItemType.SEPARATOR.value
+_PARENT: t.Final = ItemType.PARENT.value
+_CHILD: t.Final = ItemType.CHILD.value
+# Default parent of the model methods, the model is flat
+_ROOT: t.Final = QtCore.QModelIndex()
+_ITEM_TYPES: t.Final = {item_type.value: item_type for item_type in ItemType}
+_ITEM_FLAGS: t.Final = {
+    _SEPARATOR: QtCore.Qt.ItemFlag.NoItemFlags,
+    _PARENT: QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemNeverHasChildren,
+    _CHILD: QtCore.Qt.ItemFlag.ItemIsSelectable
+    | QtCore.Qt.ItemFlag.ItemIsEnabled
+    | QtCore.Qt.ItemFlag.ItemNeverHasChildren,
+}
+
+
+class GroupedItemModel(QtCore.QAbstractListModel):
+    """
+    The list model of a `GroupedComboBox`.
+
+    Instead of a `QStandardItem` per row, the rows are stored in parallel sequences: the item types as an int8 array,
+    the texts and the data as lists, and the rows of the parent items (the group offsets) as an int array. `data` and
+    `flags` are answered by indexing them.
+    """
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self._types = array.array("b")
+        self._texts: list[str] = []
+        self._data: list[t.Any] = []
+        # Rebuilt from `_types` when rows are inserted or removed anywhere but at the end
+        self._group_offsets: array.array[int] | None = array.array("q")
+        self._parent_font = QtGui.QFont()
+        self._parent_font.setBold(True)
+
+    def rowCount(self, parent: ModelIndex = _ROOT) -> int:
+        return 0 if parent.isValid() else len(self._texts)
+
+    def data(self, index: ModelIndex, role: int = ItemDataRole.DisplayRole) -> t.Any:
+        row = index.row()
+        if not index.isValid() or row >= len(self._texts):
+            return None
+        if role == ItemDataRole.DisplayRole or role == ItemDataRole.EditRole:
+            return self._texts[row]
+        if role == ItemTypeRole:
+            return _ITEM_TYPES[self._types[row]]
+        if role == ItemDataRole.UserRole:
+            return self._data[row]
+        if role == ItemDataRole.FontRole and self._types[row] == _PARENT:
+            return self._parent_font
+        return None
+
+    def flags(self, index: ModelIndex) -> QtCore.Qt.ItemFlag:
+        if not index.isValid() or index.row() >= len(self._types):
+            return QtCore.Qt.ItemFlag.NoItemFlags
+        return _ITEM_FLAGS[self._types[index.row()]]
+
+    def setData(self, index: ModelIndex, value: t.Any, role: int = ItemDataRole.EditRole) -> bool:
+        row = index.row()
+        if not index.isValid() or row >= len(self._texts):
+            return False
+        if role == ItemDataRole.DecorationRole:
+            # Icons are not shown. Accepting them lets `QComboBox.insertItem(index, icon, text)` set the text, its
+            # `setItemData` call stops at the first role that is rejected.
+            return True
+        if role == ItemDataRole.DisplayRole or role == ItemDataRole.EditRole:
+            self._texts[row] = "" if value is None else str(value)
+        elif role == ItemDataRole.UserRole:
+            self._data[row] = value
+        elif role == ItemTypeRole:
+            self._types[row] = ItemType(value).value
+            self._group_offsets = None
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def insertRows(self, row: int, count: int, parent: ModelIndex = _ROOT) -> bool:
+        # Used by `QComboBox.insertItem`, inserts child items
+        if parent.isValid() or count < 1 or not 0 <= row <= len(self._texts):
+            return False
+        self.beginInsertRows(_ROOT, row, row + count - 1)
+        self._types[row:row] = array.array("b", [_CHILD]) * count
+        self._texts[row:row] = [""] * count
+        self._data[row:row] = [None] * count
+        if row < len(self._texts) - count:
+            self._group_offsets = None
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row: int, count: int, parent: ModelIndex = _ROOT) -> bool:
+        if parent.isValid() or count < 1 or row < 0 or row + count > len(self._texts):
+            return False
+        self.beginRemoveRows(_ROOT, row, row + count - 1)
+        del self._types[row : row + count]
+        del self._texts[row : row + count]
+        del self._data[row : row + count]
+        self._group_offsets = None
+        self.endRemoveRows()
+        return True
+
+    def append_rows(self, types: bytes, texts: list[str], data: list[t.Any]) -> None:
+        """
+        Append rows with a single model update.
+
+        :param types: The item type of each row, as the values of `ItemType`.
+        :type types: bytes
+        :param texts: The text of each row.
+        :type texts: list[str]
+        :param data: The data of each row.
+        :type data: list[Any]
+        """
+        if not len(types) == len(texts) == len(data):
+            raise ValueError("types, texts and data must have the same length")
+        if not types:
+            return
+        first = len(self._texts)
+        self.beginInsertRows(_ROOT, first, first + len(types) - 1)
+        self._types.frombytes(types)
+        self._texts.extend(texts)
+        self._data.extend(data)
+        if self._group_offsets is not None:
+            self._group_offsets.extend(_parent_rows(types, first))
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        if not self._texts:
+            return
+        self.beginResetModel()
+        self._types = array.array("b")
+        self._texts = []
+        self._data = []
+        self._group_offsets = array.array("q")
+        self.endResetModel()
+
+    def item_type(self, row: int) -> ItemType:
+        return _ITEM_TYPES[self._types[row]]
+
+    def group_row(self, row: int) -> int:
+        """
+        Return the row of the parent item of the group that `row` belongs to (the closest parent item at or before
+        it), or -1 if there is none.
+
+        :param row: The row of an item.
+        :type row: int
+        :return: The row of the parent item.
+        :rtype: int
+        """
+        if self._group_offsets is None:
+            self._group_offsets = array.array("q", _parent_rows(self._types.tobytes()))
+        i = bisect.bisect_right(self._group_offsets, row) - 1
+        return self._group_offsets[i] if i >= 0 else -1
+
+
+def _parent_rows(types: bytes, offset: int = 0) -> Iterator[int]:
+    # `bytes.find` skips the child rows in C, there are usually few parent rows
+    marker = bytes([_PARENT])
+    row = types.find(marker)
+    while row >= 0:
+        yield offset + row
+        row = types.find(marker, row + 1)
+
+
+class _Rows:
+    # The parallel sequences passed to `GroupedItemModel.append_rows`
+    __slots__ = ("data", "texts", "types")
+
+    def __init__(self) -> None:
+        self.types = bytearray()
+        self.texts: list[str] = []
+        self.data: list[t.Any] = []
+
+    def add(self, item_type: int, text: str = "", data: t.Any = None) -> None:
+        self.types.append(item_type)
+        self.texts.append(text)
+        self.data.append(data)
+
+    def add_group(self, name: str, items: GroupItems) -> None:
+        self.add(_PARENT, name)
+        if isinstance(items, Mapping):
+            mapping = t.cast(Mapping[str, t.Any], items)
+            self.texts.extend(mapping.keys())
+            self.data.extend(mapping.values())
+            self.types.extend(bytes([_CHILD]) * len(mapping))
+            return
+        for entry in items:
+            text, data = (entry, None) if isinstance(entry, str) else entry
+            self.add(_CHILD, text, data)
+
+
 class GroupedComboBox(QtWidgets.QComboBox):
     """
     A QComboBox variant that allows grouping of items under a header.
+
+    Use `add_group` or `set_groups` to add many items at once, they insert all rows of a call with a single model
+    update. The items are stored in a `GroupedItemModel`, which needs a small fraction of the memory of
+    `QStandardItem`s.
     """
 
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
 
-        self._model = QtGui.QStandardItemModel(self)
+        self._model = GroupedItemModel(self)
         self._view = QtWidgets.QTreeView(self)
         self._view.setHeaderHidden(True)
         self._view.setRootIsDecorated(False)
@@ -38,14 +238,14 @@ class GroupedComboBox(QtWidgets.QComboBox):
         self.setView(self._view)
         self.setItemDelegate(GroupedComboBoxDelegate(self))
 
+    def _append(self, rows: _Rows) -> None:
+        self._model.append_rows(bytes(rows.types), rows.texts, rows.data)
+
     def add_separator(self) -> None:
         """
         Add a separator item to the combo box.
         """
-        item = QtGui.QStandardItem()
-        item.setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
-        item.setData(ItemType.SEPARATOR, ItemTypeRole)
-        self._model.appendRow(item)
+        self._model.append_rows(bytes([_SEPARATOR]), [""], [None])
 
     def add_parent_item(self, text: str) -> None:
         """
@@ -54,17 +254,7 @@ class GroupedComboBox(QtWidgets.QComboBox):
         :param text: The text to be displayed for the parent item.
         :type text: str
         """
-        item = QtGui.QStandardItem(text)
-        flags = item.flags()
-        flags &= ~QtCore.Qt.ItemFlag.ItemIsSelectable
-        item.setFlags(flags)
-        item.setData(ItemType.PARENT, ItemTypeRole)
-
-        font = item.font()
-        font.setBold(True)
-        item.setFont(font)
-
-        self._model.appendRow(item)
+        self._model.append_rows(bytes([_PARENT]), [text], [None])
 
     def add_child_item(self, text: str, data: t.Any | None = None) -> None:
         """
@@ -75,11 +265,65 @@ class GroupedComboBox(QtWidgets.QComboBox):
         :param data: The data associated with the child item.
         :type data: Any
         """
-        item = QtGui.QStandardItem(text)
-        item.setData(data, ItemDataRole.UserRole)
-        item.setData(ItemType.CHILD, ItemTypeRole)
+        self._model.append_rows(bytes([_CHILD]), [text], [data])
+
+    @contextlib.contextmanager
+    def _batch(self) -> Generator[None]:
+        # The popup is laid out and repainted once, after all rows are inserted
+        self._view.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self._view.setUpdatesEnabled(True)
+
+    def add_group(self, name: str, items: GroupItems, separator: bool = False) -> None:
+        """
+        Add a parent item and its child items with a single model update.
+
+        :param name: The text to be displayed for the parent item.
+        :type name: str
+        :param items: The child items, either a mapping of texts to data, or texts and `(text, data)` pairs.
+        :type items: GroupItems
+        :param separator: Whether to add a separator before the group, defaults to False
+        :type separator: bool, optional
+        """
+        rows = _Rows()
+        if separator:
+            rows.add(_SEPARATOR)
+        rows.add_group(name, items)
+        with self._batch():
+            self._append(rows)
+
+    def set_groups(self, groups: Mapping[str, GroupItems], separators: bool = False) -> None:
+        """
+        Replace all items with the given groups, inserted with a single model update.
 
-        self._model.appendRow(item)
+        :param groups: The child items of each group (see `add_group`), by the text of the parent item.
+        :type groups: Mapping[str, GroupItems]
+        :param separators: Whether to add a separator between the groups, defaults to False
+        :type separators: bool, optional
+        """
+        rows = _Rows()
+        for name, items in groups.items():
+            if separators and rows.types:
+                rows.add(_SEPARATOR)
+            rows.add_group(name, items)
+        with self._batch():
+            self._model.clear()
+            self._append(rows)
+
+    def current_group(self) -> str | None:
+        """
+        Returns the text of the parent item of the group containing the currently selected item.
+
+        :return: The text of the parent item, or None if no item is selected or it is not in a group.
+        :rtype: str | None
+        """
+        index = self.currentIndex()
+        if index < 0:
+            return None
+        row = self._model.group_row(index)
+        return self.itemText(row) if row >= 0 else None
 
     def currentData(self, role: int = ItemDataRole.UserRole) -> t.Any | None:
         """
@@ -92,10 +336,8 @@ class GroupedComboBox(QtWidgets.QComboBox):
         :rtype: Any | None
         """
         index = self.currentIndex()
-        if index >= 0:
-            item = self._model.item(index)
-            if item.data(ItemTypeRole) == ItemType.CHILD:
-                return item.data(ItemDataRole.UserRole)
+        if index >= 0 and self._model.item_type(index) == ItemType.CHILD:
+            return self._model.data(self._model.index(index), role)
 
         return None
 
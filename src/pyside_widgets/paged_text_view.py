@@ -0,0 +1,290 @@
+import bisect
+import re
+import traceback
+import types
+from array import array
+from typing import Any, Final, Protocol
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, QPersistentModelIndex, Qt
+from PySide6.QtGui import QFontDatabase, QShowEvent
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QListView, QVBoxLayout, QWidget
+
+ItemDataRole = Qt.ItemDataRole
+type ModelIndex = QModelIndex | QPersistentModelIndex
+
+# The parent of all rows, the model is flat
+_ROOT: Final = QModelIndex()
+# Longer lines are split into several rows
+MAX_LINE_CHARS = 1000
+
+
+class _LineSource(Protocol):
+    def count(self) -> int: ...
+
+    def at_end(self) -> bool: ...
+
+    def line(self, row: int) -> str: ...
+
+    def fetch(self, n_lines: int) -> None: ...
+
+    def find(self, pattern: re.Pattern[str], start: int) -> int | None: ...
+
+
+class _TextLines:
+    """
+    Lines of a string, indexed on demand. Only the start and end offsets of the lines indexed so far are stored.
+    """
+
+    def __init__(self, text: str, max_line_chars: int = MAX_LINE_CHARS) -> None:
+        self._text = text
+        self._max_line_chars = max_line_chars
+        self._starts = array("q")
+        self._ends = array("q")
+        self._pos = 0
+
+    def count(self) -> int:
+        return len(self._starts)
+
+    def at_end(self) -> bool:
+        return self._pos >= len(self._text)
+
+    def line(self, row: int) -> str:
+        line = self._text[self._starts[row] : self._ends[row]]
+        return line.removesuffix("\r")
+
+    def fetch(self, n_lines: int) -> None:
+        text, pos, size = self._text, self._pos, len(self._text)
+        max_chars = self._max_line_chars
+        starts, ends = self._starts, self._ends
+        for _ in range(n_lines):
+            if pos >= size:
+                break
+            # Bounded, so a huge text without line breaks is not scanned to its end for every row
+            end = text.find("\n", pos, pos + max_chars + 1)
+            if end < 0:
+                end = min(size, pos + max_chars)
+                next_pos = end
+            else:
+                next_pos = end + 1
+            starts.append(pos)
+            ends.append(end)
+            pos = next_pos
+        self._pos = pos
+
+    def find(self, pattern: re.Pattern[str], start: int) -> int | None:
+        offset = self._starts[start] if start < len(self._starts) else self._pos
+        match = pattern.search(self._text, offset)
+        if match is None:
+            return None
+        while not self.at_end() and (not self._ends or self._ends[-1] < match.start()):
+            self.fetch(PagedTextModel.DEFAULT_CHUNK_SIZE)
+        return bisect.bisect_right(self._starts, match.start()) - 1
+
+
+class _TracebackLines:
+    """
+    Lines of a formatted traceback. Frames are formatted (which reads their source lines) in chunks, as rows are
+    fetched.
+    """
+
+    def __init__(self, tb: types.TracebackType) -> None:
+        self._frames: list[tuple[types.FrameType, int]] = []
+        current: types.TracebackType | None = tb
+        while current is not None:
+            self._frames.append((current.tb_frame, current.tb_lineno))
+            current = current.tb_next
+        self._next_frame = 0
+        self._lines = ["Traceback (most recent call last):"]
+
+    def count(self) -> int:
+        return len(self._lines)
+
+    def at_end(self) -> bool:
+        return self._next_frame >= len(self._frames)
+
+    def line(self, row: int) -> str:
+        return self._lines[row]
+
+    def fetch(self, n_lines: int) -> None:
+        target = len(self._lines) + n_lines
+        while len(self._lines) < target and not self.at_end():
+            # Frames take at least two lines
+            stop = min(len(self._frames), self._next_frame + max(1, (target - len(self._lines)) // 2))
+            summary = traceback.StackSummary.extract(iter(self._frames[self._next_frame : stop]))
+            self._lines.extend(line for entry in summary.format() for line in entry.rstrip("\n").splitlines())
+            self._next_frame = stop
+
+    def find(self, pattern: re.Pattern[str], start: int) -> int | None:
+        first = start
+        while True:
+            for row in range(first, len(self._lines)):
+                if pattern.search(self._lines[row]):
+                    return row
+            first = len(self._lines)
+            if self.at_end():
+                return None
+            self.fetch(PagedTextModel.DEFAULT_CHUNK_SIZE)
+
+
+class PagedTextModel(QAbstractListModel):
+    """
+    List model over the lines of a (potentially huge) text or of a formatted traceback.
+
+    Nothing is prepared up front: lines are indexed, and traceback frames formatted, `chunk_size` rows at a time when
+    the view asks for more (`canFetchMore`/`fetchMore`), i.e. when it is scrolled to the end of the rows fetched so far.
+    Lines longer than `MAX_LINE_CHARS` are split into several rows. `find` searches rows that were not fetched yet as
+    well.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def __init__(self, parent: QObject | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        super().__init__(parent)
+        self._chunk_size = chunk_size
+        self._source: _LineSource = _TextLines("")
+        self._row_count = 0
+
+    def set_text(self, text: str) -> None:
+        self._set_source(_TextLines(text))
+
+    def set_traceback(self, tb: types.TracebackType) -> None:
+        self._set_source(_TracebackLines(tb))
+
+    def _set_source(self, source: _LineSource) -> None:
+        self.beginResetModel()
+        self._source = source
+        self._row_count = 0
+        self.endResetModel()
+
+    def is_complete(self) -> bool:
+        """
+        Check whether all rows have been fetched.
+        """
+        return self._source.at_end() and self._row_count == self._source.count()
+
+    def line(self, row: int) -> str:
+        return self._source.line(row)
+
+    def rowCount(self, parent: ModelIndex = _ROOT) -> int:
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def data(self, index: ModelIndex, role: int = ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role == ItemDataRole.DisplayRole:
+            return self._source.line(index.row())
+        return None
+
+    def canFetchMore(self, parent: ModelIndex) -> bool:
+        return not parent.isValid() and not self.is_complete()
+
+    def fetchMore(self, parent: ModelIndex) -> None:
+        if parent.isValid():
+            return
+        self._source.fetch(self._chunk_size)
+        self._publish_rows()
+
+    def _publish_rows(self) -> None:
+        count = self._source.count()
+        if count > self._row_count:
+            self.beginInsertRows(_ROOT, self._row_count, count - 1)
+            self._row_count = count
+            self.endInsertRows()
+
+    def find(self, text: str, start: int = 0, case_sensitive: bool = False) -> int | None:
+        """
+        Return the first row at or after `start` that contains `text`, fetching rows up to it if necessary.
+
+        Args:
+            text (str): The text to search for.
+            start (int, optional): The row to start at. Defaults to 0.
+            case_sensitive (bool, optional): Whether the case has to match. Defaults to False.
+        """
+        if not text:
+            return None
+        pattern = re.compile(re.escape(text), 0 if case_sensitive else re.IGNORECASE)
+        row = self._source.find(pattern, start)
+        self._publish_rows()
+        return row
+
+
+class PagedTextView(QWidget):
+    """
+    Read-only viewer for long texts and tracebacks, backed by a `PagedTextModel`, with a search bar.
+
+    Pressing Enter in the search bar selects the next row containing the search text, wrapping around at the end. The
+    first chunk of rows is only fetched once the view is shown.
+    """
+
+    def __init__(self, parent: QWidget | None = None, text: str | types.TracebackType | None = None) -> None:
+        super().__init__(parent)
+        self._model = PagedTextModel(self)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self._model)
+        # Every row has the height of the first one, so the layout never measures the rows
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        self.search_bar = QLineEdit()
+        self.search_bar.setPlaceholderText("Search")
+        self.search_bar.returnPressed.connect(self.find_next)
+        self.lbl_lines = QLabel()
+        self._model.rowsInserted.connect(self._update_line_count)
+        self._model.modelReset.connect(self._update_line_count)
+
+        search_layout = QHBoxLayout()
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        search_layout.addWidget(self.search_bar, 1)
+        search_layout.addWidget(self.lbl_lines)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(search_layout)
+        layout.addWidget(self.list_view)
+
+        if isinstance(text, types.TracebackType):
+            self._model.set_traceback(text)
+        elif text is not None:
+            self._model.set_text(text)
+
+    def model(self) -> PagedTextModel:
+        return self._model
+
+    def set_text(self, text: str) -> None:
+        self._model.set_text(text)
+        self._fetch_first_chunk()
+
+    def set_traceback(self, tb: types.TracebackType) -> None:
+        self._model.set_traceback(tb)
+        self._fetch_first_chunk()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        self._fetch_first_chunk()
+
+    def _fetch_first_chunk(self) -> None:
+        if self.isVisible() and self._model.rowCount() == 0 and self._model.canFetchMore(_ROOT):
+            self._model.fetchMore(_ROOT)
+
+    def find_next(self) -> int | None:
+        """
+        Select the next row containing the text of the search bar and return it, or None if there is no match.
+        """
+        text = self.search_bar.text()
+        current = self.list_view.currentIndex()
+        start = current.row() + 1 if current.isValid() else 0
+        row = self._model.find(text, start)
+        if row is None and start > 0:
+            row = self._model.find(text, 0)
+        if row is not None:
+            index = self._model.index(row, 0)
+            self.list_view.setCurrentIndex(index)
+            self.list_view.scrollTo(index, QListView.ScrollHint.PositionAtCenter)
+        return row
+
+    def _update_line_count(self) -> None:
+        count = self._model.rowCount()
+        self.lbl_lines.setText(f"{count} lines" if self._model.is_complete() else f"{count}+ lines")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from PySide6 import QtCore
+
+from pyside_widgets.array_table_view import ArrayTableModel, ArrayTableView
+
+
+@pytest.fixture
+def table_view(qtbot):
+    view = ArrayTableView()
+    qtbot.addWidget(view)
+    return view
+
+
+def test_array_table_model_shapes():
+    model = ArrayTableModel(array=np.arange(5))
+    assert (model.rowCount(), model.columnCount()) == (5, 1)
+    assert model.index(3, 0).data() == "3"
+
+    model.set_array(np.arange(6.0).reshape(2, 3) / 4)
+    assert (model.rowCount(), model.columnCount()) == (2, 3)
+    assert model.index(1, 2).data() == "1.25"
+
+    model.set_array(np.array(7))
+    assert (model.rowCount(), model.columnCount()) == (1, 1)
+
+
+def test_array_table_model_structured_array():
+    array = np.array([(1, 2.5), (3, 4.5)], dtype=[("a", "i4"), ("b", "f8")])
+    model = ArrayTableModel(array=array)
+    assert model.columnCount() == 2
+    assert model.headerData(1, QtCore.Qt.Orientation.Horizontal) == "b"
+    assert model.index(1, 1).data() == "4.5"
+
+
+def test_array_table_model_does_not_copy_large_arrays():
+    array = np.zeros((1_000_000, 4))
+    model = ArrayTableModel(array=array)
+    assert model.rowCount() == 1_000_000
+    array[999_999, 3] = 42
+    assert model.index(999_999, 3).data() == "42"
+
+
+def test_array_table_view_nd_slicing(table_view):
+    array = np.arange(24).reshape(2, 3, 4)
+    table_view.set_array(array)
+    model = table_view.model()
+    assert (model.rowCount(), model.columnCount()) == (3, 4)
+    assert model.index(0, 0).data() == "0"
+
+    table_view._slice_spin_boxes[0].setValue(1)
+    assert model.slice_index() == (1,)
+    assert model.index(0, 0).data() == "12"
+
+
+def test_array_table_model_editing(qtbot):
+    array = np.array([(1, 2.5), (3, 4.5)], dtype=[("a", "i4"), ("b", "f8")])
+    model = ArrayTableModel(array=array)
+    assert not model.setData(model.index(0, 1), "7")
+
+    model.set_editable(True)
+    with qtbot.waitSignal(model.sig_value_edited) as blocker:
+        assert model.setData(model.index(1, 1), "7")
+    assert blocker.args == [(1, "b"), 7.0]
+    assert model.index(1, 1).data() == "7"
+    # The array itself is not modified
+    assert array[1]["b"] == 4.5
+    assert not model.setData(model.index(0, 0), "not a number")
@@ -0,0 +1,21 @@
+import time
+
+from pyside_widgets._bounded_repr import BoundedRepr
+
+
+def test_bounded_repr():
+    bounded = BoundedRepr(max_chars=50)
+    assert bounded.describe("x" * 10_000_000) == "x" * 50
+    assert bounded.describe(set(range(1_000_000))) == "{0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...}"
+    assert bounded.describe(10**10_000) == "<int with ~10001 digits>"
+    assert bounded.describe(b"ab" * 1000).endswith("...")
+    assert len(bounded.describe(b"ab" * 1000)) == 50
+    assert bounded.describe(3.5) == "3.5"
+    assert bounded.describe(None) == "None"
+
+    class Slow:
+        def __repr__(self):
+            time.sleep(0.02)
+            return "slow"
+
+    assert BoundedRepr(time_budget_s=0.01).describe({Slow() for _ in range(5)}) == "{slow, ..., ..., ..., ...}"
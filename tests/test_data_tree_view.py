@@ -0,0 +1,98 @@
+import pytest
+from PySide6 import QtCore
+
+from pyside_widgets.data_tree_view import DataTreeView
+
+
+@pytest.fixture
+def sample_data():
+    return {"key1": "value1", "key2": 42, "key3": {"nested1": [1, 2, 3], "nested2": {"a": 1, "b": 2}}}
+
+
+@pytest.fixture
+def tree_view(qtbot):
+    view = DataTreeView()
+    qtbot.addWidget(view)
+    return view
+
+
+def test_data_tree_view_set_data(tree_view, sample_data):
+    tree_view.set_data(sample_data, hide_root=True)
+    model = tree_view.model()
+    assert model.rowCount() == 3
+    assert model.index(0, 0).data() == "key1"
+    assert model.index(1, 1).data() == "int"
+    assert model.index(1, 2).data() == "42"
+
+
+def test_data_tree_view_children_are_fetched_lazily(tree_view):
+    data = {"big": list(range(10_000)), "small": [1]}
+    tree_view.set_data(data, hide_root=True, expand_depth=-1)
+    model = tree_view.model()
+    big = model.index(0, 0)
+    assert model.rowCount(big) == 0
+    assert model.hasChildren(big)
+    assert model.canFetchMore(big)
+
+    model.fetchMore(big)
+    assert model.rowCount(big) == 256
+    model.fetch_all(big)
+    assert model.rowCount(big) == 10_000
+    assert not model.canFetchMore(big)
+    assert model.node(model.index(9_999, 0, big)).path() == ("big", 9_999)
+
+
+def test_data_tree_view_filter_and_sort(tree_view, sample_data):
+    tree_view.set_data({"b": 1, "c": 2, "a": 3}, hide_root=True)
+    model = tree_view.model()
+    tree_view.toggle_sort()
+    assert [model.index(row, 0).data() for row in range(3)] == ["a", "b", "c"]
+
+    tree_view.filter_tree("b")
+    assert tree_view.isRowHidden(0, QtCore.QModelIndex())
+    assert not tree_view.isRowHidden(1, QtCore.QModelIndex())
+
+
+def test_data_tree_view_filter_applies_to_fetched_rows(tree_view):
+    tree_view.set_data({"big": {f"item{i * 389 % 1000}": i for i in range(1000)}}, hide_root=True, expand_depth=-1)
+    model = tree_view.model()
+    big = model.index(0, 0)
+    model.fetchMore(big)
+    tree_view.filter_tree("7")
+    model.sort(0, QtCore.Qt.SortOrder.AscendingOrder)
+    big = model.index(0, 0)
+
+    model.fetch_all(big)
+    assert model.rowCount(big) == 1000
+    hidden = [tree_view.isRowHidden(row, big) for row in range(1000)]
+    assert hidden == ["7" not in model.index(row, 0, big).data() for row in range(1000)]
+
+    tree_view.filter_tree("")
+    assert not any(tree_view.isRowHidden(row, big) for row in range(1000))
+
+
+def test_data_tree_view_sort_keeps_children_unfetched(tree_view):
+    data = {"big": {f"item{i * 389 % 1000}": i for i in range(1000)}, "a": 1}
+    tree_view.set_data(data, hide_root=True, expand_depth=-1)
+    model = tree_view.model()
+    big = model.index(0, 0)
+    model.fetchMore(big)
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+
+    model.sort(0, QtCore.Qt.SortOrder.DescendingOrder)
+    big = model.index(0, 0)
+    assert model.index(1, 0).data() == "a"
+    assert model.rowCount(big) == 256
+    assert model.canFetchMore(big)
+    persistent = QtCore.QPersistentModelIndex(model.index(10, 2, big))
+    node = model.node(persistent)
+
+    model.fetch_all(big)
+    names = [model.index(row, 0, big).data() for row in range(model.rowCount(big))]
+    assert names == [f"item{i}" for i in range(999, -1, -1)]
+    assert all(model.node(model.index(row, 0, big)).row == row for row in range(1000))
+    # Indexes kept by the view follow their rows
+    assert model.node(persistent) is node
+    assert (persistent.row(), persistent.column()) == (node.row, 2)
+    assert inserted
@@ -1,7 +1,41 @@
+import copy
+import dataclasses
+import gc
+import json
+import threading
+import time
+import traceback
+import types
+from collections.abc import Mapping
+
+import numpy as np
 import pytest
 from PySide6 import QtCore, QtWidgets
 
-from pyside_widgets.data_tree_widget import DataTreeWidget, SearchableDataTreeWidget
+from pyside_widgets._array_sparkline import SparklineKind, compute_sparkline
+from pyside_widgets._array_stats import compute_array_stats
+from pyside_widgets.array_table_view import ArrayTableView
+from pyside_widgets.data_tree_handlers import HandlerRegistry, TypeHandler, registry
+from pyside_widgets.data_tree_widget import (
+    DataTreeWidget,
+    EditMode,
+    MoreRowsRole,
+    PreviewDataRole,
+    PreviewKind,
+    PreviewKindRole,
+    PreviewMode,
+    SearchableDataTreeWidget,
+    StaleRole,
+    describe_data,
+)
+from pyside_widgets.paged_text_view import PagedTextModel, PagedTextView
+
+
+def all_items(tree):
+    iterator = QtWidgets.QTreeWidgetItemIterator(tree)
+    while (item := iterator.value()) is not None:
+        yield item
+        iterator += 1
 
 
 @pytest.fixture
@@ -48,6 +82,16 @@ def test_data_tree_widget_nested_data(tree_widget, sample_data):
     assert nested_item.child(0).text(1) == "list"
 
 
+def test_data_tree_widget_find_item(tree_widget, sample_data):
+    tree_widget.set_data(sample_data, hide_root=True)
+    item = tree_widget.find_item(("key3", "nested2"))
+    assert item is tree_widget.invisibleRootItem().child(2).child(1)
+    assert tree_widget.item_path(item) == ("key3", "nested2")
+    assert tree_widget.find_item(("key3", "missing")) is None
+    tree_widget.set_data({"key2": 1}, hide_root=True)
+    assert tree_widget.find_item(("key3", "nested2")) is None
+
+
 def test_data_tree_widget_filter(tree_widget, sample_data):
     tree_widget.set_data(sample_data, hide_root=True)
     root = tree_widget.invisibleRootItem()
@@ -72,8 +116,11 @@ def test_data_tree_widget_container_set_data(tree_widget_container, sample_data)
 def test_data_tree_widget_container_filter(qtbot, tree_widget_container, sample_data):
     tree_widget_container.set_data(sample_data, hide_root=True)
     qtbot.keyClicks(tree_widget_container.search_bar, "key1")
+    with qtbot.waitSignal(tree_widget_container.data_tree.sig_filter_finished):
+        pass
 
     root = tree_widget_container.data_tree.invisibleRootItem()
+    assert tree_widget_container.lbl_matches.text() == "matches: 1"
     assert not root.child(0).isHidden()
     assert root.child(1).isHidden()
     assert root.child(2).isHidden()
@@ -87,3 +134,840 @@ def test_data_tree_widget_container_sort(qtbot, tree_widget_container, sample_da
     assert root.child(0).text(0) == "key1"
     assert root.child(1).text(0) == "key2"
     assert root.child(2).text(0) == "key3"
+
+
+def test_data_tree_widget_update_data(tree_widget, sample_data):
+    tree_widget.set_data(sample_data, hide_root=True)
+    key2_item = tree_widget.find_item(("key2",))
+    nested_item = tree_widget.find_item(("key3", "nested2"))
+    nested_item.setExpanded(False)
+
+    new_data = {"key2": 43, "key3": {"nested1": [1, 2, 3, 4], "nested2": {"a": 1, "b": 2}}, "key4": "new"}
+    tree_widget.set_data(new_data, hide_root=True, update=True)
+
+    root = tree_widget.invisibleRootItem()
+    assert [root.child(i).text(0) for i in range(root.childCount())] == ["key2", "key3", "key4"]
+    assert tree_widget.find_item(("key1",)) is None
+    assert tree_widget.find_item(("key2",)) is key2_item
+    assert key2_item.text(2) == "43"
+    assert tree_widget.find_item(("key3", "nested1")).childCount() == 4
+    assert tree_widget.find_item(("key3", "nested2")) is nested_item
+    assert not nested_item.isExpanded()
+
+
+def test_data_tree_widget_update_array(tree_widget):
+    array = np.arange(10)
+    tree_widget.set_data({"array": array}, hide_root=True)
+    item = tree_widget.find_item(("array",))
+    widget = tree_widget.itemWidget(item.child(0), 0)
+
+    tree_widget.update_data({"array": array})
+    assert tree_widget.itemWidget(item.child(0), 0) is widget
+
+    tree_widget.update_data({"array": np.arange(12)})
+    assert tree_widget.itemWidget(item.child(0), 0) is not widget
+    assert item.text(2) == "shape=(12,) dtype=int64"
+    assert tree_widget.memory_usage().widgets == 1
+
+
+def test_data_tree_widget_background_parsing(qtbot, sample_data):
+    widget = DataTreeWidget(background_parsing=True)
+    qtbot.addWidget(widget)
+    data = {**sample_data, "array": np.arange(5000.0)}
+    with qtbot.waitSignal(widget.sig_parsing_finished, timeout=5000):
+        widget.set_data(data, hide_root=True)
+
+    root = widget.invisibleRootItem()
+    assert [root.child(i).text(0) for i in range(root.childCount())] == ["key1", "key2", "key3", "array"]
+    assert widget.find_item(("key1",)).text(2) == "value1"
+    assert widget.find_item(("key3", "nested2", "b")).text(2) == "2"
+    array_item = widget.find_item(("array",))
+    assert widget.itemWidget(array_item.child(0), 0).text().startswith("Array summary")
+
+
+def test_array_stats_are_chunked_and_nan_aware():
+    array = np.arange(10.0)
+    array[3] = np.nan
+    stats = compute_array_stats(array, chunk_size=4)
+    assert stats is not None
+    assert (stats.min, stats.max, stats.count, stats.nan_count) == (0.0, 9.0, 9, 1)
+    assert stats.mean == pytest.approx(42 / 9)
+    assert compute_array_stats(np.array(["a", "b"])) is None
+    assert compute_array_stats(array, is_cancelled=lambda: True) is None
+
+
+def test_data_tree_widget_array_stats_computed_when_shown(qtbot, tree_widget):
+    array = np.arange(5000.0)
+    tree_widget.set_data({"array": array}, hide_root=True)
+    button = tree_widget.itemWidget(tree_widget.find_item(("array",)).child(0), 0)
+    assert "mean" not in button.text()
+
+    tree_widget.show()
+    qtbot.waitUntil(lambda: "mean=2499.50" in button.text(), timeout=5000)
+    assert tree_widget.itemDelegate().array_stats.cached(array, None) == (True, compute_array_stats(array))
+
+
+def test_sparkline_decimation():
+    array = np.arange(1000.0)
+    array[100:200] = np.nan
+    sparkline = compute_sparkline(array, 100)
+    assert sparkline is not None
+    assert sparkline.kind is SparklineKind.WAVEFORM
+    assert sparkline.exact
+    assert (sparkline.minimum, sparkline.maximum) == (0.0, 999.0)
+    assert sparkline.lows[0] == 0.0
+    assert sparkline.highs[-1] == 1.0
+    # Bins without finite values stay empty
+    assert np.isnan(sparkline.lows[10:20]).all()
+
+    # Only a bounded sample is read, but the min/max of every bin is kept for the sampled rows
+    signal = np.zeros((100_000, 2))
+    signal[0, 1] = -1
+    signal[50_000, 0] = 1
+    sampled = compute_sparkline(signal, 50, max_samples=1000)
+    assert sampled is not None
+    assert not sampled.exact
+    assert (sampled.minimum, sampled.maximum) == (-1.0, 1.0)
+    assert len(sampled.lows) == 50
+
+    histogram = compute_sparkline(np.random.default_rng(0).normal(size=(100, 100)), 20)
+    assert histogram is not None
+    assert histogram.kind is SparklineKind.HISTOGRAM
+    assert np.nanmax(histogram.highs) == 1.0
+    assert compute_sparkline(np.arange(4), 10) is None
+    assert compute_sparkline(np.array(["a"] * 100), 10) is None
+
+
+def test_data_tree_widget_sparkline_computed_when_painted(qtbot, tree_widget):
+    array = np.sin(np.arange(5000) / 100)
+    tree_widget.set_data({"signal": array}, hide_root=True)
+    tree_widget.setColumnWidth(2, 400)
+    tree_widget.show()
+    delegate = tree_widget.itemDelegate()
+    with qtbot.waitSignal(delegate.sparklines.sig_ready, timeout=5000) as blocker:
+        tree_widget.viewport().grab()
+    array_id, width = blocker.args
+    assert array_id == id(array)
+    assert width % delegate.SPARKLINE_WIDTH_STEP == 0
+    found, sparkline = delegate.sparklines.cached(array, width)
+    assert found
+    assert sparkline is not None
+    assert len(sparkline.lows) == width
+    tree_widget.viewport().grab()
+
+
+def test_data_tree_widget_delegate_previews(qtbot):
+    widget = DataTreeWidget(preview_mode=PreviewMode.DELEGATE)
+    qtbot.addWidget(widget)
+    data = {f"array{i}": np.arange(10) for i in range(50)}
+    data["text"] = "x" * 500
+    widget.set_data(data, hide_root=True)
+    widget.show()
+    widget.viewport().grab()
+
+    assert widget.memory_usage().widgets == 0
+    preview = widget.find_item(("array3",)).child(0)
+    assert preview.data(0, PreviewKindRole) is PreviewKind.ARRAY_TABLE
+    assert widget.find_item(("text",)).child(0).data(0, PreviewKindRole) is PreviewKind.TEXT
+
+    widget.open_preview(preview)
+    assert isinstance(widget.itemWidget(preview, 0), ArrayTableView)
+
+    other = widget.find_item(("array7",)).child(0)
+    widget.open_preview(other)
+    assert widget.itemWidget(preview, 0) is None
+    assert isinstance(widget.itemWidget(other, 0), ArrayTableView)
+
+
+@pytest.mark.parametrize("ngram_size", [0, 3])
+def test_data_tree_widget_indexed_filter(qtbot, sample_data, ngram_size):
+    widget = DataTreeWidget(search_ngram_size=ngram_size)
+    qtbot.addWidget(widget)
+    widget.set_data(sample_data, hide_root=True)
+
+    widget.filter_tree("NEST")
+    assert not widget.find_item(("key3", "nested1")).isHidden()
+    assert widget.find_item(("key1",)).isHidden()
+
+    widget.filter_tree("nested2")
+    assert widget.find_item(("key3", "nested1")).isHidden()
+    assert not widget.find_item(("key3", "nested2")).isHidden()
+
+    widget.filter_tree("")
+    assert not any(item.isHidden() for item in all_items(widget))
+
+    widget.filter_tree("dict", columns=(1,))
+    assert not widget.find_item(("key3",)).isHidden()
+    assert widget.find_item(("key3", "nested1")).isHidden()
+
+
+def test_data_tree_widget_container_debounce(qtbot, tree_widget_container, sample_data):
+    tree_widget_container.set_data(sample_data, hide_root=True)
+    finished = []
+    tree_widget_container.data_tree.sig_filter_finished.connect(finished.append)
+    qtbot.keyClicks(tree_widget_container.search_bar, "nested")
+    qtbot.waitUntil(lambda: bool(finished))
+    qtbot.wait(tree_widget_container.debounce_interval() + 50)
+    assert finished == [2]
+
+
+def test_data_tree_widget_async_filter_cancel(qtbot, tree_widget):
+    tree_widget.set_data({f"item{i}": i for i in range(20_000)}, hide_root=True)
+    tree_widget.filter_tree_async("item1")
+    assert tree_widget.is_filtering()
+    tree_widget.filter_tree_async("item2")
+    with qtbot.waitSignal(tree_widget.sig_filter_finished, timeout=10_000) as blocker:
+        pass
+    assert blocker.args == [len([i for i in range(20_000) if "item2" in f"item{i}"])]
+    assert not tree_widget.find_item(("item2",)).isHidden()
+    assert tree_widget.find_item(("item1",)).isHidden()
+
+
+def test_data_tree_widget_recursive_filter(tree_widget, sample_data):
+    tree_widget.set_data(sample_data, hide_root=True)
+    tree_widget.find_item(("key3",)).setExpanded(False)
+    tree_widget.find_item(("key3", "nested2")).setExpanded(False)
+
+    tree_widget.filter_tree("b", recursive=True)
+    assert not tree_widget.find_item(("key3", "nested2", "b")).isHidden()
+    assert not tree_widget.find_item(("key3", "nested2")).isHidden()
+    assert not tree_widget.find_item(("key3",)).isHidden()
+    assert tree_widget.find_item(("key3", "nested2")).isExpanded()
+    assert tree_widget.find_item(("key3",)).isExpanded()
+    assert tree_widget.find_item(("key3", "nested1")).isHidden()
+    assert tree_widget.find_item(("key3", "nested2", "a")).isHidden()
+    assert tree_widget.find_item(("key1",)).isHidden()
+
+    tree_widget.filter_tree("", recursive=True)
+    assert not any(item.isHidden() for item in all_items(tree_widget))
+
+
+def test_data_tree_widget_cycles_and_shared(tree_widget):
+    shared = [1, 2]
+    data = {"a": shared, "b": shared}
+    data["self"] = data
+    tree_widget.set_data(data, hide_root=True)
+    assert tree_widget.find_item(("self",)).text(2) == "<cycle: reference to <root>>"
+    assert tree_widget.find_item(("self",)).childCount() == 0
+    assert tree_widget.find_item(("b",)).text(2) == "<same object as a>"
+    assert tree_widget.find_item(("a", 1)) is not None
+
+
+def test_data_tree_widget_deep_nesting(tree_widget):
+    def nested(leaf):
+        data: dict = {}
+        node = data
+        # Deeper than the recursion limit
+        for _ in range(1500):
+            node["x"] = {}
+            node = node["x"]
+        node["x"] = leaf
+        return data
+
+    tree_widget.set_data(nested(1), hide_root=True)
+    assert tree_widget.find_item(("x",) * 1501).text(2) == "1"
+    tree_widget.update_data(nested(2))
+    assert tree_widget.find_item(("x",) * 1501).text(2) == "2"
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_data_tree_widget_limits(qtbot, background):
+    widget = DataTreeWidget(max_depth=2, max_children_per_node=10)
+    qtbot.addWidget(widget)
+    data = {"items": list(range(25)), "deep": {"a": {"b": 1}}}
+    if background:
+        with qtbot.waitSignal(widget.sig_parsing_finished, timeout=5000):
+            widget.set_data(data, hide_root=True, background=True)
+    else:
+        widget.set_data(data, hide_root=True, background=False)
+
+    items = widget.find_item(("items",))
+    assert items.childCount() == 11
+    more = items.child(10)
+    assert more.text(0) == "… 15 more"
+    widget.itemActivated.emit(more, 0)
+    assert items.childCount() == 21
+    assert items.child(20).text(0) == "… 5 more"
+    widget.load_more(items.child(20))
+    assert items.childCount() == 25
+    assert all(items.child(i).data(0, MoreRowsRole) is None for i in range(25))
+
+    deep = widget.find_item(("deep", "a"))
+    assert deep.child(0).text(0) == "… 1 more"
+    assert widget.find_item(("deep", "a", "b")) is None
+    widget.load_more(deep.child(0))
+    assert widget.find_item(("deep", "a", "b")).text(2) == "1"
+
+
+def test_data_tree_widget_long_value(qtbot):
+    widget = DataTreeWidget(preview_mode=PreviewMode.DELEGATE)
+    qtbot.addWidget(widget)
+    text = "x" * 100_000
+    assert len(describe_data(text)[1]) == 1000
+    widget.set_data({"text": text}, hide_root=True)
+    node = widget.find_item(("text",))
+    preview = node.child(0)
+    assert len(preview.data(0, PreviewDataRole)) == 100
+    assert widget.value_text(node) == text
+
+    widget.open_preview(preview)
+    editor = widget.itemWidget(preview, 0)
+    assert isinstance(editor, PagedTextView)
+    model = editor.model()
+    while model.canFetchMore(QtCore.QModelIndex()):
+        model.fetchMore(QtCore.QModelIndex())
+    assert "".join(model.line(row) for row in range(model.rowCount())) == text
+
+
+def test_handler_registry_dispatch():
+    handlers = HandlerRegistry()
+    mapping = TypeHandler(describe=lambda data: "mapping")
+    number = TypeHandler(describe=lambda data: "int")
+    handlers.register(Mapping, mapping)
+    handlers.register(int, number)
+    assert handlers.dispatch(bool) is number
+    assert handlers.dispatch(types.MappingProxyType) is mapping
+    assert handlers.dispatch(str) is handlers.dispatch(object)
+
+    class Record:
+        pass
+
+    assert handlers.dispatch(Record) is handlers.dispatch(object)
+    Mapping.register(Record)
+    assert handlers.dispatch(Record) is mapping
+
+
+def test_data_tree_widget_default_handlers(tree_widget):
+    @dataclasses.dataclass
+    class Point:
+        x: int
+        y: int
+
+    record = np.zeros(1, dtype=[("a", "i4"), ("b", "f8")])
+    data = {
+        "set": {1},
+        "point": Point(1, 2),
+        "proxy": types.MappingProxyType({"k": "v"}),
+        "record": record[0],
+        "records": record,
+        "range": range(10**9),
+    }
+    tree_widget.set_data(data, hide_root=True)
+    assert tree_widget.find_item(("set", 0)).text(2) == "1"
+    assert tree_widget.find_item(("point",)).text(2) == "fields=2"
+    assert tree_widget.find_item(("point", "y")).text(2) == "2"
+    assert tree_widget.find_item(("proxy", "k")).text(2) == "v"
+    assert tree_widget.find_item(("record", "b")).text(2) == "0.0"
+    assert tree_widget.find_item(("records",)).text(2) == "shape=(1,) fields=a, b"
+    assert tree_widget.find_item(("range",)).text(2) == "range(0, 1000000000)"
+
+
+def test_data_tree_widget_custom_handler(tree_widget):
+    class Node:
+        def __init__(self, *children):
+            self.items = children
+
+    registry.register(
+        Node,
+        TypeHandler(
+            describe=lambda node: f"{len(node.items)} items",
+            children=lambda node: ((f"item{i}", child) for i, child in enumerate(node.items)),
+            count=lambda node: len(node.items),
+            cheap=True,
+        ),
+    )
+    try:
+        tree_widget.set_data({"root": Node(1, Node("a"))}, hide_root=True)
+        assert tree_widget.find_item(("root",)).text(2) == "2 items"
+        assert tree_widget.find_item(("root", "item1", "item0")).text(2) == "a"
+    finally:
+        registry.unregister(Node)
+
+
+@pytest.mark.parametrize("preview_mode", [PreviewMode.WIDGETS, PreviewMode.DELEGATE])
+def test_data_tree_widget_append_children(qtbot, preview_mode):
+    widget = DataTreeWidget(preview_mode=preview_mode)
+    qtbot.addWidget(widget)
+    log: list = ["start"]
+    widget.set_data({"log": log, "meta": {}}, hide_root=True)
+    inserts = []
+    widget.model().rowsInserted.connect(lambda *args: inserts.append(args))
+
+    for i in range(1, 1000):
+        log.append(f"event {i}")
+        widget.append_child(("log",), log[-1])
+    widget.append_children(("log",), [np.arange(3)])
+    widget.append_children(("meta",), {"count": 1, "text": "x" * 200})
+    assert widget.has_pending_appends()
+    qtbot.waitUntil(lambda: not widget.has_pending_appends())
+
+    assert len(inserts) == 2
+    node = widget.find_item(("log",))
+    assert node.childCount() == 1001
+    assert node.text(2) == "length=1000"
+    assert widget.find_item(("log", 999)).text(2) == "event 999"
+    assert widget.find_item(("log", 1000)).childCount() == 1
+    assert widget.find_item(("meta", "count")).text(2) == "1"
+    preview = widget.find_item(("meta", "text")).child(0)
+    assert preview.isFirstColumnSpanned()
+    # Long texts are painted in both modes
+    assert preview.data(0, PreviewKindRole) is PreviewKind.TEXT
+    assert widget.itemWidget(preview, 0) is None
+
+    widget.append_children(("log",), [f"late {i}" for i in range(20)], max_rows=10)
+    qtbot.waitUntil(lambda: not widget.has_pending_appends())
+    assert node.childCount() == 10
+    assert [node.child(i).text(0) for i in (0, 9)] == ["1011", "1020"]
+    assert widget.find_item(("log", 0)) is None
+    widget.append_child(("log",), "next")
+    qtbot.waitUntil(lambda: not widget.has_pending_appends())
+    assert [node.child(i).text(0) for i in range(10)] == [str(key) for key in range(1012, 1022)]
+    assert node.child(9).text(2) == "next"
+
+    with pytest.raises(KeyError):
+        widget.append_child(("missing",), 1)
+
+
+def test_data_tree_widget_append_children_evicts_oldest(qtbot, tree_widget):
+    tree_widget.set_data({"log": []}, hide_root=True)
+    tree_widget.append_children(("log",), ["a", "b", "c"], max_rows=3)
+    qtbot.waitUntil(lambda: not tree_widget.has_pending_appends())
+    for value in ("d", "e"):
+        tree_widget.append_child(("log",), value)
+        qtbot.waitUntil(lambda: not tree_widget.has_pending_appends())
+
+    node = tree_widget.find_item(("log",))
+    assert [node.child(row).text(2) for row in range(node.childCount())] == ["c", "d", "e"]
+    assert tree_widget.find_item(("log", 1)) is None
+    assert tree_widget.find_item(("log", 2)) is not None
+
+
+def test_data_tree_widget_bind_snapshot(qtbot, tree_widget):
+    data = {"a": 1, "nested": {"x": 1}}
+    tree_widget.show()
+    tree_widget.bind(lambda: copy.deepcopy(data), interval_ms=20)
+    assert tree_widget.find_item(("nested", "x")).text(2) == "1"
+    tree_widget.find_item(("nested",)).setExpanded(False)
+
+    data["a"] = 2
+    data["b"] = 3
+    data["nested"]["x"] = 2
+    qtbot.waitUntil(lambda: tree_widget.find_item(("a",)).text(2) == "2")
+    assert tree_widget.find_item(("b",)).text(2) == "3"
+    assert tree_widget.find_item(("nested",)).data(0, StaleRole)
+    assert tree_widget.find_item(("nested", "x")).text(2) == "1"
+
+    tree_widget.find_item(("nested",)).setExpanded(True)
+    qtbot.waitUntil(lambda: tree_widget.find_item(("nested", "x")).text(2) == "2")
+    assert not tree_widget.find_item(("nested",)).data(0, StaleRole)
+
+    tree_widget.hide()
+    data["a"] = 4
+    qtbot.wait(100)
+    assert tree_widget.find_item(("a",)).text(2) == "2"
+    tree_widget.show()
+    qtbot.waitUntil(lambda: tree_widget.find_item(("a",)).text(2) == "4")
+    tree_widget.unbind()
+    assert not tree_widget.is_bound()
+
+
+def test_data_tree_widget_bind_lock(qtbot, tree_widget):
+    data = {"count": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def acquire():
+        while not stop.is_set():
+            with lock:
+                data["count"] += 1
+            time.sleep(0.001)
+
+    with pytest.raises(ValueError):
+        tree_widget.bind(data)
+    tree_widget.show()
+    tree_widget.bind(data, interval_ms=20, lock=lock)
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    try:
+        qtbot.waitUntil(lambda: int(tree_widget.find_item(("count",)).text(2)) > 10)
+    finally:
+        stop.set()
+        thread.join()
+        tree_widget.unbind()
+
+
+def test_data_tree_widget_bind_lock_in_place_changes(qtbot, tree_widget):
+    array = np.zeros(5000)
+    data = {"array": array, "log": [1, 2]}
+    lock = threading.Lock()
+    tree_widget.show()
+    tree_widget.bind(data, interval_ms=20, lock=lock)
+    tree_widget.find_item(("log",)).setExpanded(False)
+    button = tree_widget.itemWidget(tree_widget.find_item(("array",)).child(0), 0)
+    qtbot.waitUntil(lambda: "mean=0.00" in button.text(), timeout=5000)
+
+    with lock:
+        array[:] = 1
+        data["log"].append(3)
+    try:
+        qtbot.waitUntil(lambda: bool(tree_widget.find_item(("log",)).data(0, StaleRole)))
+        assert tree_widget.find_item(("log",)).text(2) == "length=3"
+        button = tree_widget.itemWidget(tree_widget.find_item(("array",)).child(0), 0)
+        qtbot.waitUntil(lambda: "mean=1.00" in button.text(), timeout=5000)
+    finally:
+        tree_widget.unbind()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_data_tree_widget_keeps_state(qtbot, sample_data, background):
+    widget = DataTreeWidget()
+    qtbot.addWidget(widget)
+    widget.set_data(sample_data, hide_root=True)
+    widget.find_item(("key3", "nested2")).setExpanded(False)
+    widget.find_item(("key3", "nested1")).setSelected(True)
+    widget.setCurrentItem(widget.find_item(("key3", "nested1")))
+
+    new_data = {**sample_data, "key4": {"x": {"y": 1}}}
+    if background:
+        with qtbot.waitSignal(widget.sig_parsing_finished, timeout=5000):
+            widget.set_data(new_data, hide_root=True, background=True)
+    else:
+        widget.set_data(new_data, hide_root=True)
+
+    assert not widget.find_item(("key3", "nested2")).isExpanded()
+    assert widget.find_item(("key3",)).isExpanded()
+    assert widget.find_item(("key4", "x")).isExpanded()
+    assert [item.text(0) for item in widget.selectedItems()] == ["nested1"]
+    assert widget.currentItem() is widget.find_item(("key3", "nested1"))
+
+
+def test_data_tree_widget_fit_column_width(tree_widget):
+    name = "a_rather_long_key_name_" * 3
+    tree_widget.set_data({"short": {name: 1}}, hide_root=True)
+    metrics = tree_widget.fontMetrics()
+    assert tree_widget.columnWidth(0) >= metrics.horizontalAdvance(name) + tree_widget.indentation()
+    tree_widget.find_item(("short",)).setExpanded(False)
+    tree_widget.fit_column_width(0)
+    assert tree_widget.columnWidth(0) < metrics.horizontalAdvance(name)
+
+
+def test_data_tree_widget_memory_usage(qtbot):
+    # Preview widgets hold on to their array, painted previews don't
+    tree_widget = DataTreeWidget(preview_mode=PreviewMode.DELEGATE)
+    qtbot.addWidget(tree_widget)
+    data = {"array": np.arange(10), "nested": {"a": [1, 2, 3]}}
+    tree_widget.set_data(data, hide_root=True)
+    usage = tree_widget.memory_usage()
+    assert usage.nodes == 7
+    assert usage.items >= usage.nodes - 1
+    assert usage.weak_refs == 1
+    assert 0 < usage.index_bytes < usage.total_bytes
+    assert usage.bytes_per_node == usage.total_bytes / 7
+
+    # The tree does not keep the array alive once it is removed from the data
+    item = tree_widget.find_item(("array",))
+    text = item.text(2)
+    del data["array"]
+    gc.collect()
+    assert tree_widget.index_data(tree_widget.indexFromItem(item)) is None
+    assert tree_widget.value_text(item) == text
+
+    tree_widget.update_data(data)
+    assert tree_widget.find_item(("array",)) is None
+
+
+def test_data_tree_widget_keeps_handler_created_children(qtbot, tmp_path):
+    # The fields of a record are created by its handler on access, only the tree keeps them alive
+    widget = DataTreeWidget(preview_mode=PreviewMode.DELEGATE)
+    qtbot.addWidget(widget)
+    records = np.zeros(2, dtype=[("a", "f8", (3,)), ("b", "i4")])
+    records["a"][0] = [1.5, 2.5, 3.5]
+    widget.set_data({"rec": records[0]}, hide_root=True)
+    gc.collect()
+
+    field = widget.topLevelItem(0).child(0)
+    assert field.text(0) == "a"
+    assert widget.value_text(field) == "shape=(3,) dtype=float64"
+    preview = field.child(0)
+    assert preview.data(0, PreviewKindRole) is PreviewKind.ARRAY_TABLE
+    widget.open_preview(preview)
+    view = widget.itemWidget(preview, 0)
+    assert isinstance(view, ArrayTableView)
+    assert view.model().index(1, 0).data() == "2.5"
+
+    with qtbot.waitSignal(widget.sig_export_finished, timeout=5000) as blocker:
+        widget.export_item(field, tmp_path / "a.npy")
+    assert blocker.args[1] is None
+    np.testing.assert_array_equal(np.load(tmp_path / "a.npy"), [1.5, 2.5, 3.5])
+
+    # Unchanged fields are not rebuilt
+    widget.update_data({"rec": records[0]})
+    assert widget.topLevelItem(0).child(0) is field
+
+
+def test_paged_text_model():
+    model = PagedTextModel(chunk_size=100)
+    model.set_text("\n".join(f"line {i}" for i in range(1000)) + "\n" + "x" * 2500)
+    assert model.rowCount() == 0
+    model.fetchMore(QtCore.QModelIndex())
+    assert model.rowCount() == 100
+    assert model.data(model.index(42, 0)) == "line 42"
+
+    # Searching fetches the rows up to the match
+    assert model.find("LINE 567") == 567
+    assert model.rowCount() > 567
+    assert model.find("line 567", 568) is None
+    assert model.find("line 5", 6) == 50
+    while model.canFetchMore(QtCore.QModelIndex()):
+        model.fetchMore(QtCore.QModelIndex())
+    # The last line is split into rows of at most MAX_LINE_CHARS characters
+    assert model.rowCount() == 1003
+    assert model.is_complete()
+
+
+def _traceback(depth: int) -> types.TracebackType:
+    def fail(n: int) -> None:
+        if n == 0:
+            raise ValueError("deep")
+        fail(n - 1)
+
+    try:
+        fail(depth)
+    except ValueError as exc:
+        assert exc.__traceback__ is not None
+        return exc.__traceback__
+    raise AssertionError
+
+
+def test_paged_text_model_traceback():
+    model = PagedTextModel(chunk_size=2)
+    model.set_traceback(_traceback(3))
+    model.fetchMore(QtCore.QModelIndex())
+    assert model.rowCount() == 3
+    assert model.line(0) == "Traceback (most recent call last):"
+    assert model.find('raise ValueError("deep")') == model.rowCount() - 1
+    assert model.is_complete()
+
+
+def test_data_tree_widget_traceback_viewer(tree_widget, monkeypatch):
+    formatted = []
+    extract = traceback.StackSummary.extract
+    monkeypatch.setattr(
+        traceback.StackSummary, "extract", lambda *args, **kwargs: formatted.append(1) or extract(*args, **kwargs)
+    )
+    tree_widget.set_data({"tb": _traceback(5)}, hide_root=True)
+    preview = tree_widget.find_item(("tb",)).child(0)
+    assert preview.data(0, PreviewKindRole) is PreviewKind.TRACEBACK
+    assert tree_widget.memory_usage().widgets == 0
+    assert formatted == []
+
+    tree_widget.itemActivated.emit(preview, 0)
+    viewer = tree_widget.itemWidget(preview, 0)
+    assert isinstance(viewer, PagedTextView)
+    viewer.search_bar.setText("deep")
+    assert viewer.find_next() is not None
+
+
+def test_data_tree_widget_inline_edit_display_only(qtbot, sample_data):
+    widget = DataTreeWidget(data=sample_data, allow_edit=True)
+    qtbot.addWidget(widget)
+    item = widget.find_item(("key2",))
+    assert not widget.can_edit(widget.find_item(("key3",)))
+    widget.set_edit_text(widget.indexFromItem(item, 2), "43")
+    assert item.text(2) == "43"
+    assert widget.index_data(widget.indexFromItem(item)) == 43
+    # Without write-back, the data is not modified
+    assert sample_data["key2"] == 42
+
+
+def test_data_tree_widget_can_edit_requires_allow_edit(qtbot, sample_data):
+    widget = DataTreeWidget(data=sample_data)
+    qtbot.addWidget(widget)
+    item = widget.find_item(("key2",))
+    assert not widget.can_edit(item)
+    widget.edit_item_value(item)
+    assert not item.flags() & QtCore.Qt.ItemFlag.ItemIsEditable
+    assert widget.state() != QtWidgets.QAbstractItemView.State.EditingState
+
+
+def test_data_tree_widget_write_back_commit(qtbot):
+    @dataclasses.dataclass
+    class Config:
+        gain: float = 1.0
+
+    data = {"count": 1, "items": [1, 2], "config": Config(), "signal": np.zeros(5), "frozen": (1, 2)}
+    widget = DataTreeWidget(data=data, allow_edit=True, edit_mode=EditMode.WRITE_BACK)
+    qtbot.addWidget(widget)
+    assert not widget.can_edit(widget.find_item(("frozen", 0)))
+    assert widget.can_edit(widget.find_item(("count",)))
+
+    widget.set_edit_text(widget.indexFromItem(widget.find_item(("count",)), 2), "5")
+    widget.set_edit_text(widget.indexFromItem(widget.find_item(("items", 1)), 2), "7")
+    widget.set_edit_text(widget.indexFromItem(widget.find_item(("config", "gain")), 2), "2.5")
+    table = widget.itemWidget(widget.find_item(("signal",)).child(0), 0)
+    assert isinstance(table, ArrayTableView)
+    assert table.model().setData(table.model().index(3, 0), "9")
+    assert table.model().index(3, 0).data() == "9"
+    assert len(widget.pending_edits()) == 4
+    # Nothing is written before the commit
+    assert widget.find_item(("count",)).text(2) == "5"
+    assert data["count"] == 1 and data["signal"][3] == 0
+
+    signal = data["signal"]
+    with qtbot.waitSignal(widget.sig_edits_committed) as blocker:
+        widget.commit_edits()
+    assert blocker.args == [[("count",), ("items", 1), ("config", "gain"), ("signal",)]]
+    assert data["count"] == 5
+    assert data["items"] == [1, 7]
+    assert data["config"].gain == 2.5
+    # Array elements are written in place
+    assert data["signal"] is signal and signal[3] == 9
+    assert widget.pending_edits() == []
+    assert widget.index_data(widget.indexFromItem(widget.find_item(("count",)))) == 5
+
+
+def test_data_tree_widget_write_back_is_atomic(qtbot):
+    data = {"a": 1, "b": {"c": 2}}
+    widget = DataTreeWidget(data=data, allow_edit=True, edit_mode=EditMode.WRITE_BACK)
+    qtbot.addWidget(widget)
+    widget.queue_edit(("a",), 10)
+    widget.queue_edit(("b", "c"), 20)
+    del data["b"]
+    with pytest.raises(KeyError):
+        widget.commit_edits()
+    assert data == {"a": 1}
+    assert len(widget.pending_edits()) == 2
+
+    widget.discard_edits()
+    assert widget.pending_edits() == []
+    assert widget.find_item(("a",)).text(2) == "1"
+
+
+def test_data_tree_widget_export_item(qtbot, tmp_path):
+    data = {"group": {"signal": np.arange(1000.0), "name": "run 1"}, "other": 1}
+    widget = DataTreeWidget(data=data)
+    qtbot.addWidget(widget)
+    progress = []
+    widget.sig_export_progress.connect(lambda done, total: progress.append((done, total)))
+    with qtbot.waitSignal(widget.sig_export_finished, timeout=5000) as blocker:
+        widget.export_item(widget.find_item(("group",)), tmp_path / "group.npz")
+    assert blocker.args == [str(tmp_path / "group.npz"), None]
+    assert not widget.is_exporting()
+    assert progress[-1] == (8000, 8000)
+    with np.load(tmp_path / "group.npz") as archive:
+        tree = json.loads(archive["tree.json"])
+        assert tree["name"] == "run 1"
+        np.testing.assert_array_equal(archive[tree["signal"]["__array__"]], data["group"]["signal"])
+
+
+def test_data_tree_widget_search_values(qtbot):
+    data = {"group": {"signal": np.arange(10**6, dtype=np.float64), "name": "run 1"}, "other": 1.0}
+    widget = DataTreeWidget(data=data)
+    qtbot.addWidget(widget)
+    found = []
+    widget.sig_value_matches.connect(found.extend)
+    with qtbot.waitSignal(widget.sig_value_search_finished, timeout=5000) as blocker:
+        widget.search_values("1")
+    assert blocker.args == [3]
+    assert {match.path for match in found} == {("group", "signal"), ("group", "name"), ("other",)}
+    assert widget.value_matches() == found
+    signal = widget.find_item(("group", "signal"))
+    assert signal.data(2, QtCore.Qt.ItemDataRole.BackgroundRole) is not None
+    assert signal.toolTip(2) == "1 matching elements, first at (1,)"
+
+    with qtbot.waitSignal(widget.sig_value_search_finished, timeout=5000) as blocker:
+        widget.search_values("")
+    assert blocker.args == [0]
+    assert widget.value_matches() == []
+    assert signal.data(2, QtCore.Qt.ItemDataRole.BackgroundRole) is None
+
+
+def test_searchable_data_tree_widget_value_search(qtbot, sample_data):
+    widget = SearchableDataTreeWidget(value_search=True)
+    qtbot.addWidget(widget)
+    widget.set_data(sample_data, hide_root=True)
+    with qtbot.waitSignal(widget.data_tree.sig_value_search_finished, timeout=5000):
+        qtbot.keyClicks(widget.search_bar, "2")
+    assert widget.lbl_matches.text() == "matches: 3"
+    assert not widget.filter_progress.isVisible()
+    assert not widget.data_tree.invisibleRootItem().child(0).isHidden()
+
+    with qtbot.waitSignal(widget.data_tree.sig_filter_finished, timeout=5000):
+        widget.set_value_search(False)
+    assert not widget.chk_values.isChecked()
+    # Filtered by name again: "key1" holds no "2"
+    assert widget.data_tree.invisibleRootItem().child(0).isHidden()
+
+
+def test_data_tree_widget_natural_sort(tree_widget):
+    data = {"item10": 1, "item2": -2.5, "Item1": float("nan"), "list": list(range(12)), "text": "b"}
+    tree_widget.set_data(data, hide_root=True)
+    root = tree_widget.invisibleRootItem()
+    tree_widget.find_item(("list",)).setExpanded(True)
+
+    tree_widget.toggle_sort()
+    assert [root.child(row).text(0) for row in range(root.childCount())] == ["Item1", "item2", "item10", "list", "text"]
+    numbers = tree_widget.find_item(("list",))
+    assert [numbers.child(row).text(0) for row in range(12)] == [str(i) for i in range(12)]
+    assert numbers.isExpanded()
+
+    tree_widget.sort_by_column(0, QtCore.Qt.SortOrder.DescendingOrder)
+    assert tree_widget.sort_order() == QtCore.Qt.SortOrder.DescendingOrder
+    assert [root.child(row).text(0) for row in range(root.childCount())] == ["text", "list", "item10", "item2", "Item1"]
+
+    # Numbers by value, then NaN, then texts
+    tree_widget.sort_by_column(2)
+    assert [root.child(row).text(0) for row in range(root.childCount())] == ["item2", "item10", "Item1", "text", "list"]
+
+
+def test_data_tree_widget_sort_keeps_appended_and_loaded_rows_sorted(qtbot):
+    widget = DataTreeWidget(max_children_per_node=3)
+    qtbot.addWidget(widget)
+    widget.set_data({"log": {"m": 1, "c": 2, "x": 3, "a": 4, "k": 5}}, hide_root=True)
+    log = widget.topLevelItem(0)
+
+    widget.toggle_sort()
+    widget.toggle_sort()
+    assert widget.sort_order() == QtCore.Qt.SortOrder.AscendingOrder
+    assert [log.child(row).text(0) for row in range(3)] == ["c", "m", "x"]
+    # Header clicks do not sort
+    widget.header().sectionClicked.emit(1)
+    assert widget.sort_column() == 0
+
+    widget.load_more(log.child(3))
+    qtbot.waitUntil(lambda: [log.child(row).text(0) for row in range(log.childCount())] == ["a", "c", "k", "m", "x"])
+    widget.append_children(("log",), {"b": 6, "z": 7})
+    names = ["a", "b", "c", "k", "m", "x", "z"]
+    qtbot.waitUntil(lambda: [log.child(row).text(0) for row in range(log.childCount())] == names)
+
+
+def test_data_tree_widget_sort_keeps_special_rows_and_updates(qtbot):
+    widget = DataTreeWidget(max_children_per_node=5)
+    qtbot.addWidget(widget)
+    widget.set_data({"values": list(range(20)), "b": 1, "c": 2}, hide_root=True)
+    widget.sort_by_column(0, QtCore.Qt.SortOrder.DescendingOrder)
+    values = widget.find_item(("values",))
+    assert [values.child(row).text(0) for row in range(5)] == ["4", "3", "2", "1", "0"]
+    assert values.child(5).data(0, MoreRowsRole) is not None
+
+    widget.set_data({"values": list(range(20)), "b": 1, "c": 2, "a": 0, "d": 3}, hide_root=True, update=True)
+    root = widget.invisibleRootItem()
+    names = ["values", "d", "c", "b", "a"]
+    qtbot.waitUntil(lambda: [root.child(row).text(0) for row in range(root.childCount())] == names)
+
+    widget.sort_by_column(2, QtCore.Qt.SortOrder.AscendingOrder)
+    names = ["a", "b", "c", "d", "values"]
+    assert [root.child(row).text(0) for row in range(root.childCount())] == names
+    # Changed and edited values are re-sorted like new rows
+    widget.set_data({"values": list(range(20)), "b": 5, "c": 2, "a": 0, "d": 3}, hide_root=True, update=True)
+    names = ["a", "c", "d", "b", "values"]
+    qtbot.waitUntil(lambda: [root.child(row).text(0) for row in range(root.childCount())] == names)
+    widget.set_edit_text(widget.indexFromItem(widget.find_item(("a",)), 2), "4")
+    names = ["c", "d", "a", "b", "values"]
+    qtbot.waitUntil(lambda: [root.child(row).text(0) for row in range(root.childCount())] == names)
+
+    widget.clear_sort()
+    assert widget.sort_column() is None
+    widget.set_data({"values": [], "b": 1, "c": 2, "a": 0, "d": 3, "e": 4}, hide_root=True, update=True)
+    qtbot.wait(10)
+    assert root.child(root.childCount() - 1).text(0) == "e"
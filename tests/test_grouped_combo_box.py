@@ -15,26 +15,23 @@ def combo_box(qtbot) -> GroupedComboBox:
 
 def test_add_separator(combo_box: GroupedComboBox):
     combo_box.add_separator()
-    model = combo_box.model()
-    item = model.item(0)
+    item = combo_box.model().index(0, 0)
     assert item.data(ItemTypeRole) == ItemType.SEPARATOR
     assert not (item.flags() & QtCore.Qt.ItemFlag.ItemIsSelectable)
 
 
 def test_add_parent_item(combo_box: GroupedComboBox):
     combo_box.add_parent_item("Parent")
-    model = combo_box.model()
-    item = model.item(0)
+    item = combo_box.model().index(0, 0)
     assert item.data(ItemTypeRole) == ItemType.PARENT
     assert not (item.flags() & QtCore.Qt.ItemFlag.ItemIsSelectable)
-    assert item.font().bold()
+    assert item.data(QtCore.Qt.ItemDataRole.FontRole).bold()
 
 
 def test_add_child_item(combo_box: GroupedComboBox):
     test_data = {"key": "value"}
     combo_box.add_child_item("Child", test_data)
-    model = combo_box.model()
-    item = model.item(0)
+    item = combo_box.model().index(0, 0)
     assert item.data(ItemTypeRole) == ItemType.CHILD
     assert item.flags() & QtCore.Qt.ItemFlag.ItemIsSelectable
     assert item.data(QtCore.Qt.ItemDataRole.UserRole) == test_data
@@ -94,3 +91,73 @@ def test_visual_properties(combo_box: GroupedComboBox):
     separator_index = combo_box.model().index(2, 0)
     size_hint = delegate.sizeHint(option, separator_index)
     assert size_hint.height() == 5
+
+
+def test_add_group(combo_box: GroupedComboBox, qtbot):
+    combo_box.add_child_item("Loose", 0)
+    model = combo_box.model()
+    with qtbot.waitSignal(model.rowsInserted) as blocker:
+        combo_box.add_group("Group", ["A", ("B", 2)], separator=True)
+    assert blocker.args[1:] == [1, 4]
+    assert [model.index(row, 0).data(ItemTypeRole) for row in range(model.rowCount())] == [
+        ItemType.CHILD,
+        ItemType.SEPARATOR,
+        ItemType.PARENT,
+        ItemType.CHILD,
+        ItemType.CHILD,
+    ]
+    assert model.index(2, 0).data(QtCore.Qt.ItemDataRole.FontRole).bold()
+    assert not (model.index(2, 0).flags() & QtCore.Qt.ItemFlag.ItemIsSelectable)
+
+    combo_box.setCurrentIndex(4)
+    assert combo_box.currentText() == "B"
+    assert combo_box.currentData() == 2
+    combo_box.setCurrentIndex(3)
+    assert combo_box.currentData() is None
+
+
+def test_set_groups(combo_box: GroupedComboBox):
+    combo_box.add_parent_item("Old")
+    inserted = []
+    combo_box.model().rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    groups = {f"Group {g}": {f"Channel {g}.{i}": (g, i) for i in range(100)} for g in range(50)}
+    combo_box.set_groups(groups, separators=True)
+
+    model = combo_box.model()
+    assert inserted == [(0, 50 * 101 + 49 - 1)]
+    assert model.index(0, 0).data() == "Group 0"
+    assert model.index(101, 0).data(ItemTypeRole) == ItemType.SEPARATOR
+    assert model.index(102, 0).data() == "Group 1"
+    combo_box.setCurrentIndex(103)
+    assert combo_box.currentData() == (1, 0)
+    assert combo_box.current_group() == "Group 1"
+    combo_box.setCurrentIndex(101)
+    assert combo_box.current_group() == "Group 0"
+
+
+def test_qcombobox_api(combo_box: GroupedComboBox):
+    combo_box.add_group("Group", {"A": 1, "B": 2})
+    combo_box.insertItem(1, "Inserted", "data")
+    assert combo_box.model().index(1, 0).data(ItemTypeRole) == ItemType.CHILD
+    assert [combo_box.itemText(row) for row in range(combo_box.count())] == ["Group", "Inserted", "A", "B"]
+    combo_box.setCurrentIndex(1)
+    assert combo_box.currentData() == "data"
+    assert combo_box.current_group() == "Group"
+
+    combo_box.removeItem(0)
+    assert combo_box.current_group() is None
+    combo_box.setItemText(0, "Renamed")
+    assert combo_box.itemText(0) == "Renamed"
+
+    combo_box.clear()
+    assert combo_box.count() == 0
+    assert combo_box.currentData() is None
+
+
+def test_insert_item_with_icon(combo_box: GroupedComboBox):
+    combo_box.add_group("Group", ["A"])
+    icon = combo_box.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_FileIcon)
+    combo_box.insertItem(1, icon, "With icon", "data")
+    assert combo_box.itemText(1) == "With icon"
+    assert combo_box.itemData(1) == "data"
+    assert combo_box.model().index(1, 0).data(ItemTypeRole) == ItemType.CHILD
@@ -0,0 +1,22 @@
+from pyside_widgets._path_index import NO_PARENT, PathIndex
+
+
+def test_path_index():
+    index = PathIndex[str]()
+    root = index.add(NO_PARENT, None, "root")
+    a = index.add(root, "a", "a")
+    children = [index.add(a, i, f"a{i}") for i in range(100)]
+    assert index[("a", 42)] == "a42"
+    assert index.path_of(children[42]) == ("a", 42)
+    assert index.child_id(a, 99) == children[99]
+    assert index.child_id(a, 100) is None
+    assert len(index) == 102
+
+    index.remove(children[42])
+    assert ("a", 42) not in index
+    # Freed ids are reused, and nodes added after the key map was built are found
+    assert index.add(a, "new", "new") == children[42]
+    assert index[("a", "new")] == "new"
+    index[("b",)] = "b"
+    assert dict(index.items())[("b",)] == "b"
+    assert set(index) == {(), ("a",), ("b",), ("a", "new"), *(("a", i) for i in range(100) if i != 42)}
@@ -0,0 +1,11 @@
+from pyside_widgets._search_index import SearchIndex
+
+
+def test_search_index_narrows_previous_matches():
+    index = SearchIndex[str](ngram_size=2)
+    for name in ("alpha", "alphabet", "beta", "gamma"):
+        index.add(name, (name,))
+    matches = index.search("alp")
+    assert {index.row(i) for i in matches} == {"alpha", "alphabet"}
+    assert {index.row(i) for i in index.search("alphab", candidates=matches)} == {"alphabet"}
+    assert {index.row(i) for i in index.search("MA")} == {"gamma"}
@@ -0,0 +1,80 @@
+import dataclasses
+import json
+
+import numpy as np
+import pytest
+
+from pyside_widgets._tree_export import ExportCancelled, export_data
+
+
+def test_export_data_streams_structure_and_arrays(tmp_path):
+    @dataclasses.dataclass
+    class Point:
+        x: int
+        y: float
+
+    array = np.arange(12.0).reshape(3, 4)
+    data = {
+        "array": array,
+        "same": array,
+        "fortran": np.asfortranarray(array),
+        "strided": array[:, ::2],
+        "items": [1, "two", None, (True, np.float32(2.5))],
+        "point": Point(1, 2.0),
+    }
+    data["self"] = data
+    export_data(data, tmp_path / "out.npz", chunk_bytes=16)
+
+    with np.load(tmp_path / "out.npz") as archive:
+        tree = json.loads(archive["tree.json"])
+        assert tree["items"] == [1, "two", None, [True, 2.5]]
+        assert tree["point"] == {"x": 1, "y": 2.0}
+        assert tree["self"] == {"__cycle__": "dict"}
+        # Arrays that occur twice are written once
+        assert tree["same"] == tree["array"]
+        for key, expected in [("array", array), ("fortran", array), ("strided", array[:, ::2])]:
+            assert tree[key]["shape"] == list(expected.shape)
+            np.testing.assert_array_equal(archive[tree[key]["__array__"]], expected)
+
+    export_data(data, tmp_path / "out.json")
+    tree = json.loads((tmp_path / "out.json").read_text())
+    np.testing.assert_array_equal(np.load(tmp_path / tree["strided"]["__array__"]), array[:, ::2])
+
+    export_data(array, tmp_path / "out.npy")
+    np.testing.assert_array_equal(np.load(tmp_path / "out.npy"), array)
+    with pytest.raises(TypeError):
+        export_data(data, tmp_path / "data.npy")
+
+    # Nothing is left behind by a cancelled export
+    with pytest.raises(ExportCancelled):
+        export_data(array, tmp_path / "cancelled.npy", is_cancelled=lambda: True, chunk_bytes=16)
+    assert not (tmp_path / "cancelled.npy").exists()
+
+
+def test_export_data_json_cleanup_and_object_arrays(tmp_path):
+    objects = np.array([["x" * 2000, None], [{"a": 1}, [1, 2]]], dtype=object)
+    # Enough nodes for the structure to be checked for cancellation
+    data = {"objects": objects, "signal": np.arange(1000.0), "values": list(range(2000))}
+    export_data(data, tmp_path / "out.json")
+    tree = json.loads((tmp_path / "out.json").read_text())
+    # Written in full, not as the (truncated) repr of the array
+    assert tree["objects"] == [["x" * 2000, None], [{"a": 1}, [1, 2]]]
+
+    def cancel_after(n_calls):
+        calls = iter(range(n_calls))
+        return lambda: next(calls, None) is None
+
+    # A directory created by the export is removed with its files
+    with pytest.raises(ExportCancelled):
+        export_data(data, tmp_path / "new.json", is_cancelled=cancel_after(3), chunk_bytes=64)
+    assert not (tmp_path / "new.json").exists()
+    assert not (tmp_path / "new_arrays").exists()
+
+    # Files that were in an existing directory are kept, whether the structure or the arrays were being written
+    user_dir = tmp_path / "user_arrays"
+    user_dir.mkdir()
+    (user_dir / "notes.txt").write_text("keep")
+    for n_calls in (0, 3):
+        with pytest.raises(ExportCancelled):
+            export_data(data, tmp_path / "user.json", is_cancelled=cancel_after(n_calls), chunk_bytes=64)
+        assert [entry.name for entry in user_dir.iterdir()] == ["notes.txt"]
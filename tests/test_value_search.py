@@ -0,0 +1,47 @@
+import numpy as np
+
+from pyside_widgets._value_search import ValueMatch, iter_value_matches, search_array
+
+
+def test_search_array_is_vectorized():
+    values = np.linspace(0.0, 1.0, 1001).reshape(7, 143)
+    assert search_array(values, "0.5", chunk_size=100) == (1, (3, 71))
+    assert search_array(values, "abc") == (0, None)
+    assert search_array(np.arange(10, dtype=np.uint8), "300") == (0, None)
+    assert search_array(np.arange(10), "7.0") == (1, (7,))
+    assert search_array(np.array([True, False, True]), "true") == (2, (0,))
+    assert search_array(np.array(["alpha", "BETA", "Gamma-beta"]), "beta") == (2, (1,))
+    assert search_array(np.array([b"x", b"ABC"]), "b") == (1, (1,))
+    records = np.zeros(3, dtype=[("x", "i4"), ("y", "f8")])
+    records["y"][2] = 7.0
+    assert search_array(records, "7") == (1, (2, "y"))
+
+
+def test_iter_value_matches():
+    shared = {"id": "S-42"}
+    data = {
+        "config": shared,
+        "again": shared,
+        "values": [1, 42.0, "x42", None],
+        "array": np.arange(100).reshape(10, 10),
+        "names": np.array(["a", "b42"]),
+        "objects": np.array([42, "42"], dtype=object),
+    }
+    assert list(iter_value_matches(data, "42")) == [
+        ValueMatch(("config", "id")),
+        ValueMatch(("values", 1)),
+        ValueMatch(("values", 2)),
+        ValueMatch(("array",), 1, (4, 2)),
+        ValueMatch(("names",), 1, (1,)),
+    ]
+    assert list(iter_value_matches(data, "none")) == [ValueMatch(("values", 3))]
+    assert list(iter_value_matches(data, "42", is_cancelled=lambda: True)) == []
+
+
+def test_iter_value_matches_temporary_containers():
+    # Every access to a nested record field creates a new record, which is freed once it was searched
+    dtype = np.dtype([("inner", [("x", "i4"), ("y", "f8")])])
+    records = np.zeros(20, dtype)
+    records["inner"]["x"] = np.arange(20)
+    data = {"records": [records[i] for i in range(20)]}
+    assert list(iter_value_matches(data, "13")) == [ValueMatch(("records", 13, "inner", "x"))]